@@ -0,0 +1,313 @@
+"""Regression and speed suite for the Easy Apply form logic, without a browser.
+
+Generates random Easy Apply form variants from the autofill database, runs
+process_form_fields over them through the in-process BeautifulSoup backends and
+checks that known answers are filled and unknown questions are recorded.
+
+Run from the repository root:
+    python -m benchmarks.form_variants_suite --variants 2000
+"""
+
+import argparse
+import copy
+import html
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from browser_control import easy_apply__job
+from browser_control.page_drivers import (
+    SeleniumPageDriver,
+    SoupPageDriver,
+    SoupWebDriver,
+)
+from storage import AutofillKnowledgeBase, as_autofill_store
+
+DEFAULT_AUTOFILL = Path(__file__).parent.parent / "DB" / "form_autofill.json"
+FIXTURE = Path(__file__).parent / "fixtures" / "easy_apply_modal.html"
+
+SECTIONS = ("textInput", "radioButtons", "dropdowns")
+
+BACKENDS = {
+    "soup": SoupPageDriver,
+    "selenium-facade": lambda markup: SeleniumPageDriver(SoupWebDriver(markup)),
+}
+
+
+def text_field_html(index, label, strategy):
+    field_id = f"text-{index}"
+    escaped = html.escape(label, quote=True)
+    if strategy == "name":
+        return f'<input id="{field_id}" name="{escaped}" type="text" value="">'
+    if strategy == "aria":
+        return f'<input id="{field_id}" aria-label="{escaped}" type="text" value="">'
+    span = (
+        f'<span aria-hidden="true">{escaped}</span>' if strategy == "span" else escaped
+    )
+    return (
+        f'<div class="fb-dash-form-element"><label for="{field_id}">{span}</label>'
+        f'<input id="{field_id}" type="text" value=""></div>'
+    )
+
+
+def radio_group_html(index, label, options, use_label_for):
+    rows = []
+    for position, option in enumerate(options):
+        radio_id = f"radio-{index}-{position}"
+        value = html.escape(option["value"], quote=True)
+        text = html.escape(option["text"])
+        caption = (
+            f'<label for="{radio_id}">{text}</label>'
+            if use_label_for
+            else f"<span>{text}</span>"
+        )
+        rows.append(
+            f'<div><input id="{radio_id}" type="radio" name="group-{index}" '
+            f'value="{value}">{caption}</div>'
+        )
+    return (
+        '<fieldset data-test-form-builder-radio-button-form-component="true">'
+        f'<legend><span aria-hidden="true">{html.escape(label)}</span></legend>'
+        f'{"".join(rows)}</fieldset>'
+    )
+
+
+def dropdown_html(index, label, options):
+    rows = "".join(
+        f'<option value="{html.escape(o["value"], quote=True)}">{html.escape(o["text"])}</option>'
+        for o in options
+    )
+    return (
+        f'<div class="fb-dash-form-element"><label for="select-{index}">'
+        f'<span aria-hidden="true">{html.escape(label)}</span></label>'
+        f'<select id="select-{index}">{rows}</select></div>'
+    )
+
+
+def stored_choice(entry):
+    option = easy_apply__job.answer_option(entry)
+    return option["value"] if option else None
+
+
+def unique_entries(rng, entries):
+    """Shuffled entries with options, one per label, as a form never repeats a question."""
+    by_label = {}
+    for entry in entries:
+        if entry.get("options"):
+            by_label.setdefault(entry["placeholderIncludes"].strip().lower(), entry)
+    return rng.sample(list(by_label.values()), len(by_label))
+
+
+def build_variant(rng, autofill_data, variant_index):
+    """Return (html, expectations) for one random form."""
+    fields = []
+    expectations = []
+    known_text = [(k, v) for k, v in autofill_data.get("textInput", {}).items() if v]
+    known_text = rng.sample(known_text, len(known_text))
+    for index in range(rng.randint(1, 6)):
+        strategy = rng.choice(["name", "aria", "span", "plain"])
+        if known_text and rng.random() < 0.7:
+            label, answer = known_text.pop()
+            expectations.append(("text", f"#text-{index}", label, answer))
+        else:
+            label = f"Unknown question {variant_index}-{index}"
+            expectations.append(("new_text", None, label, None))
+        fields.append(text_field_html(index, label, strategy))
+
+    radios = unique_entries(rng, autofill_data.get("radioButtons", []))
+    for index in range(rng.randint(0, 3)):
+        if radios and rng.random() < 0.7:
+            entry = radios.pop()
+            label, options = entry["placeholderIncludes"], entry["options"]
+            choice = stored_choice(entry)
+            if choice is not None:
+                expectations.append(("radio", f"group-{index}", label, choice))
+        else:
+            label = f"Unknown choice {variant_index}-{index}"
+            options = [{"value": "Yes", "text": "Yes"}, {"value": "No", "text": "No"}]
+            expectations.append(("new_radio", None, label, None))
+        fields.append(radio_group_html(index, label, options, rng.random() < 0.5))
+
+    dropdowns = unique_entries(rng, autofill_data.get("dropdowns", []))
+    for index in range(rng.randint(0, 3)):
+        if dropdowns and rng.random() < 0.7:
+            entry = dropdowns.pop()
+            label, options = entry["placeholderIncludes"], entry["options"]
+            choice = stored_choice(entry)
+            if choice is not None:
+                expectations.append(("dropdown", f"#select-{index}", label, choice))
+        else:
+            label = f"Unknown dropdown {variant_index}-{index}"
+            options = [
+                {"value": "Select an option", "text": "Select an option"},
+                {"value": "A", "text": "A"},
+                {"value": "B", "text": "B"},
+            ]
+            expectations.append(("new_dropdown", None, label, None))
+        fields.append(dropdown_html(index, label, options))
+
+    rng.shuffle(fields)
+    markup = (
+        '<div class="artdeco-modal" role="dialog"><form>'
+        + "".join(fields)
+        + "</form></div>"
+    )
+    return markup, expectations
+
+
+def check_variant(page, autofill_data, expectations):
+    failures = []
+    labels = {
+        section: {
+            entry["placeholderIncludes"].strip().lower()
+            for entry in autofill_data.get(section, [])
+        }
+        for section in ("radioButtons", "dropdowns")
+    }
+    for kind, locator, label, expected in expectations:
+        if kind == "text":
+            value = page.attributes(page.query(locator), ["value"])["value"]
+            ok = value == expected
+        elif kind == "radio":
+            checked = page.query(f'input[name="{locator}"][checked]')
+            value = page.attributes(checked, ["value"])["value"] if checked else None
+            ok = value == expected
+        elif kind == "dropdown":
+            value = page.attributes(page.query(locator), ["value"])["value"]
+            ok = value == expected
+        elif kind == "new_text":
+            value = autofill_data.get("textInput", {}).get(label)
+            ok = value == ""
+        elif kind == "new_radio":
+            value = label.lower() in labels["radioButtons"]
+            ok = value
+        else:
+            value = label.lower() in labels["dropdowns"]
+            ok = value
+        if not ok:
+            failures.append(f"{kind} '{label}': expected {expected!r}, got {value!r}")
+    return failures
+
+
+def run_suite(
+    autofill_data, variants, seed, backend, knowledge_base=None, form_plans=None
+):
+    """Run all variants; with a knowledge_base the SQLite store is exercised.
+
+    With a FormPlanCache each variant is also rendered again and filled from
+    its cached plan, which has to give the same values.
+    """
+    rng = random.Random(seed)
+    make_page = BACKENDS[backend]
+    failures = []
+    elapsed = 0.0
+    for variant_index in range(variants):
+        markup, expectations = build_variant(rng, autofill_data, variant_index)
+        if knowledge_base is None:
+            store = as_autofill_store(copy.deepcopy(autofill_data))
+            view = lambda: store.data
+        else:
+            knowledge_base.import_data(autofill_data)
+            store = knowledge_base
+            view = knowledge_base.export_data
+        page = make_page(markup)
+        started = time.perf_counter()
+        form = page.query("form")
+        easy_apply__job.fill_form_step(page, form, store, form_plans)
+        elapsed += time.perf_counter() - started
+        data = view()
+        for failure in check_variant(page, data, expectations):
+            failures.append(f"variant {variant_index}: {failure}")
+        if form_plans is not None:
+            replay = make_page(markup)
+            hits = form_plans.hits
+            easy_apply__job.fill_form_step(
+                replay, replay.query("form"), store, form_plans
+            )
+            if form_plans.hits > hits:
+                for failure in check_variant(replay, view(), expectations):
+                    failures.append(f"variant {variant_index} from plan: {failure}")
+        sizes = {section: len(data.get(section, [])) for section in SECTIONS}
+        easy_apply__job.process_form_fields(page, form, store)
+        data = view()
+        for section, size in sizes.items():
+            if len(data.get(section, [])) != size:
+                failures.append(
+                    f"variant {variant_index}: second pass added {section} entries"
+                )
+    return elapsed, failures
+
+
+def run_fixture(autofill_data):
+    page = SoupPageDriver.from_file(FIXTURE)
+    data = copy.deepcopy(autofill_data)
+    updated = easy_apply__job.process_form_fields(page, page.query("form"), data)
+    print(f"Fixture {FIXTURE.name}: processed, database updated={updated}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--autofill", default=str(DEFAULT_AUTOFILL))
+    parser.add_argument("--backend", choices=sorted(BACKENDS), action="append")
+    parser.add_argument("--store", choices=["json", "sqlite"], default="json")
+    parser.add_argument(
+        "--plans", action="store_true", help="fill through a FormPlanCache"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.autofill, "r", encoding="utf-8") as f:
+        autofill_data = json.load(f)
+
+    easy_apply__job.smart_delay = lambda *delay_args, **delay_kwargs: None
+    temp_dir = tempfile.TemporaryDirectory()
+    knowledge_base = None
+    if args.store == "sqlite":
+        knowledge_base = AutofillKnowledgeBase(
+            Path(temp_dir.name) / "form_autofill.sqlite3"
+        )
+    stdout = sys.stdout
+    all_failures = []
+    for backend in args.backend or sorted(BACKENDS):
+        if not args.verbose:
+            sys.stdout = open("nul" if sys.platform == "win32" else "/dev/null", "w")
+        form_plans = easy_apply__job.FormPlanCache() if args.plans else None
+        try:
+            run_fixture(autofill_data)
+            elapsed, failures = run_suite(
+                autofill_data,
+                args.variants,
+                args.seed,
+                backend,
+                knowledge_base,
+                form_plans,
+            )
+        finally:
+            if sys.stdout is not stdout:
+                sys.stdout.close()
+                sys.stdout = stdout
+        per_variant = elapsed / args.variants * 1000 if args.variants else 0
+        print(
+            f"{backend:<16} {args.variants} variants in {elapsed:.2f}s "
+            f"({per_variant:.2f}ms/variant), {len(failures)} failures"
+        )
+        if form_plans is not None:
+            print(f"{'':<16} plans: {form_plans.hits} hits, {form_plans.misses} misses")
+        all_failures.extend(f"[{backend}] {failure}" for failure in failures)
+
+    if knowledge_base is not None:
+        knowledge_base.close()
+    temp_dir.cleanup()
+
+    for failure in all_failures[:50]:
+        print(failure)
+    sys.exit(1 if all_failures else 0)
+
+
+if __name__ == "__main__":
+    main()
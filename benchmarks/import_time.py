@@ -0,0 +1,90 @@
+"""Startup import-time check for the UI and the command line entry points.
+
+Imports each entry module in a fresh interpreter with -X importtime, prints
+the cumulative import time and the slowest modules, and fails when a module
+that is meant to load lazily (selenium's WebDriver stack, webdriver-manager,
+the Easy Apply logic, tkinter for the CLI) is imported at startup, or when a
+--budget-ms is exceeded.
+
+Run from the repository root:
+    python -m benchmarks.import_time --repeat 5
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Entry module -> modules that must not be imported with it.
+ENTRY_POINTS = {
+    "ui": [
+        "selenium.webdriver.remote.webdriver",
+        "webdriver_manager",
+        "bs4",
+        "websockets",
+        "multiprocessing",
+        "browser_control.browser_manager",
+        "browser_control.easy_apply__job",
+    ],
+    "browser_control.__main__": [
+        "tkinter",
+        "ttkthemes",
+        "selenium.webdriver.remote.webdriver",
+        "webdriver_manager",
+        "browser_control.easy_apply__job",
+    ],
+}
+
+
+def measure(module):
+    """Return ({module: (self_us, cumulative_us)}, cumulative_us of module)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times, times[module][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point")
+    parser.add_argument("--top", type=int, default=8, help="slowest modules to list")
+    parser.add_argument(
+        "--budget-ms", type=float, help="fail when an entry point takes longer"
+    )
+    args = parser.parse_args()
+
+    failures = []
+    for module, forbidden in ENTRY_POINTS.items():
+        runs = [measure(module) for _ in range(args.repeat)]
+        times, total_us = min(runs, key=lambda run: run[1])
+        print(f"{module:<26} {total_us / 1000:7.1f}ms (best of {args.repeat})")
+        slowest = sorted(times.items(), key=lambda item: -item[1][0])[: args.top]
+        for name, (self_us, _) in slowest:
+            print(f"    {self_us / 1000:7.1f}ms  {name}")
+        for name in forbidden:
+            if name in times:
+                failures.append(f"{module} imports {name} at startup")
+        if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+            failures.append(
+                f"{module} takes {total_us / 1000:.1f}ms, budget {args.budget_ms}ms"
+            )
+
+    for failure in failures:
+        print(failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
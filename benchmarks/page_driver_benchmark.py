@@ -0,0 +1,124 @@
+"""Compare the Selenium and CDP page drivers on the offline Easy Apply fixture.
+
+Run from the repository root:
+    python -m benchmarks.page_driver_benchmark --rounds 50 --tabs 4
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from selenium import webdriver
+
+from browser_control.browser_manager_jobs import ChromeOptionsBuilder
+from browser_control.easy_apply__job import MODAL_SELECTORS
+from browser_control.page_drivers import CdpPageDriver, SeleniumPageDriver
+
+FIXTURE = Path(__file__).parent / "fixtures" / "easy_apply_modal.html"
+
+OPERATIONS = [
+    ("snapshot", (".artdeco-modal",)),
+    ("probe", (MODAL_SELECTORS,)),
+    ("fill", ("#first-name", "Benchmark")),
+]
+
+
+def start_driver(headless):
+    options = webdriver.ChromeOptions()
+    if headless:
+        ChromeOptionsBuilder.add_headless_options(options)
+    driver = webdriver.Chrome(options=options)
+    return driver
+
+
+def open_fixture_tabs(driver, tabs):
+    handles = []
+    for index in range(tabs):
+        if index:
+            driver.switch_to.new_window("tab")
+        driver.get(FIXTURE.resolve().as_uri())
+        handles.append(driver.current_window_handle)
+    return handles
+
+
+def run_sequential(page, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for operation, args in OPERATIONS:
+            getattr(page, operation)(*args)
+    return time.perf_counter() - started
+
+
+def run_selenium_tabs(driver, handles, rounds):
+    page = SeleniumPageDriver(driver)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for handle in handles:
+            driver.switch_to.window(handle)
+            for operation, args in OPERATIONS:
+                getattr(page, operation)(*args)
+    return time.perf_counter() - started
+
+
+def run_cdp_tabs(page, handles, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        results = page.gather(
+            [
+                (handle, operation, args)
+                for handle in handles
+                for operation, args in OPERATIONS
+            ]
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            raise errors[0]
+    return time.perf_counter() - started
+
+
+def report(name, elapsed, operations):
+    per_op = elapsed / operations * 1000 if operations else 0
+    print(f"{name:<32} {elapsed:8.3f}s total {per_op:8.3f}ms/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--tabs", type=int, default=4)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    driver = start_driver(headless=not args.headed)
+    cdp_page = None
+    try:
+        handles = open_fixture_tabs(driver, args.tabs)
+        driver.switch_to.window(handles[0])
+        debugger_address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        cdp_page = CdpPageDriver(debugger_address, handles[0])
+        single_tab_ops = args.rounds * len(OPERATIONS)
+        all_tab_ops = single_tab_ops * len(handles)
+
+        report(
+            "selenium, one tab",
+            run_sequential(SeleniumPageDriver(driver), args.rounds),
+            single_tab_ops,
+        )
+        report("cdp, one tab", run_sequential(cdp_page, args.rounds), single_tab_ops)
+        report(
+            f"selenium, {len(handles)} tabs",
+            run_selenium_tabs(driver, handles, args.rounds),
+            all_tab_ops,
+        )
+        report(
+            f"cdp, {len(handles)} tabs concurrent",
+            run_cdp_tabs(cdp_page, handles, args.rounds),
+            all_tab_ops,
+        )
+    finally:
+        if cdp_page is not None:
+            cdp_page.close()
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Offline checks of the page loop in BrowserManager.process_job_listings.
+
+Runs the loop against an empty in-process page (SoupWebDriver) with the run
+ledger and job index in a temporary folder, and checks that a used-up daily
+cap stops the run before any results page is scraped, leaving it resumable.
+
+Run from the repository root:
+    python -m benchmarks.run_loop_checks
+"""
+
+import json
+import shutil
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from browser_control import browser_manager
+from browser_control.browser_manager import BrowserManager
+from browser_control.page_drivers import SoupPageDriver, SoupWebDriver
+
+DEFAULT_AUTOFILL = Path(__file__).parent.parent / "DB" / "form_autofill.json"
+SEARCH_URL = "https://www.linkedin.com/jobs/search/?keywords=python&start=0"
+
+
+def run_loop(folder, rate_limit):
+    """(pages scraped, run status, ledger status) of one run on an empty page."""
+    filters_path = folder / f"filters_{rate_limit['dailyCap']}.json"
+    filters_path.write_text(json.dumps({"rateLimit": rate_limit}), encoding="utf-8")
+    browser_manager.RUN_LEDGER_PATH = folder / "run_ledger.sqlite3"
+    browser_manager.JOB_INDEX_PATH = folder / "job_index.sqlite3"
+
+    browser = BrowserManager(folder / "browser_settings.json")
+    browser.driver = SoupWebDriver("<html><body></body></html>", url=SEARCH_URL)
+    browser.page = SoupPageDriver("<html><body></body></html>")
+    scraped = []
+    get_job_cards = browser._get_job_cards
+    browser._get_job_cards = lambda: scraped.append(1) or get_job_cards()
+    browser_manager.time.sleep = lambda seconds: None
+
+    browser.process_job_listings(folder / "form_autofill.json", filters_path)
+    conn = sqlite3.connect(browser_manager.RUN_LEDGER_PATH)
+    ledger_status = conn.execute(
+        "SELECT status FROM runs ORDER BY id DESC LIMIT 1"
+    ).fetchone()[0]
+    conn.close()
+    return len(scraped), browser.metrics["status"], ledger_status
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir)
+        shutil.copy(DEFAULT_AUTOFILL, folder / "form_autofill.json")
+
+        pages, status, ledger_status = run_loop(folder, {"dailyCap": 0})
+        print(
+            f"daily cap 0:  {pages} pages scraped, run {status}, ledger {ledger_status}"
+        )
+        if pages:
+            failures.append("a used-up daily cap still scraped results pages")
+        if status != "stopped" or ledger_status != "stopped":
+            failures.append("a used-up daily cap did not leave the run resumable")
+
+        pages, status, ledger_status = run_loop(folder, {"dailyCap": 50})
+        print(
+            f"daily cap 50: {pages} pages scraped, run {status}, ledger {ledger_status}"
+        )
+        if pages != 1 or status != "finished":
+            failures.append("with budget left the empty page did not finish the run")
+
+    for failure in failures:
+        print(failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
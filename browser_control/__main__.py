@@ -0,0 +1,255 @@
+"""Command line entry points of the bot that need no UI.
+
+Run from the repository root:
+    python -m browser_control run [--search-url URL] [--pages N] [--jobs N]
+    python -m browser_control refilter [--baseline OLD_FILTERS.json]
+    python -m browser_control profile [size|prune|snapshot|clone]
+"""
+
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+DB_DIR = Path(__file__).parent.parent / "DB"
+PROFILE_DIR = Path(__file__).parent.parent / "chrome_profile"
+GOLDEN_PROFILE_DIR = Path(__file__).parent.parent / "chrome_profile_golden"
+
+# Ledger outcomes that tell what the filters decided on a job the last time.
+LEDGER_DECISIONS = {
+    "filtered": "skip",
+    "applied": "keep",
+    "not_applied": "keep",
+    "error": "keep",
+}
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def default_search_url(filters_path, autofill_path):
+    """The search the UI would start: saved job title and filters."""
+    from browser_control.browser_manager_jobs import SearchUrlBuilder
+    from storage import AutofillKnowledgeBase
+
+    filters = _load_json(filters_path) if Path(filters_path).exists() else {}
+    job_title = AutofillKnowledgeBase.read_text_answer(autofill_path, "jobTitle")
+    return SearchUrlBuilder.build_search_url(
+        job_title or "",
+        filters.get("timeFilter", "any"),
+        filters.get("easyApplyOnly", False),
+    )
+
+
+def run(args):
+    """Start Chrome and run the bot on a search, without the Tk UI."""
+    from browser_control.browser_manager import BrowserManager
+    from storage import ConfigFile, write_text_atomic
+
+    ConfigFile.start_watcher()
+    search_url = args.search_url or default_search_url(args.filters, args.autofill)
+    browser = BrowserManager(args.settings)
+    if not browser.start_browser(headless=args.headless):
+        return 1
+    result = None
+    try:
+        browser.go_to_url(search_url)
+        result = browser.process_job_listings(
+            args.autofill, args.filters, max_pages=args.pages, max_jobs=args.jobs
+        )
+    except KeyboardInterrupt:
+        print("Interrupted, closing the browser.")
+    finally:
+        # A reusable Chrome stays open for the next run.
+        browser.stop(close_browser=not browser.reuse_browser)
+        metrics = {"search_url": search_url, **browser.metrics}
+        if args.metrics:
+            write_text_atomic(args.metrics, json.dumps(metrics, indent=2))
+        print(
+            f"Run {metrics.get('status', 'stopped')}: "
+            f"{metrics.get('pages', 0)} pages, {metrics.get('job_cards', 0)} jobs seen, "
+            f"{metrics.get('attempted', 0)} attempted, {metrics.get('applied', 0)} applied"
+        )
+    return 1 if result is False else 0
+
+
+def refilter(args):
+    """Re-run the job filters over the job index and report flipped decisions."""
+    from browser_control.browser_manager_jobs.job_refilter import (
+        PARALLEL_MIN_JOBS,
+        refilter_jobs,
+    )
+    from browser_control.browser_manager_jobs.job_scorer import company_name
+    from storage import JobIndex, RunLedger
+
+    if not Path(args.job_index).exists():
+        print(f"No job index at {args.job_index}; run the bot first.")
+        return 1
+    filters = _load_json(args.filters)
+    baseline_filters = _load_json(args.baseline) if args.baseline else None
+    job_index = JobIndex(args.job_index)
+    ledger = None
+    if baseline_filters is None and Path(args.ledger).exists():
+        ledger = RunLedger(args.ledger)
+    baseline_name = args.baseline or "last run outcomes"
+
+    total = job_index.job_count()
+    workers = args.workers or (
+        (os.cpu_count() or 1) if total >= PARALLEL_MIN_JOBS else 1
+    )
+    started = time.perf_counter()
+    counts = collections.Counter()
+    flips = []
+    try:
+        for results in refilter_jobs(
+            job_index.iter_jobs(args.batch_size),
+            filters,
+            baseline_filters,
+            workers,
+            args.batch_size,
+        ):
+            outcomes = {}
+            if ledger is not None:
+                outcomes = ledger.last_outcomes([job["job_id"] for job, *_ in results])
+            for job, decision, reason, baseline in results:
+                if baseline is None:
+                    baseline = LEDGER_DECISIONS.get(outcomes.get(job["job_id"]))
+                counts[decision] += 1
+                if baseline is None or baseline == decision:
+                    continue
+                counts[f"{baseline} -> {decision}"] += 1
+                if len(flips) < args.show:
+                    flips.append((baseline, decision, job, reason))
+    finally:
+        job_index.close()
+        if ledger is not None:
+            ledger.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Re-filtered {total} jobs in {elapsed:.2f}s with {workers} process(es): "
+        f"{counts['keep']} keep, {counts['skip']} skip"
+    )
+    print(
+        f"Flips against {baseline_name}: {counts['keep -> skip']} keep -> skip, "
+        f"{counts['skip -> keep']} skip -> keep"
+    )
+    for baseline, decision, job, reason in flips:
+        company = company_name(job["subtitle"]) or "?"
+        print(
+            f"  {baseline} -> {decision}  {job['job_id']}  "
+            f"{job['title']} ({company}): {reason}"
+        )
+    return 0
+
+
+def profile(args):
+    """Report the Chrome profile size, prune its caches or snapshot and clone it."""
+    from browser_control.browser_manager_jobs.chrome_profile import ChromeProfile
+
+    if args.action == "size":
+        total, cache, entries = ChromeProfile.size_report(args.profile_dir)
+        print(f"{args.profile_dir}: {total / 1e6:.1f} MB, caches {cache / 1e6:.1f} MB")
+        for size, name in entries[: args.top]:
+            print(f"  {size / 1e6:9.1f} MB  {name}")
+        return 0
+    if args.action == "prune":
+        freed, message = ChromeProfile.prune(args.profile_dir, site_data=args.site_data)
+        ok = freed is not None
+    elif args.action == "snapshot":
+        ok, message = ChromeProfile.snapshot(args.profile_dir, args.golden)
+    else:
+        if not args.to:
+            print("clone needs --to DIR")
+            return 1
+        ok, message = ChromeProfile.clone(args.golden, args.to)
+    print(message)
+    return 0 if ok else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m browser_control", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser(
+        "run", help="open Chrome and apply to the jobs of a search"
+    )
+    run_parser.add_argument(
+        "--search-url",
+        help="LinkedIn jobs search URL; default is built from the saved filters",
+    )
+    run_parser.add_argument("--pages", type=int, help="result pages to process")
+    run_parser.add_argument("--jobs", type=int, help="applications to attempt")
+    run_parser.add_argument(
+        "--metrics", help="write the run counters to this JSON file"
+    )
+    run_parser.add_argument("--headless", action="store_true")
+    run_parser.add_argument("--settings", default=str(DB_DIR / "browser_settings.json"))
+    run_parser.add_argument("--filters", default=str(DB_DIR / "user_filters.json"))
+    run_parser.add_argument("--autofill", default=str(DB_DIR / "form_autofill.json"))
+    run_parser.set_defaults(handler=run)
+
+    refilter_parser = commands.add_parser(
+        "refilter",
+        help="re-run the job filters over stored jobs without a browser",
+    )
+    refilter_parser.add_argument("--filters", default=str(DB_DIR / "user_filters.json"))
+    refilter_parser.add_argument(
+        "--baseline",
+        help="filters file to compare with; default is the outcome of the last run",
+    )
+    refilter_parser.add_argument(
+        "--job-index", default=str(DB_DIR / "job_index.sqlite3")
+    )
+    refilter_parser.add_argument("--ledger", default=str(DB_DIR / "run_ledger.sqlite3"))
+    refilter_parser.add_argument(
+        "--workers",
+        type=int,
+        help="processes to use; default is one per CPU for large archives",
+    )
+    refilter_parser.add_argument("--batch-size", type=int, default=500)
+    refilter_parser.add_argument(
+        "--show", type=int, default=50, help="flipped jobs to list"
+    )
+    refilter_parser.set_defaults(handler=refilter)
+
+    profile_parser = commands.add_parser(
+        "profile",
+        help="measure, prune or snapshot the Chrome profile; Chrome must be closed",
+    )
+    profile_parser.add_argument(
+        "action",
+        nargs="?",
+        default="size",
+        choices=("size", "prune", "snapshot", "clone"),
+    )
+    profile_parser.add_argument("--profile-dir", default=str(PROFILE_DIR))
+    profile_parser.add_argument(
+        "--golden",
+        default=str(GOLDEN_PROFILE_DIR),
+        help="golden profile written by snapshot and read by clone",
+    )
+    profile_parser.add_argument("--to", help="new profile directory for clone")
+    profile_parser.add_argument(
+        "--site-data",
+        action="store_true",
+        help="prune also removes IndexedDB and file system storage",
+    )
+    profile_parser.add_argument(
+        "--top", type=int, default=10, help="largest entries to list"
+    )
+    profile_parser.set_defaults(handler=profile)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,55 @@
 import json
+import sqlite3
 import time
+from datetime import date, datetime
 from pathlib import Path
 
-from selenium import webdriver
 from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     StaleElementReferenceException,
     WebDriverException,
 )
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
 from browser_control.browser_manager_jobs import *
-from .easy_apply__job import apply_to_job
+from browser_control.browser_manager_jobs import apply_failures
+from browser_control.browser_manager_jobs.chrome_profile import DEFAULT_MAX_CACHE_MB
+from browser_control.browser_manager_jobs.chrome_session import DEFAULT_DEBUGGING_PORT
+from browser_control.browser_manager_jobs.job_scorer import company_name
+from browser_control.browser_manager_jobs.memory_watchdog import BROWSER
+from browser_control.browser_manager_jobs.job_description_analyzer import (
+    profile_from_answers,
+)
+from storage import JobIndex, RunLedger
+from .page_drivers import PageDriverError, create_page_driver
 
 PROFILE_DIR = Path(__file__).parent.parent / "chrome_profile"
 PROFILE_DEFAULT = PROFILE_DIR / "Default"
+RUN_LEDGER_PATH = Path(__file__).parent.parent / "DB" / "run_ledger.sqlite3"
+JOB_INDEX_PATH = Path(__file__).parent.parent / "DB" / "job_index.sqlite3"
+SESSION_PATH = Path(__file__).parent.parent / "DB" / "browser_session.json"
 
 
 class BrowserManager:
     def __init__(self, settings_path):
         self.settings_path = settings_path
         self.driver = None
+        self.page = None
+        self.ledger = None
+        self.run_id = None
+        self.page_index = 0
+        self.rate_limiter = None
+        self.form_plans = None
+        self.job_index = None
+        self.analyzer = None
+        self.metrics = {}
+        self.debugger_address = None
+        self.reuse_browser = False
+        self.chrome_pid = None
+        self.headless = False
+        self.page_driver_backend = "selenium"
+        self.search_url = None
+        self.watchdog = None
         self.ensure_profile_dir()
 
     @staticmethod
@@ -33,7 +59,14 @@ class BrowserManager:
         if not gitkeep.exists():
             gitkeep.touch()
 
-    def start_browser(self):
+    def start_browser(self, headless=False):
+        # Imported here so that selenium's WebDriver stack and
+        # webdriver-manager load on first browser start, not with the UI.
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
         try:
             # Load browser settings
             settings_data, message = ConfigurationManager.load_settings(
@@ -46,19 +79,58 @@ class BrowserManager:
             executable_path = settings_data.get("executable_path", "")
             user_data_dir = str(PROFILE_DIR)
             profile_directory = "Default"
+            self.reuse_browser = settings_data.get("reuse_browser", False)
+            self.headless = headless
+            self.chrome_pid = None
+            service = Service(ChromeDriverManager().install())
 
-            # Build Chrome options using ChromeOptionsBuilder
-            chrome_options = ChromeOptionsBuilder.build_options(
-                executable_path, user_data_dir, profile_directory
-            )
+            # A Chrome left running by an earlier session is attached to
+            # whatever reuse_browser says now, as the profile is locked by it.
+            session = ChromeSession.load(SESSION_PATH, user_data_dir)
+            if session is not None:
+                self.debugger_address = session["debugger_address"]
+                self.chrome_pid = session.get("pid")
+                print(f"Attaching to running Chrome at {self.debugger_address}")
+            else:
+                # Chrome is about to be launched, so the profile is not in use.
+                self._prune_profile(settings_data, profile_directory)
+            if session is None and self.reuse_browser:
+                self.debugger_address, detail = ChromeSession.launch(
+                    executable_path,
+                    user_data_dir,
+                    settings_data.get("remote_debugging_port", DEFAULT_DEBUGGING_PORT),
+                    profile_directory,
+                    headless,
+                )
+                if self.debugger_address is None:
+                    print(f"Failed to start browser: {detail}")
+                    return False
+                self.chrome_pid = detail
+                ChromeSession.save(
+                    SESSION_PATH, self.debugger_address, user_data_dir, detail
+                )
+
+            if self.debugger_address is not None:
+                chrome_options = Options()
+                chrome_options.debugger_address = self.debugger_address
+            else:
+                # Build Chrome options using ChromeOptionsBuilder
+                chrome_options = ChromeOptionsBuilder.build_options(
+                    executable_path, user_data_dir, profile_directory
+                )
+                if headless:
+                    ChromeOptionsBuilder.add_headless_options(chrome_options)
 
             # Create WebDriver
-            service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
 
             # Execute anti-detection script
             self.driver.execute_script(ChromeOptionsBuilder.get_anti_detection_script())
 
+            self.page_driver_backend = settings_data.get("page_driver", "selenium")
+            self.page = create_page_driver(self.page_driver_backend, self.driver)
+            print(f"Using {type(self.page).__name__}")
+
             return True
         except (
             FileNotFoundError,
@@ -67,8 +139,22 @@ class BrowserManager:
             WebDriverException,
         ) as e:
             print(f"Failed to start browser: {e}")
+            self.debugger_address = None
             return False
 
+    @staticmethod
+    def _prune_profile(settings_data, profile_directory):
+        """Drop the profile's caches before a launch once they outgrow max_cache_mb."""
+        max_cache_mb = settings_data.get("max_cache_mb", DEFAULT_MAX_CACHE_MB)
+        if not max_cache_mb:
+            return
+        if (
+            ChromeProfile.cache_size(PROFILE_DIR, profile_directory)
+            > max_cache_mb * 1e6
+        ):
+            _, message = ChromeProfile.prune(PROFILE_DIR, profile_directory)
+            print(message)
+
     def go_to_url(self, url):
         if self.driver:
             self.driver.get(url)
@@ -89,21 +175,61 @@ class BrowserManager:
 
         return autofill_data, filters
 
+    def _count(self, name, amount=1):
+        self.metrics[name] = self.metrics.get(name, 0) + amount
+
+    def _record_job(self, job_id, step, outcome=None):
+        """Write the step reached on a job to the run ledger, if one is open."""
+        if self.ledger is not None:
+            self.ledger.record_job(self.run_id, job_id, self.page_index, step, outcome)
+
+    def _quarantined_jobs(self, job_ids, autofill_data):
+        """Quarantined jobs among job_ids, releasing those that can now be filled."""
+        from .easy_apply__job import has_answer
+
+        quarantined = self.ledger.quarantined_jobs(job_ids)
+        for job_id, (failure, questions) in list(quarantined.items()):
+            if (
+                failure == apply_failures.UNKNOWN_REQUIRED_FIELD
+                and questions
+                and all(
+                    has_answer(autofill_data, section, label)
+                    for section, label in questions
+                )
+            ):
+                print(f"Job {job_id}: blocking questions now answered - released")
+                self.ledger.release_job(job_id)
+                del quarantined[job_id]
+        return quarantined
+
+    def _print_quarantine_report(self):
+        blocking = self.ledger.blocking_questions()
+        if blocking:
+            print("\nUnanswered questions blocking quarantined jobs:")
+            for (section, label), count in sorted(
+                blocking.items(), key=lambda item: -item[1]
+            ):
+                print(f"  {count} job(s): [{section}] {label}")
+        for row in self.ledger.failing_forms(5):
+            print(
+                f"  Form {row['form_signature']} of '{row['company']}': "
+                f"{row['failure']} x{row['count']}"
+            )
+
     def _get_job_cards(self):
         """Get job cards from the current page."""
-        WebDriverWait(self.driver, 20)
         time.sleep(2)
 
-        element_extractor = JobElementExtractor(self.driver)
+        element_extractor = JobElementExtractor(self.page)
         job_cards, message = element_extractor.get_job_cards()
 
         print(f"Found {len(job_cards)} job cards on page")
         return job_cards
 
-    def _filter_jobs(self, job_cards, filters, should_continue):
+    def _filter_jobs(self, job_cards, job_filters, autofill_data, should_continue):
         """Filter job cards based on configured criteria."""
-        job_filter = JobFilter(filters)
-        element_extractor = JobElementExtractor(self.driver)
+        job_filter = job_filters.current()
+        element_extractor = JobElementExtractor(self.page)
 
         # Print filter summary
         filter_summary = job_filter.get_filter_summary()
@@ -117,36 +243,75 @@ class BrowserManager:
             f"DEBUG: 'senior' in titleSkipWords = {'senior' in job_filter.title_skip_words}"
         )
 
-        filtered_jobs = []
-        for idx, job_card in enumerate(job_cards):
+        card_infos = element_extractor.read_job_cards(job_cards)
+        self._count("job_cards", len(card_infos))
+        analyses = {}
+        if self.job_index is not None:
+            self.job_index.record_cards(
+                (card_info["job_id"], card_info["title"], card_info["subtitle"])
+                for card_info in card_infos
+            )
+            analyses = self.job_index.analyses(
+                [card_info["job_id"] for card_info in card_infos]
+            )
+        processed_job_ids = set()
+        quarantined = {}
+        if self.ledger is not None:
+            page_job_ids = [card_info["job_id"] for card_info in card_infos]
+            processed_job_ids = self.ledger.processed_job_ids(
+                self.run_id
+            ) | self.ledger.seen_job_ids(page_job_ids)
+            quarantined = self._quarantined_jobs(page_job_ids, autofill_data)
+            if all(
+                job_id in processed_job_ids or job_id in quarantined
+                for job_id in page_job_ids
+            ):
+                print(
+                    f"All {len(page_job_ids)} jobs on page {self.page_index + 1} were already processed - SKIPPING PAGE"
+                )
+                return []
+
+        scored_jobs = []
+        for idx, (job_card, card_info) in enumerate(zip(job_cards, card_infos)):
             if not should_continue():
                 print("Bot stopped by user during filtering.")
                 return None
 
             try:
                 print(f"\nProcessing job card {idx + 1}/{len(job_cards)}")
+                job_id = card_info["job_id"]
+                if job_filters.current() is not job_filter:
+                    job_filter = job_filters.current()
+                    print(f"  Using updated filters (version {job_filter.version})")
+
+                if job_id in processed_job_ids:
+                    print(
+                        f"  Job {idx + 1}: Already processed (job id {job_id}) - SKIPPING"
+                    )
+                    continue
+
+                if job_id in quarantined:
+                    print(
+                        f"  Job {idx + 1}: Quarantined ({quarantined[job_id][0]}) - SKIPPING"
+                    )
+                    continue
 
                 # Check if already applied
-                already_applied, apply_message = element_extractor.is_already_applied(
-                    job_card
-                )
-                if already_applied:
-                    print(f"  Job {idx + 1}: {apply_message} - SKIPPING")
+                if "applied" in card_info["footer"]:
+                    print(
+                        f"  Job {idx + 1}: Already applied (footer: '{card_info['footer']}') - SKIPPING"
+                    )
+                    self._record_job(job_id, "filter", "already_applied")
                     continue
 
-                # Find job title element
-                job_title_el, title_message = element_extractor.find_job_title_element(
-                    job_card
-                )
+                job_title_el = card_info["title_el"]
                 if job_title_el is None:
-                    print(f"  Job {idx + 1}: {title_message} - SKIPPING")
+                    print(f"  Job {idx + 1}: No job title link found - SKIPPING")
                     continue
 
-                print(f"  DEBUG: {title_message}")
-
                 # Get job title and details
-                raw_title = job_title_el.text.strip()
-                aria_label = job_title_el.get_attribute("aria-label") or ""
+                raw_title = card_info["title"]
+                aria_label = card_info["aria_label"]
                 job_title = raw_title.lower()
 
                 print(
@@ -154,10 +319,7 @@ class BrowserManager:
                 )
                 print(f"  DEBUG: aria-label = '{aria_label}'")
 
-                # Get subtitle if available
-                subtitle, subtitle_message = element_extractor.get_job_subtitle(
-                    job_card
-                )
+                subtitle = card_info["subtitle"]
                 if subtitle:
                     print(f"  Job {idx + 1}: Subtitle = '{subtitle}'")
 
@@ -165,54 +327,136 @@ class BrowserManager:
                 should_skip, skip_reason = job_filter.should_skip_by_title(raw_title)
                 if should_skip:
                     print(f"  Job {idx + 1}: {skip_reason} - SKIPPING")
+                    self._record_job(job_id, "filter", "filtered")
                     continue
                 else:
                     print(f"  Job {idx + 1}: {skip_reason} - OK")
 
+                if job_id in analyses:
+                    should_skip, skip_reason = job_filter.should_skip_by_analysis(
+                        analyses[job_id]
+                    )
+                    if should_skip:
+                        print(
+                            f"  Job {idx + 1}: {skip_reason} (stored analysis) - SKIPPING"
+                        )
+                        self._record_job(job_id, "filter", "filtered")
+                        continue
+
+                if self.job_index is not None:
+                    description = self.job_index.known_description(
+                        job_id, raw_title, subtitle
+                    )
+                    if description is not None:
+                        should_skip, skip_reason = (
+                            job_filter.should_skip_by_description(description)
+                        )
+                        if should_skip:
+                            print(
+                                f"  Job {idx + 1}: {skip_reason} (stored description) - SKIPPING"
+                            )
+                            self._record_job(job_id, "filter", "filtered")
+                            continue
+
+                score, score_reason = job_filter.scorer.score_card(card_info)
+                if score is None:
+                    print(f"  Job {idx + 1}: {score_reason} - SKIPPING")
+                    self._record_job(job_id, "filter", "filtered")
+                    continue
+                print(f"  Job {idx + 1}: Score {score:.1f} ({score_reason})")
+
                 print(f"  Job {idx + 1}: PASSED ALL FILTERS - Adding to filtered jobs")
                 # Store the original index along with the job card and title element
-                filtered_jobs.append((idx, job_card, job_title_el))
+                scored_jobs.append(
+                    (
+                        score,
+                        (
+                            idx,
+                            job_card,
+                            job_title_el,
+                            job_id,
+                            company_name(subtitle),
+                        ),
+                    )
+                )
 
             except (
                 NoSuchElementException,
                 StaleElementReferenceException,
                 WebDriverException,
+                PageDriverError,
             ) as e:
                 print(f"  Job {idx + 1}: Error filtering job: {e} - SKIPPING")
 
+        # Apply best matches first
+        budget = self.rate_limiter.remaining_today() if self.rate_limiter else None
+        filtered_jobs = [
+            (*job, score) for score, job in JobScorer.rank(scored_jobs, limit=budget)
+        ]
+        self._count("passed_filters", len(filtered_jobs))
         print(
             f"\nFiltering complete: {len(filtered_jobs)} jobs passed filters out of {len(job_cards)} total jobs"
         )
+        if filtered_jobs:
+            print(
+                "Application order (original position: score): "
+                + ", ".join(f"{job[0] + 1}: {job[-1]:.1f}" for job in filtered_jobs)
+            )
         return filtered_jobs
 
-    def _apply_to_jobs(self, filtered_jobs, autofill_data, filters, should_continue):
+    def _apply_to_jobs(
+        self, filtered_jobs, autofill_data, job_filters, should_continue
+    ):
         """Apply to filtered jobs."""
-        job_filter = JobFilter(filters)
-        element_extractor = JobElementExtractor(self.driver)
-        applied_count = 0
+        from .easy_apply__job import apply_to_job
 
-        for filter_idx, (original_idx, job_card, job_title_el) in enumerate(
-            filtered_jobs
-        ):
+        element_extractor = JobElementExtractor(self.page)
+        applied_count = 0
+        page_reloaded = False
+
+        for filter_idx, (
+            original_idx,
+            job_card,
+            job_title_el,
+            job_id,
+            company,
+            card_score,
+        ) in enumerate(filtered_jobs):
             if not should_continue():
                 print("Bot stopped by user during job application.")
                 return None
 
+            if self.watchdog is not None and self._check_memory():
+                element_extractor = JobElementExtractor(self.page)
+                page_reloaded = True
+
             try:
                 print(
                     f"\nApplying to filtered job {filter_idx + 1}/{len(filtered_jobs)} (original position {original_idx + 1})"
                 )
 
-                # Re-find job cards to avoid stale element reference
-                current_job_cards, _ = element_extractor.get_job_cards()
-
-                if original_idx >= len(current_job_cards):
-                    print(
-                        f"  Job {filter_idx + 1}: Job card no longer available at original position {original_idx + 1} - SKIPPING"
+                if page_reloaded:
+                    # The reloaded list may be in another order; positions
+                    # from the first scrape no longer point at this job.
+                    current_job_card = (
+                        element_extractor.find_job_card(job_id) if job_id else None
                     )
-                    continue
+                    if current_job_card is None:
+                        print(
+                            f"  Job {filter_idx + 1}: Job {job_id} not on the reloaded page - SKIPPING"
+                        )
+                        continue
+                else:
+                    # Re-find job cards to avoid stale element reference
+                    current_job_cards, _ = element_extractor.get_job_cards()
 
-                current_job_card = current_job_cards[original_idx]
+                    if original_idx >= len(current_job_cards):
+                        print(
+                            f"  Job {filter_idx + 1}: Job card no longer available at original position {original_idx + 1} - SKIPPING"
+                        )
+                        continue
+
+                    current_job_card = current_job_cards[original_idx]
 
                 # Re-find job title element
                 current_job_title_el, title_message = (
@@ -227,31 +471,85 @@ class BrowserManager:
                 time.sleep(0.5)
 
                 print(f"  Clicking on job title to open details...")
-                current_job_title_el.click()
+                self._record_job(job_id, "open")
+                self.page.click(current_job_title_el)
                 time.sleep(2)
 
                 # Check badWords in job details
                 job_details, details_message = element_extractor.get_job_details()
+                if self.analyzer is not None:
+                    self.analyzer.collect()
+                    if job_details is not None and job_id:
+                        self.job_index.record_description(job_id, job_details)
+                        if not self.job_index.copy_analysis(job_id):
+                            self.analyzer.submit(
+                                job_id, job_details, self.job_index.title(job_id)
+                            )
                 if job_details is not None:
-                    should_skip, skip_reason = job_filter.should_skip_by_description(
-                        job_details
+                    should_skip, skip_reason = (
+                        job_filters.current().should_skip_by_description(job_details)
                     )
                     if should_skip:
                         print(f"  {skip_reason} - SKIPPING")
+                        self._record_job(job_id, "description", "filtered")
                         continue
                     else:
                         print(f"  {skip_reason} - OK")
+                    scorer = job_filters.current().scorer
+                    score = card_score + scorer.score_description(job_details)
+                    if scorer.is_below_minimum(score):
+                        print(
+                            f"  Score {score:.1f} is below minScore {scorer.min_score} - SKIPPING"
+                        )
+                        self._record_job(job_id, "description", "filtered")
+                        continue
                 else:
                     print(
                         f"  Could not check job details for bad words: {details_message} - Proceeding anyway"
                     )
 
+                if self.rate_limiter is not None and not self.rate_limiter.acquire(
+                    should_continue
+                ):
+                    print("Stopping job applications: rate limit or user stop.")
+                    return None
+
                 print(f"  Calling apply_to_job()...")
-                result = apply_to_job(self.driver, autofill_data)
+                self._record_job(job_id, "apply")
+                self._count("attempted")
+                report = {}
+                result = apply_to_job(
+                    self.driver, autofill_data, self.page, report, self.form_plans
+                )
                 print(f"  apply_to_job() returned: {result}")
+                failure = (
+                    None if result else report.get("failure", apply_failures.ERROR)
+                )
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record_result(result, failure)
+                if failure is not None:
+                    self._count(f"failed_{failure}")
+                    quarantine = failure in apply_failures.DETERMINISTIC_FAILURES
+                    print(
+                        f"  Failure: {failure}"
+                        + (" - job quarantined" if quarantine else "")
+                    )
+                    if self.ledger is not None:
+                        self.ledger.record_failure(
+                            job_id,
+                            failure,
+                            quarantine,
+                            company,
+                            report.get("form_signature"),
+                            report.get("questions", ()),
+                        )
+                self._record_job(
+                    job_id, "apply", "applied" if result else "not_applied"
+                )
 
                 if result:
                     applied_count += 1
+                    self._count("applied")
                     print(
                         f"  Successfully applied! Total applications: {applied_count}"
                     )
@@ -264,45 +562,105 @@ class BrowserManager:
                 StaleElementReferenceException,
                 WebDriverException,
                 TimeoutException,
+                PageDriverError,
             ) as e:
                 print(f"  Error processing filtered job {filter_idx + 1}: {e}")
+                self._record_job(job_id, "apply", "error")
 
         print(f"\nCompleted job applications. Applied to {applied_count} jobs.")
         return applied_count
 
-    def _navigate_to_next_page(self, should_continue):
-        """Navigate to the next page of job listings."""
-        element_extractor = JobElementExtractor(self.driver)
-
-        # Scroll job list to bottom
-        scroll_success, scroll_message = element_extractor.scroll_job_list_to_bottom()
-        if scroll_success:
-            time.sleep(1)
+    def _chrome_root_pid(self):
+        """Pid whose process tree is the Chrome this session drives."""
+        if self.chrome_pid:
+            return self.chrome_pid
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        return process.pid if process is not None else None
+
+    def _recycle_tab(self):
+        """Move the session to a new tab and close the old one with its renderer."""
+        old_handle = self.driver.current_window_handle
+        self.driver.switch_to.new_window("tab")
+        new_handle = self.driver.current_window_handle
+        self.driver.switch_to.window(old_handle)
+        self.driver.close()
+        self.driver.switch_to.window(new_handle)
+        self.page.close()
+        self.page = create_page_driver(self.page_driver_backend, self.driver)
+
+    def _restart_browser(self):
+        self.stop()
+        if not self.start_browser(headless=self.headless):
+            raise WebDriverException("Could not restart the browser")
+
+    def _check_memory(self):
+        """At a job boundary, recycle the tab or the browser if the watchdog asks.
+
+        The current results page is opened again, so the run resumes on it.
+        Returns True when the page was replaced.
+        """
+        action, reason = self.watchdog.check(self.driver, self._chrome_root_pid())
+        if action is None:
+            return False
+        print(f"Memory watchdog: {reason} - recycling the {action}")
+        if action == BROWSER:
+            self._restart_browser()
+            self._count("browser_restarts")
+        else:
+            self._recycle_tab()
+            self._count("tab_recycles")
+        self.watchdog.recycled(action)
+        self.driver.get(SearchUrlBuilder.page_url(self.search_url, self.page_index))
+        time.sleep(2)
+        return True
 
-        # Check if user wants to continue
+    def _navigate_to_page(self, search_url, page_index, should_continue):
+        """Open a results page directly through the search URL start offset."""
         if not should_continue():
             print("Bot stopped by user before next page.")
             return False
 
-        # Find and click next button
-        next_btn, next_message = element_extractor.scroll_to_next_page_button()
-        if next_btn:
-            time.sleep(1)
-            next_btn.click()
-            time.sleep(3)
-            return True
-        else:
-            print(f"No more pages or next button not found. Finished. {next_message}")
-            return False
+        page_url = SearchUrlBuilder.page_url(search_url, page_index)
+        print(f"Opening results page {page_index + 1}: {page_url}")
+        self.driver.get(page_url)
+        self.page_index = page_index
+        return True
 
     def process_job_listings(
-        self, autofill_path, filters_path=None, should_continue=lambda: True
+        self,
+        autofill_path,
+        filters_path=None,
+        should_continue=lambda: True,
+        max_pages=None,
+        max_jobs=None,
     ):
-        """Main method to process job listings with filtering and application."""
+        """Main method to process job listings with filtering and application.
+
+        max_pages stops after that many result pages and max_jobs after that
+        many application attempts; the run stays resumable. Counters of the
+        run are left in self.metrics.
+        """
         if not self.driver:
             print("No driver")
             return False
 
+        # The Easy Apply logic is only loaded once there are jobs to process.
+        from .easy_apply__job import FormPlanCache
+
+        started = time.time()
+        self.metrics = {"started_at": started}
+        if max_jobs is not None:
+            user_should_continue = should_continue
+
+            def should_continue():
+                if self.metrics.get("attempted", 0) >= max_jobs:
+                    print(f"Job limit of {max_jobs} reached.")
+                    return False
+                return user_should_continue()
+
+        autofill_data = None
+        job_filters = None
+        run_status = "stopped"
         try:
             # Load configuration and filters
             autofill_data, filters = self._load_configuration(
@@ -310,28 +668,78 @@ class BrowserManager:
             )
             if autofill_data is None:
                 return False
+            job_filters = JobFilterSource(filters_path)
+
+            search_url = self.driver.current_url
+            self.search_url = search_url
+            self.ledger = RunLedger(RUN_LEDGER_PATH)
+            self.run_id, resume_page_index = self.ledger.begin_run(search_url)
+            start_of_day = datetime.combine(date.today(), datetime.min.time())
+            self.rate_limiter = ApplyRateLimiter(
+                filters.get("rateLimit") if filters else None,
+                self.ledger.count_outcomes_since("applied", start_of_day.timestamp()),
+            )
+            print(
+                f"Applied today: {self.rate_limiter.applied_today}/{self.rate_limiter.daily_cap}"
+            )
+            self.form_plans = FormPlanCache()
+            self.job_index = JobIndex(JOB_INDEX_PATH)
+            self.analyzer = JobDescriptionAnalyzer(
+                self.job_index, profile_from_answers(autofill_data.text_answers())
+            )
+            self.watchdog = MemoryWatchdog(
+                filters.get("memoryWatchdog") if filters else None
+            )
+            self.page_index = SearchUrlBuilder.page_index(search_url)
+            if resume_page_index > self.page_index:
+                print(
+                    f"Resuming run {self.run_id} at page {resume_page_index + 1}, skipping finished jobs"
+                )
+                if not self._navigate_to_page(
+                    search_url, resume_page_index, should_continue
+                ):
+                    return None
 
             while True:
+                # With the daily cap used up no job would be queued; stop here
+                # so the run stays resumable instead of paging to the end.
+                if self.rate_limiter.remaining_today() == 0:
+                    print(
+                        f"Daily cap of {self.rate_limiter.daily_cap} applications "
+                        f"reached, stopping on page {self.page_index + 1}"
+                    )
+                    break
+                if max_pages is not None and self.metrics.get("pages", 0) >= max_pages:
+                    print(f"Page limit of {max_pages} reached.")
+                    break
+                self.ledger.record_page(self.run_id, self.page_index)
+                self._count("pages")
+
                 # Get job cards from current page
                 job_cards = self._get_job_cards()
                 if not job_cards:
                     print("No job cards found on page")
+                    run_status = "finished"
                     break
 
                 # Filter jobs based on criteria
-                filtered_jobs = self._filter_jobs(job_cards, filters, should_continue)
+                filtered_jobs = self._filter_jobs(
+                    job_cards, job_filters, autofill_data, should_continue
+                )
                 if filtered_jobs is None:  # User stopped during filtering
                     return None
 
                 # Apply to filtered jobs
                 applied_count = self._apply_to_jobs(
-                    filtered_jobs, autofill_data, filters, should_continue
+                    filtered_jobs, autofill_data, job_filters, should_continue
                 )
                 if applied_count is None:  # User stopped during application
                     return None
 
                 # Navigate to next page
-                if not self._navigate_to_next_page(should_continue):
+                if not self._navigate_to_page(
+                    search_url, self.page_index + 1, should_continue
+                ):
                     break
 
         except (
@@ -340,11 +748,63 @@ class BrowserManager:
             OSError,
             WebDriverException,
             TimeoutException,
+            PageDriverError,
+            sqlite3.Error,
         ) as e:
             print("Error in process_job_listings:", e)
+            run_status = "failed"
             return False
-
-    def stop(self):
+        finally:
+            self.metrics["status"] = run_status
+            self.metrics["duration_seconds"] = round(time.time() - started, 1)
+            if self.watchdog is not None:
+                for name, value in self.watchdog.peak.items():
+                    self.metrics[f"peak_{name}"] = value
+                self.watchdog = None
+            if self.form_plans is not None and self.form_plans.hits:
+                print(
+                    f"Form plan cache: {self.form_plans.hits} steps filled from plans, "
+                    f"{self.form_plans.misses} processed field by field"
+                )
+            if self.analyzer is not None:
+                self.analyzer.close()
+                self.analyzer = None
+            if self.job_index is not None:
+                self.job_index.close()
+                self.job_index = None
+            if self.ledger is not None:
+                self._print_quarantine_report()
+                self.ledger.finish_run(self.run_id, run_status)
+                self.ledger.close()
+                self.ledger = None
+            if autofill_data is not None:
+                autofill_data.close()
+            if job_filters is not None:
+                job_filters.close()
+
+    def stop(self, close_browser=True):
+        """End the WebDriver session and close Chrome.
+
+        With close_browser=False a Chrome started for reuse is left running,
+        and the next start_browser, in this or another process, attaches to it.
+        """
+        if self.page:
+            self.page.close()
+            self.page = None
         if self.driver:
-            self.driver.quit()
+            if self.debugger_address is not None and not close_browser:
+                # Stop chromedriver only; quit() would end the browser session.
+                self.driver.service.stop()
+            else:
+                if self.debugger_address is not None:
+                    try:
+                        self.driver.execute_cdp_cmd("Browser.close", {})
+                    except WebDriverException:
+                        pass
+                    ChromeSession.clear(SESSION_PATH)
+                try:
+                    self.driver.quit()
+                except WebDriverException:
+                    pass
             self.driver = None
+        self.debugger_address = None
@@ -1,11 +1,26 @@
+from .apply_rate_limiter import ApplyRateLimiter
 from .chrome_options_builder import ChromeOptionsBuilder
+from .chrome_profile import ChromeProfile
+from .chrome_session import ChromeSession
 from .configuration_manager import ConfigurationManager
+from .job_description_analyzer import JobDescriptionAnalyzer
 from .job_element_extractor import JobElementExtractor
-from .job_filter import JobFilter
+from .job_filter import JobFilter, JobFilterSource
+from .job_scorer import JobScorer
+from .memory_watchdog import MemoryWatchdog
+from .search_url_builder import SearchUrlBuilder
 
 __all__ = [
+    "ApplyRateLimiter",
     "ChromeOptionsBuilder",
+    "ChromeProfile",
+    "ChromeSession",
     "ConfigurationManager",
+    "JobDescriptionAnalyzer",
     "JobElementExtractor",
     "JobFilter",
+    "JobFilterSource",
+    "JobScorer",
+    "MemoryWatchdog",
+    "SearchUrlBuilder",
 ]
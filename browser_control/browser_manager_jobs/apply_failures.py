@@ -0,0 +1,21 @@
+"""Failure classes reported by apply_to_job through its report dict."""
+
+UNKNOWN_REQUIRED_FIELD = "unknown_required_field"
+VALIDATION_ERROR = "validation_error"
+EXTERNAL_APPLY = "external_apply"
+NO_EASY_APPLY_BUTTON = "no_easy_apply_button"
+MODAL_NOT_OPENED = "modal_not_opened"
+NO_ACTION_BUTTON = "no_action_button"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+# Retrying these gives the same result, so the job is quarantined.
+DETERMINISTIC_FAILURES = (
+    UNKNOWN_REQUIRED_FIELD,
+    VALIDATION_ERROR,
+    EXTERNAL_APPLY,
+    NO_EASY_APPLY_BUTTON,
+)
+
+# These usually mean LinkedIn is throttling us.
+THROTTLE_FAILURES = (MODAL_NOT_OPENED, NO_ACTION_BUTTON)
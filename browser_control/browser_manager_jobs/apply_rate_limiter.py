@@ -0,0 +1,101 @@
+import time
+from datetime import date
+
+from .apply_failures import THROTTLE_FAILURES
+
+DEFAULT_RATE_LIMIT = {
+    "dailyCap": 50,
+    "perHour": 15,
+    "minPerHour": 3,
+    "burst": 2,
+    "backoffSeconds": 60,
+    "maxBackoffSeconds": 1800,
+}
+
+
+class ApplyRateLimiter:
+    """Paces applications with a token bucket, a daily cap and adaptive backoff.
+
+    Tokens refill at the current hourly rate up to burst, so applications are
+    spread over the hour instead of sent back to back. A failure that looks
+    like throttling (the modal not opening, no action button in the modal)
+    halves the rate and pauses for a backoff that doubles with every further
+    one; each success raises the rate by one per hour up to perHour again.
+    The rate settles near what LinkedIn accepts, which keeps successful
+    applications per hour high without burning time on failing attempts.
+    Settings are the "rateLimit" object of user_filters.json, see
+    DEFAULT_RATE_LIMIT.
+    """
+
+    def __init__(self, settings=None, applied_today=0, clock=time.monotonic):
+        settings = {**DEFAULT_RATE_LIMIT, **(settings or {})}
+        self.daily_cap = settings["dailyCap"]
+        self.max_rate = settings["perHour"]
+        self.min_rate = min(settings["minPerHour"], self.max_rate)
+        self.burst = settings["burst"]
+        self.base_backoff = settings["backoffSeconds"]
+        self.max_backoff = settings["maxBackoffSeconds"]
+        self.clock = clock
+        self.rate = self.max_rate
+        self.tokens = float(self.burst)
+        self.updated_at = clock()
+        self.paused_until = 0.0
+        self.throttle_streak = 0
+        self.applied_today = applied_today
+        self.day = date.today()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated_at) * self.rate / 3600
+        )
+        self.updated_at = now
+        return now
+
+    def remaining_today(self):
+        if date.today() != self.day:
+            self.day = date.today()
+            self.applied_today = 0
+        return max(self.daily_cap - self.applied_today, 0)
+
+    def wait_seconds(self):
+        now = self._refill()
+        wait = max(self.paused_until - now, 0)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) * 3600 / self.rate)
+        return wait
+
+    def acquire(self, should_continue=lambda: True):
+        """Wait until an application may start; False if capped or stopped."""
+        if self.remaining_today() <= 0:
+            print(f"Daily cap of {self.daily_cap} applications reached")
+            return False
+        wait = self.wait_seconds()
+        if wait > 0:
+            print(f"Rate limit: waiting {wait:.0f}s (rate {self.rate:.1f}/hour)")
+        while wait > 0:
+            if not should_continue():
+                return False
+            time.sleep(min(wait, 1.0))
+            wait = self.wait_seconds()
+        self.tokens -= 1
+        return True
+
+    def record_result(self, success, failure=None):
+        """Adapt the rate to the outcome of an application attempt."""
+        self._refill()
+        if success:
+            self.applied_today += 1
+            self.throttle_streak = 0
+            self.rate = min(self.max_rate, self.rate + 1)
+        elif failure in THROTTLE_FAILURES:
+            self.throttle_streak += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            backoff = min(
+                self.base_backoff * 2 ** (self.throttle_streak - 1), self.max_backoff
+            )
+            self.paused_until = self.clock() + backoff
+            print(
+                f"Possible throttling ({failure}, {self.throttle_streak} in a row): "
+                f"pausing {backoff:.0f}s, rate now {self.rate:.1f}/hour"
+            )
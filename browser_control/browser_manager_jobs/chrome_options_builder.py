@@ -1,10 +1,9 @@
-from selenium.webdriver.chrome.options import Options
-
-
 class ChromeOptionsBuilder:
     @staticmethod
     def build_options(executable_path, user_data_dir, profile_directory="Default"):
         """Create and configure Chrome options for automation."""
+        from selenium.webdriver.chrome.options import Options
+
         chrome_options = Options()
         
         # Set Chrome executable path
@@ -0,0 +1,203 @@
+import os
+import shutil
+import socket
+from pathlib import Path
+
+# Caches Chrome rebuilds on demand. Paths are relative to the user-data-dir;
+# "{profile}" is the profile directory (Default).
+CACHE_PATHS = (
+    "{profile}/Cache",
+    "{profile}/Code Cache",
+    "{profile}/GPUCache",
+    "{profile}/DawnCache",
+    "{profile}/DawnGraphiteCache",
+    "{profile}/DawnWebGPUCache",
+    "{profile}/Service Worker",
+    "{profile}/Shared Dictionary",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+    "component_crx_cache",
+    "extensions_crx_cache",
+    "Crashpad",
+)
+# Site data that may hold state, removed only when asked for.
+SITE_DATA_PATHS = ("{profile}/IndexedDB", "{profile}/File System")
+# What a golden profile keeps: settings, cookies and logins, local storage.
+# Local State holds the key the cookies are encrypted with.
+GOLDEN_PATHS = (
+    "Local State",
+    "{profile}/Preferences",
+    "{profile}/Secure Preferences",
+    "{profile}/Cookies",
+    "{profile}/Cookies-journal",
+    "{profile}/Network",
+    "{profile}/Login Data",
+    "{profile}/Login Data-journal",
+    "{profile}/Web Data",
+    "{profile}/Web Data-journal",
+    "{profile}/Local Storage",
+)
+LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+# Caches above this size are pruned before Chrome is launched.
+DEFAULT_MAX_CACHE_MB = 500
+
+
+def directory_size(path):
+    """Total size in bytes of the files under path (path may be a file)."""
+    path = Path(path)
+    if path.is_symlink():
+        return 0
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class ChromeProfile:
+    """Size reports, cache pruning and golden snapshots of a Chrome user-data-dir.
+
+    Everything here must run while no Chrome uses the profile; in_use() checks
+    for the lock Chrome holds on it.
+    """
+
+    @staticmethod
+    def _paths(user_data_dir, patterns, profile_directory):
+        return [
+            Path(user_data_dir) / pattern.format(profile=profile_directory)
+            for pattern in patterns
+        ]
+
+    @staticmethod
+    def in_use(user_data_dir):
+        user_data_dir = Path(user_data_dir)
+        singleton_lock = user_data_dir / "SingletonLock"
+        if os.path.lexists(singleton_lock):
+            # A symlink to "<host>-<pid>"; a dead pid means Chrome crashed.
+            try:
+                host, _, pid = os.readlink(singleton_lock).rpartition("-")
+                if host == socket.gethostname():
+                    os.kill(int(pid), 0)
+            except ProcessLookupError:
+                return False
+            except (OSError, ValueError):
+                pass
+            return True
+        lockfile = user_data_dir / "lockfile"
+        if lockfile.exists():
+            # On Windows the lockfile stays open while Chrome runs; a leftover
+            # one from a crashed Chrome can simply be removed.
+            try:
+                lockfile.unlink()
+            except OSError:
+                return True
+        return False
+
+    @staticmethod
+    def size_report(user_data_dir, profile_directory="Default"):
+        """(total bytes, cache bytes, [(bytes, entry)] of the biggest entries)."""
+        user_data_dir = Path(user_data_dir)
+        if not user_data_dir.exists():
+            return 0, 0, []
+        entries = []
+        for base in (user_data_dir, user_data_dir / profile_directory):
+            if not base.is_dir():
+                continue
+            for entry in base.iterdir():
+                if entry.name == profile_directory and base == user_data_dir:
+                    continue
+                entries.append(
+                    (directory_size(entry), str(entry.relative_to(user_data_dir)))
+                )
+        entries.sort(reverse=True)
+        return (
+            sum(size for size, _ in entries),
+            ChromeProfile.cache_size(user_data_dir, profile_directory),
+            entries,
+        )
+
+    @staticmethod
+    def cache_size(user_data_dir, profile_directory="Default"):
+        return sum(
+            directory_size(path)
+            for path in ChromeProfile._paths(
+                user_data_dir, CACHE_PATHS, profile_directory
+            )
+            if path.exists()
+        )
+
+    @staticmethod
+    def prune(user_data_dir, profile_directory="Default", site_data=False):
+        """Delete the caches, and with site_data IndexedDB and file systems too.
+
+        Cookies, logins, preferences and local storage are kept, so the
+        LinkedIn session survives. Returns (bytes freed or None, message).
+        """
+        if ChromeProfile.in_use(user_data_dir):
+            return None, f"{user_data_dir} is in use by a running Chrome; not pruned"
+        patterns = CACHE_PATHS + (SITE_DATA_PATHS if site_data else ())
+        freed = 0
+        for path in ChromeProfile._paths(user_data_dir, patterns, profile_directory):
+            if not path.exists():
+                continue
+            size = directory_size(path)
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+            except OSError as e:
+                print(f"Could not remove {path}: {e}")
+                continue
+            freed += size
+        return freed, f"Freed {freed / 1e6:.1f} MB in {user_data_dir}"
+
+    @staticmethod
+    def snapshot(user_data_dir, golden_dir, profile_directory="Default"):
+        """Copy the login-relevant part of a profile into an empty golden_dir.
+
+        A golden profile is a few MB instead of hundreds, so cloning it for
+        another Chrome (a parallel worker, a fresh machine) is quick.
+        """
+        if ChromeProfile.in_use(user_data_dir):
+            return False, f"{user_data_dir} is in use by a running Chrome"
+        golden_dir = Path(golden_dir)
+        if golden_dir.exists() and any(golden_dir.iterdir()):
+            return False, f"{golden_dir} is not empty"
+        copied = 0
+        for source in ChromeProfile._paths(
+            user_data_dir, GOLDEN_PATHS, profile_directory
+        ):
+            if not source.exists():
+                continue
+            target = golden_dir / source.relative_to(user_data_dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if source.is_dir():
+                shutil.copytree(source, target)
+            else:
+                shutil.copy2(source, target)
+            copied += directory_size(target)
+        (golden_dir / profile_directory).mkdir(parents=True, exist_ok=True)
+        return True, f"Golden profile of {copied / 1e6:.1f} MB written to {golden_dir}"
+
+    @staticmethod
+    def clone(golden_dir, target_dir):
+        """Create a new user-data-dir from a golden profile."""
+        golden_dir, target_dir = Path(golden_dir), Path(target_dir)
+        if not golden_dir.is_dir():
+            return False, f"No golden profile at {golden_dir}"
+        if target_dir.exists() and any(target_dir.iterdir()):
+            return False, f"{target_dir} is not empty"
+        shutil.copytree(
+            golden_dir,
+            target_dir,
+            ignore=shutil.ignore_patterns(*LOCK_FILES),
+            dirs_exist_ok=True,
+        )
+        return True, f"Cloned {golden_dir} to {target_dir}"
@@ -0,0 +1,126 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from storage import write_text_atomic
+
+DEFAULT_DEBUGGING_PORT = 9222
+STARTUP_TIMEOUT = 20
+
+
+class ChromeSession:
+    """A Chrome started with --remote-debugging-port that outlives the app.
+
+    The endpoint is kept in a small JSON file, so a later process (after a
+    UI restart, a code reload or a CLI run) attaches to the live, logged-in
+    browser through Selenium's debuggerAddress instead of launching it again.
+    """
+
+    @staticmethod
+    def load(session_path, user_data_dir):
+        """The recorded session for user_data_dir if its Chrome still answers."""
+        try:
+            with open(session_path, "r", encoding="utf-8") as f:
+                session = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        if session.get("user_data_dir") != str(user_data_dir):
+            return None
+        if ChromeSession.version(session.get("debugger_address", "")) is None:
+            ChromeSession.clear(session_path)
+            return None
+        return session
+
+    @staticmethod
+    def save(session_path, debugger_address, user_data_dir, pid=None):
+        write_text_atomic(
+            session_path,
+            json.dumps(
+                {
+                    "debugger_address": debugger_address,
+                    "user_data_dir": str(user_data_dir),
+                    "pid": pid,
+                    "started_at": time.time(),
+                },
+                indent=2,
+            ),
+        )
+
+    @staticmethod
+    def clear(session_path):
+        try:
+            os.unlink(session_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def version(debugger_address, timeout=1.0):
+        """The /json/version info of a DevTools endpoint, or None if it is down."""
+        # urllib.request pulls in http.client and ssl; not needed at UI start.
+        import urllib.request
+
+        if not debugger_address:
+            return None
+        try:
+            with urllib.request.urlopen(
+                f"http://{debugger_address}/json/version", timeout=timeout
+            ) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def launch(
+        executable_path,
+        user_data_dir,
+        port=DEFAULT_DEBUGGING_PORT,
+        profile_directory="Default",
+        headless=False,
+        timeout=STARTUP_TIMEOUT,
+    ):
+        """Start a detached Chrome and wait for its DevTools endpoint.
+
+        Returns (debugger_address, pid), or (None, message) when the endpoint
+        does not come up, e.g. because another Chrome holds the profile.
+        """
+        debugger_address = f"127.0.0.1:{port}"
+        if ChromeSession.version(debugger_address) is not None:
+            return None, f"Port {port} is already used by another DevTools endpoint"
+        arguments = [
+            executable_path,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            f"--profile-directory={profile_directory}",
+            "--disable-blink-features=AutomationControlled",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ]
+        if headless:
+            arguments.append("--headless=new")
+        # Detached from this process, so Chrome keeps running when it exits.
+        if sys.platform == "win32":
+            detach = {
+                "creationflags": subprocess.DETACHED_PROCESS
+                | subprocess.CREATE_NEW_PROCESS_GROUP
+            }
+        else:
+            detach = {"start_new_session": True}
+        process = subprocess.Popen(
+            arguments,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **detach,
+        )
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if ChromeSession.version(debugger_address, timeout=0.5) is not None:
+                return debugger_address, process.pid
+            time.sleep(0.2)
+        return None, (
+            f"Chrome did not open port {port} within {timeout}s; close other "
+            f"Chrome windows using {user_data_dir} and try again"
+        )
@@ -1,14 +1,16 @@
 import json
 import os
+import sqlite3
+
+from storage import AutofillKnowledgeBase, ConfigFile
 
 
 class ConfigurationManager:
     @staticmethod
     def load_settings(settings_path):
-        """Load browser settings from file."""
+        """Load the current browser settings snapshot (read-only mapping)."""
         try:
-            with open(settings_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = ConfigFile.open(settings_path).snapshot().data
             
             executable_path = data.get("executable_path", "")
             if not os.path.exists(executable_path):
@@ -20,25 +22,28 @@ class ConfigurationManager:
 
     @staticmethod
     def load_filters(filters_path):
-        """Load job filters from file."""
+        """Load the current job filters snapshot (read-only mapping)."""
         if not filters_path:
             return {}, "No filters_path provided"
         
         try:
-            with open(filters_path, "r", encoding="utf-8") as f:
-                filters = json.load(f)
+            filters = ConfigFile.open(filters_path).snapshot().data
             return filters, f"Successfully loaded filters from {filters_path}"
         except (FileNotFoundError, json.JSONDecodeError, OSError) as e:
             return {}, f"Failed to load filters: {e}"
 
     @staticmethod
     def load_autofill_data(autofill_path):
-        """Load autofill data from file."""
+        """Open the autofill knowledge base kept next to the autofill JSON file."""
         try:
-            with open(autofill_path, "r", encoding="utf-8") as f:
-                autofill_data = json.load(f)
+            autofill_data = AutofillKnowledgeBase.open_for_json(autofill_path)
             return autofill_data, "Autofill data loaded successfully"
-        except (FileNotFoundError, json.JSONDecodeError, OSError) as e:
+        except (
+            FileNotFoundError,
+            json.JSONDecodeError,
+            OSError,
+            sqlite3.Error,
+        ) as e:
             return None, f"Failed to load autofill data: {e}"
 
     @staticmethod
@@ -0,0 +1,240 @@
+import re
+
+from storage import normalize_label
+
+# Canonical skill name -> spellings looked for in descriptions and questions.
+SKILL_ALIASES = {
+    "javascript": ["javascript", "java-script", "js", "es6"],
+    "typescript": ["typescript", "type-script", "ts"],
+    "node.js": ["node.js", "nodejs", "node"],
+    "react": ["react.js", "reactjs", "react"],
+    "next.js": ["next.js", "nextjs"],
+    "angular": ["angular"],
+    "vue": ["vue.js", "vuejs", "vue"],
+    "python": ["python"],
+    "java": ["java"],
+    "c#": ["c#", ".net", "dotnet"],
+    "c++": ["c++", "cpp"],
+    "go": ["golang"],
+    "php": ["php"],
+    "ruby": ["ruby", "rails"],
+    "sql": ["sql", "postgresql", "postgres", "mysql"],
+    "mongodb": ["mongodb", "mongo"],
+    "redis": ["redis"],
+    "graphql": ["graphql"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "aws": ["aws", "amazon web services"],
+    "gcp": ["gcp", "google cloud"],
+    "azure": ["azure"],
+    "devops": ["devops", "ci/cd"],
+    "embedded systems": ["embedded systems", "embedded"],
+    "html": ["html", "html5"],
+    "css": ["css", "scss", "sass", "tailwind"],
+}
+
+# From least to most senior; where several levels match, the most senior wins.
+SENIORITY_PATTERNS = [
+    ("intern", re.compile(r"\b(?:intern|internship|student)\b")),
+    ("junior", re.compile(r"\b(?:junior|jr\.?|entry[- ]level|graduate)\b")),
+    ("mid", re.compile(r"\b(?:mid[- ]level|intermediate)\b")),
+    ("senior", re.compile(r"\b(?:senior|sr\.?)\b")),
+    ("lead", re.compile(r"\b(?:lead|head of|manager)\b")),
+    ("principal", re.compile(r"\b(?:principal|staff|architect)\b")),
+]
+_LEVEL_WORDS = "|".join(pattern.pattern for _, pattern in SENIORITY_PATTERNS)
+# A description mentions levels in passing ("mentor junior developers"); only
+# these phrasings state the level of the position itself.
+SENIORITY_REQUIREMENT_PATTERNS = [
+    re.compile(
+        r"\b(?:looking for|seeking|hiring|searching for|join us as|this is)"
+        r"\s+(?:an?\s+)?(?:" + _LEVEL_WORDS + r")"
+    ),
+    re.compile(r"(?:" + _LEVEL_WORDS + r")[- ](?:level|position|role)\b"),
+    re.compile(r"(?:" + _LEVEL_WORDS + r")[^.;]{0,40}\brequired\b"),
+]
+# Years of experience asked for -> seniority, checked in order.
+YEARS_SENIORITY = [(5, "senior"), (2, "mid"), (0, "junior")]
+
+YEARS_PATTERN = re.compile(
+    r"\b(\d{1,2})\s*(?:\+|plus)?\s*(?:-\s*\d{1,2}\s*)?years?\b"
+    r"(?:\s+of)?(?:\s+[\w-]+){0,3}\s+experience"
+)
+PROFILE_SKILL_PATTERN = re.compile(
+    r"years of (?:work )?experience do you have with (.+)"
+)
+PROFILE_YEARS_PATTERN = re.compile(r"years of (?:work )?experience do you have")
+MAX_YEARS_REQUIRED = 20
+
+
+def _alias_pattern(aliases):
+    alternation = "|".join(re.escape(alias) for alias in aliases)
+    return re.compile(r"(?<![\w.#+])(?:" + alternation + r")(?![\w#+])")
+
+
+SKILL_PATTERNS = {
+    skill: _alias_pattern(aliases) for skill, aliases in SKILL_ALIASES.items()
+}
+
+
+def canonical_skill(name):
+    """Canonical skill name for a spelling such as "React.js"."""
+    name = normalize_label(name).rstrip("?").strip()
+    for skill, pattern in SKILL_PATTERNS.items():
+        if pattern.fullmatch(name):
+            return skill
+    return name
+
+
+def _number(answer):
+    try:
+        return float(str(answer).strip().replace(",", "."))
+    except ValueError:
+        return None
+
+
+def profile_from_answers(text_answers):
+    """Skills and years of experience from the autofill text answers.
+
+    Answers to "How many years of work experience do you have with X?" give
+    {skill: years}; the general "How many years of experience do you have?"
+    question gives the total.
+    """
+    skills = {}
+    years = None
+    for label, answer in text_answers.items():
+        question = normalize_label(label)
+        value = _number(answer)
+        if value is None:
+            continue
+        match = PROFILE_SKILL_PATTERN.search(question)
+        if match:
+            skills[canonical_skill(match.group(1))] = value
+        elif PROFILE_YEARS_PATTERN.search(question) and " as " not in question:
+            years = value
+    if years is None and skills:
+        years = max(skills.values())
+    return {"skills": skills, "years": years}
+
+
+def _most_senior(text):
+    levels = [level for level, pattern in SENIORITY_PATTERNS if pattern.search(text)]
+    return levels[-1] if levels else None
+
+
+def seniority_of(title, text, years_required):
+    """Seniority from the job title, else from the description's requirements.
+
+    In the description only explicit requirements count: the phrasings of
+    SENIORITY_REQUIREMENT_PATTERNS and the years of experience asked for.
+    The most senior of them wins.
+    """
+    seniority = _most_senior(" ".join((title or "").lower().split()))
+    if seniority is not None:
+        return seniority
+    levels = [
+        _most_senior(match.group(0))
+        for pattern in SENIORITY_REQUIREMENT_PATTERNS
+        for match in pattern.finditer(text)
+    ]
+    if years_required is not None:
+        levels.append(
+            next(level for years, level in YEARS_SENIORITY if years_required >= years)
+        )
+    ranks = [level for level, _ in SENIORITY_PATTERNS]
+    return max(levels, key=ranks.index, default=None)
+
+
+def analyze_description(text, profile, title=""):
+    """Skills, seniority, years required and match score of a description.
+
+    Runs in a worker process, so it only takes and returns plain data.
+    match_score is the share of the skills found that the profile has at
+    least a year of, scaled down when the years asked for exceed the
+    profile's; it is None when the description names no known skill.
+    """
+    text = " ".join(text.lower().split())
+    profile_skills = profile.get("skills", {})
+    patterns = dict(SKILL_PATTERNS)
+    for skill in profile_skills:
+        if skill not in patterns:
+            patterns[skill] = _alias_pattern([skill])
+    skills = sorted(
+        skill for skill, pattern in patterns.items() if pattern.search(text)
+    )
+
+    years = [
+        int(match.group(1))
+        for match in YEARS_PATTERN.finditer(text)
+        if int(match.group(1)) <= MAX_YEARS_REQUIRED
+    ]
+    years_required = max(years) if years else None
+    seniority = seniority_of(title, text, years_required)
+
+    match_score = None
+    if skills:
+        known = sum(1 for skill in skills if profile_skills.get(skill, 0) >= 1)
+        match_score = known / len(skills)
+        profile_years = profile.get("years")
+        if years_required and profile_years is not None:
+            match_score *= min(1.0, profile_years / years_required)
+        match_score = round(match_score, 3)
+
+    return {
+        "skills": skills,
+        "seniority": seniority,
+        "years_required": years_required,
+        "match_score": match_score,
+    }
+
+
+class JobDescriptionAnalyzer:
+    """Analyzes job descriptions in worker processes and stores the results.
+
+    submit() hands the raw description text to a ProcessPoolExecutor and
+    returns at once, so the regex work never runs on the bot thread.
+    Finished analyses are written to the job index by collect(), which the
+    bot calls between jobs, and by close(), which waits for the rest.
+    """
+
+    def __init__(self, job_index, profile, max_workers=2):
+        self.job_index = job_index
+        self.profile = profile
+        self.max_workers = max_workers
+        self.executor = None
+        self.pending = {}
+
+    def submit(self, job_id, description, title=""):
+        if not job_id or not description:
+            return
+        if self.executor is None:
+            # multiprocessing is loaded with the first pool, not at import.
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.pending[job_id] = self.executor.submit(
+            analyze_description, description, self.profile, title
+        )
+
+    def collect(self, wait=False):
+        """Store finished analyses; returns how many were stored."""
+        stored = 0
+        for job_id, future in list(self.pending.items()):
+            if not wait and not future.done():
+                continue
+            del self.pending[job_id]
+            try:
+                analysis = future.result()
+            except Exception as e:
+                print(f"Job description analysis failed for job {job_id}: {e}")
+                continue
+            self.job_index.record_analysis(job_id, analysis)
+            stored += 1
+        return stored
+
+    def close(self):
+        if self.executor is None:
+            return
+        self.collect(wait=True)
+        self.executor.shutdown()
+        self.executor = None
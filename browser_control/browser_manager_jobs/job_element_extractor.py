@@ -1,108 +1,209 @@
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.common.by import By
+JOB_CARD_SELECTOR = ".scaffold-layout__list-item"
+JOB_CARD_ID_ATTRIBUTE = "data-occludable-job-id"
+JOB_ID_SELECTOR = "[data-job-id]"
+JOB_TITLE_SELECTORS = [
+    ".artdeco-entity-lockup__title .job-card-container__link",
+    ".job-card-container__link",
+]
+JOB_FOOTER_STATE_SELECTOR = ".job-card-container__footer-job-state"
+JOB_SUBTITLE_SELECTOR = ".artdeco-entity-lockup__subtitle"
+JOB_POSTED_TIME_SELECTOR = "time[datetime]"
+JOB_INSIGHT_SELECTOR = ".job-card-container__job-insight-text"
+JOB_DETAILS_SELECTOR = '[class*="jobs-box__html-content"]'
+NEXT_PAGE_BUTTON_SELECTOR = (
+    'button.jobs-search-pagination__button--next[aria-label*="next"]:not([disabled])'
+)
+JOB_LIST_SCROLL_CONTAINER_SELECTOR = ".scaffold-layout__list > div"
 
 
 class JobElementExtractor:
-    def __init__(self, driver):
-        """Initialize with a WebDriver instance."""
-        self.driver = driver
+    def __init__(self, page):
+        """Initialize with a PageDriver instance."""
+        self.page = page
 
-    @staticmethod
-    def find_job_title_element(job_card):
+    def find_job_title_element(self, job_card):
         """Find a job title element using fallback selectors."""
-        try:
-            job_title_el = job_card.find_element(
-                By.CSS_SELECTOR,
-                ".artdeco-entity-lockup__title .job-card-container__link",
-            )
-            return job_title_el, "Found job title element with first selector"
-        except NoSuchElementException:
-            try:
-                job_title_el = job_card.find_element(
-                    By.CSS_SELECTOR, ".job-card-container__link"
+        for index, selector in enumerate(JOB_TITLE_SELECTORS):
+            job_title_el = self.page.query(selector, within=job_card)
+            if job_title_el is not None:
+                return (
+                    job_title_el,
+                    f"Found job title element with selector #{index + 1}",
                 )
-                return job_title_el, "Found job title element with second selector"
-            except NoSuchElementException:
-                return None, "No job title link found"
+        return None, "No job title link found"
 
-    @staticmethod
-    def is_already_applied(job_card):
+    def is_already_applied(self, job_card):
         """Check if a job has already been applied to."""
-        try:
-            applied_footer = job_card.find_element(
-                By.CSS_SELECTOR, ".job-card-container__footer-job-state"
-            )
-            footer_text = applied_footer.text.strip().lower()
-            if "applied" in footer_text:
-                return True, f"Already applied (footer: '{footer_text}')"
-            return False, "Not applied yet"
-        except NoSuchElementException:
+        applied_footer = self.page.query(JOB_FOOTER_STATE_SELECTOR, within=job_card)
+        if applied_footer is None:
             return False, "No application status found"
+        footer_text = self.page.text(applied_footer).lower()
+        if "applied" in footer_text:
+            return True, f"Already applied (footer: '{footer_text}')"
+        return False, "Not applied yet"
 
-    def get_job_details(self):
-        """Get job details from the current job page."""
-        try:
-            job_details_element = self.driver.find_element(
-                By.CSS_SELECTOR, '[class*="jobs-box__html-content"]'
+    def read_job_cards(self, job_cards):
+        """Read job id, title, aria-label, subtitle and applied state of all cards.
+
+        Costs two round trips for the whole list instead of several per card.
+        Returns one dict per card; "title_el" is None when no title link exists
+        and "job_id" is None when the card carries no job id. "posted_at" (the
+        datetime of the posting) and "insight" (e.g. applicant count) are None
+        when the card does not show them.
+        """
+        with self.page.batch() as batch:
+            pending = [
+                (
+                    [batch.query(s, within=card) for s in JOB_TITLE_SELECTORS],
+                    batch.query(JOB_SUBTITLE_SELECTOR, within=card),
+                    batch.query(JOB_FOOTER_STATE_SELECTOR, within=card),
+                    batch.attributes(card, [JOB_CARD_ID_ATTRIBUTE]),
+                    batch.query(JOB_ID_SELECTOR, within=card),
+                    batch.query(JOB_POSTED_TIME_SELECTOR, within=card),
+                    batch.query(JOB_INSIGHT_SELECTOR, within=card),
+                )
+                for card in job_cards
+            ]
+
+        elements = []
+        job_ids = []
+        for (
+            title_candidates,
+            subtitle,
+            footer,
+            card_id,
+            job_id_el,
+            posted,
+            insight,
+        ) in pending:
+            title_el = next(
+                (c.value for c in title_candidates if c.value is not None), None
+            )
+            elements.append(
+                (title_el, subtitle.value, footer.value, posted.value, insight.value)
+            )
+            job_ids.append(
+                ((card_id.value or {}).get(JOB_CARD_ID_ATTRIBUTE), job_id_el.value)
             )
-            return (
-                job_details_element.text.lower(),
-                "Job details retrieved successfully",
+
+        with self.page.batch() as batch:
+            pending_reads = [
+                (
+                    (
+                        batch.attributes(title_el, ["text", "aria-label"])
+                        if title_el is not None
+                        else None
+                    ),
+                    (
+                        batch.attributes(subtitle, ["text"])
+                        if subtitle is not None
+                        else None
+                    ),
+                    batch.attributes(footer, ["text"]) if footer is not None else None,
+                    (
+                        batch.attributes(job_id_el, ["data-job-id"])
+                        if card_id is None and job_id_el is not None
+                        else None
+                    ),
+                    (
+                        batch.attributes(posted, ["datetime"])
+                        if posted is not None
+                        else None
+                    ),
+                    (
+                        batch.attributes(insight, ["text"])
+                        if insight is not None
+                        else None
+                    ),
+                )
+                for (title_el, subtitle, footer, posted, insight), (
+                    card_id,
+                    job_id_el,
+                ) in zip(elements, job_ids)
+            ]
+
+        cards = []
+        for (title_el, *_), (card_id, _), reads in zip(
+            elements, job_ids, pending_reads
+        ):
+            title, subtitle, footer, job_id, posted, insight = reads
+            cards.append(
+                {
+                    "job_id": card_id
+                    or (job_id.value["data-job-id"] if job_id else None),
+                    "title_el": title_el,
+                    "title": (title.value["text"] or "").strip() if title else "",
+                    "aria_label": (title.value["aria-label"] or "") if title else "",
+                    "subtitle": (
+                        (subtitle.value["text"] or "").strip().lower()
+                        if subtitle
+                        else None
+                    ),
+                    "footer": (
+                        (footer.value["text"] or "").strip().lower() if footer else ""
+                    ),
+                    "posted_at": posted.value["datetime"] if posted else None,
+                    "insight": (
+                        (insight.value["text"] or "").strip().lower()
+                        if insight
+                        else None
+                    ),
+                }
             )
-        except NoSuchElementException:
+        return cards
+
+    def get_job_details(self):
+        """Get job details from the current job page."""
+        job_details_element = self.page.query(JOB_DETAILS_SELECTOR)
+        if job_details_element is None:
             return None, "Could not find job details element"
+        return (
+            self.page.text(job_details_element).lower(),
+            "Job details retrieved successfully",
+        )
 
     def get_job_cards(self):
         """Get all job cards from the current page."""
         try:
-            job_cards = self.driver.find_elements(
-                By.CSS_SELECTOR, ".scaffold-layout__list-item"
-            )
+            job_cards = self.page.query_many(JOB_CARD_SELECTOR)
             return job_cards, f"Found {len(job_cards)} job cards"
         except Exception as e:
             return [], f"Error finding job cards: {e}"
 
-    @staticmethod
-    def get_job_subtitle(job_card):
-        """Get job subtitle/company info from the job card."""
-        try:
-            subtitle = (
-                job_card.find_element(
-                    By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle"
-                )
-                .text.strip()
-                .lower()
+    def find_job_card(self, job_id):
+        """Find the job card of a job id on the current page, or None."""
+        job_card = self.page.query(
+            f'{JOB_CARD_SELECTOR}[{JOB_CARD_ID_ATTRIBUTE}="{job_id}"]'
+        )
+        if job_card is None:
+            job_card = self.page.query(
+                f'{JOB_CARD_SELECTOR}:has([data-job-id="{job_id}"])'
             )
-            return subtitle, "Subtitle found"
-        except NoSuchElementException:
+        return job_card
+
+    def get_job_subtitle(self, job_card):
+        """Get job subtitle/company info from the job card."""
+        subtitle_el = self.page.query(JOB_SUBTITLE_SELECTOR, within=job_card)
+        if subtitle_el is None:
             return None, "No subtitle found"
+        return self.page.text(subtitle_el).lower(), "Subtitle found"
 
     def scroll_to_next_page_button(self):
         """Scroll to and find the next page button."""
-        try:
-            next_btn = self.driver.find_element(
-                By.CSS_SELECTOR,
-                'button.jobs-search-pagination__button--next[aria-label*="next"]:not([disabled])',
-            )
-            if next_btn:
-                self.driver.execute_script(
-                    "arguments[0].scrollIntoView({block: 'center'});", next_btn
-                )
-                return next_btn, "Next button found and scrolled to"
-            return None, "Next button not found"
-        except NoSuchElementException:
+        next_btn = self.page.query(NEXT_PAGE_BUTTON_SELECTOR)
+        if next_btn is None:
             return None, "Next button not found"
+        self.page.run_script(
+            "function (el) { el.scrollIntoView({block: 'center'}); }", next_btn
+        )
+        return next_btn, "Next button found and scrolled to"
 
     def scroll_job_list_to_bottom(self):
         """Scroll the job list container to the bottom."""
-        try:
-            scroll_container = self.driver.find_element(
-                By.CSS_SELECTOR, ".scaffold-layout__list > div"
-            )
-            self.driver.execute_script(
-                "arguments[0].scrollTop = arguments[0].scrollHeight;",
-                scroll_container,
-            )
-            return True, "Scrolled job list to bottom"
-        except NoSuchElementException:
+        scroll_container = self.page.query(JOB_LIST_SCROLL_CONTAINER_SELECTOR)
+        if scroll_container is None:
             return False, "Could not find scroll container"
+        self.page.run_script(
+            "function (el) { el.scrollTop = el.scrollHeight; }", scroll_container
+        )
+        return True, "Scrolled job list to bottom"
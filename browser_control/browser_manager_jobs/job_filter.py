@@ -1,9 +1,27 @@
 import re
 
+from storage import ConfigFile
+from .job_scorer import JobScorer
+
+
+def _any_word_pattern(words, word_boundaries=False):
+    """One compiled alternation matching any of words, or None when empty."""
+    if not words:
+        return None
+    alternation = "|".join(re.escape(word) for word in words)
+    if word_boundaries:
+        alternation = r"\b(?:" + alternation + r")\b"
+    return re.compile(alternation)
+
 
 class JobFilter:
-    def __init__(self, filters_config):
-        """Initialize job filter with configuration."""
+    def __init__(self, filters_config, version=0):
+        """Initialize job filter with configuration.
+
+        The word lists are compiled into one pattern each, so matching a
+        card costs one regex search per list however many words there are.
+        """
+        self.version = version
         self.title_filter_words = [
             w.lower() for w in filters_config.get("titleFilterWords", [])
         ]
@@ -11,44 +29,78 @@ class JobFilter:
             w.lower() for w in filters_config.get("titleSkipWords", [])
         ]
         self.bad_words = [w.lower() for w in filters_config.get("badWords", [])]
+        self.title_filter_pattern = _any_word_pattern(self.title_filter_words)
+        self.title_skip_pattern = _any_word_pattern(self.title_skip_words)
+        self.bad_words_pattern = _any_word_pattern(self.bad_words, word_boundaries=True)
+        self.max_years_required = filters_config.get("maxYearsRequired")
+        self.skip_seniority = [
+            w.lower() for w in filters_config.get("skipSeniority", [])
+        ]
+        self.min_match_score = filters_config.get("minMatchScore")
+        self.scorer = JobScorer(filters_config)
 
     def should_skip_by_title(self, job_title):
         """Check if a job should be skipped based on title filters."""
         job_title_lower = job_title.lower()
 
         # Check title filter words (must match at least one if specified)
-        if self.title_filter_words:
-            matched = any(
-                filter_word in job_title_lower
-                for filter_word in self.title_filter_words
-            )
-            if not matched:
+        if self.title_filter_pattern is not None:
+            if not self.title_filter_pattern.search(job_title_lower):
                 return True, "Title doesn't match filter words"
 
         # Check title skip words (skip if any match)
-        if self.title_skip_words:
-            matched_words = [
-                word for word in self.title_skip_words if word in job_title_lower
-            ]
-            if matched_words:
+        if self.title_skip_pattern is not None:
+            if self.title_skip_pattern.search(job_title_lower):
+                matched_words = [
+                    word for word in self.title_skip_words if word in job_title_lower
+                ]
                 return True, f"Title contains skip words {matched_words}"
 
         return False, "Title passed all filters"
 
     def should_skip_by_description(self, job_description):
         """Check if a job should be skipped based on description content."""
-        if not self.bad_words:
+        if self.bad_words_pattern is None:
             return False, "No bad words filter"
 
         job_description_lower = job_description.lower()
 
         # Check for bad words using word boundaries
-        for bad_word in self.bad_words:
-            if re.search(r"\b" + re.escape(bad_word) + r"\b", job_description_lower):
-                return True, f"Job description contains bad word: {bad_word}"
+        if self.bad_words_pattern.search(job_description_lower):
+            bad_word = next(
+                word
+                for word in self.bad_words
+                if re.search(r"\b" + re.escape(word) + r"\b", job_description_lower)
+            )
+            return True, f"Job description contains bad word: {bad_word}"
 
         return False, "Job description doesn't contain bad words"
 
+    def should_skip_by_analysis(self, analysis):
+        """Check a stored description analysis against maxYearsRequired,
+        skipSeniority and minMatchScore."""
+        years_required = analysis.get("years_required")
+        if (
+            self.max_years_required is not None
+            and years_required is not None
+            and years_required > self.max_years_required
+        ):
+            return True, f"Requires {years_required} years of experience"
+
+        seniority = analysis.get("seniority")
+        if seniority and seniority in self.skip_seniority:
+            return True, f"Seniority '{seniority}' is skipped"
+
+        match_score = analysis.get("match_score")
+        if (
+            self.min_match_score is not None
+            and match_score is not None
+            and match_score < self.min_match_score
+        ):
+            return True, f"Profile match {match_score:.2f} is below minMatchScore"
+
+        return False, "Analysis passed all filters"
+
     def get_filter_summary(self):
         """Get a summary of current filter settings for logging."""
         return {
@@ -59,3 +111,36 @@ class JobFilter:
             "badWords": self.bad_words[:5]
             + (["..."] if len(self.bad_words) > 5 else []),
         }
+
+
+class JobFilterSource:
+    """Keeps a compiled JobFilter for the latest version of the filters file.
+
+    The filter is recompiled once per change of the file, on the thread that
+    published the change, so current() is a plain attribute read and the bot
+    picks up edits made in the Filters tab at the next job card.
+    """
+
+    def __init__(self, filters_path=None):
+        self.config = ConfigFile.open(filters_path) if filters_path else None
+        self._unsubscribe = None
+        if self.config is None:
+            self.job_filter = JobFilter({})
+            return
+        snapshot = self.config.snapshot()
+        self.job_filter = JobFilter(snapshot.data, snapshot.version)
+        self._unsubscribe = self.config.subscribe(self._on_change)
+        self._on_change(self.config.snapshot())
+
+    def _on_change(self, snapshot):
+        if snapshot.version > self.job_filter.version:
+            self.job_filter = JobFilter(snapshot.data, snapshot.version)
+            print(f"Filters changed, compiled filter version {snapshot.version}")
+
+    def current(self):
+        return self.job_filter
+
+    def close(self):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
@@ -0,0 +1,119 @@
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+from .job_filter import JobFilter
+
+KEEP = "keep"
+SKIP = "skip"
+REFILTER_BATCH_SIZE = 500
+# Below this many stored jobs the batches are filtered in this process.
+PARALLEL_MIN_JOBS = 5000
+
+_worker_filters = None
+
+
+def job_decision(job_filter, job):
+    """(KEEP or SKIP, reason) of a stored job record under a JobFilter.
+
+    Runs the checks of a live run in the same order: title, stored analysis,
+    company blacklist, badWords and minScore. Posting age and applicant
+    count are not stored, so they add nothing to the score here.
+    """
+    should_skip, reason = job_filter.should_skip_by_title(job["title"] or "")
+    if should_skip:
+        return SKIP, reason
+    if job.get("analysis"):
+        should_skip, reason = job_filter.should_skip_by_analysis(job["analysis"])
+        if should_skip:
+            return SKIP, reason
+    score, score_reason = job_filter.scorer.score_card(
+        {"title": job["title"], "subtitle": job["subtitle"]}
+    )
+    if score is None:
+        return SKIP, score_reason
+    if job["description"]:
+        description = job["description"].lower()
+        should_skip, reason = job_filter.should_skip_by_description(description)
+        if should_skip:
+            return SKIP, reason
+        score += job_filter.scorer.score_description(description)
+        if job_filter.scorer.is_below_minimum(score):
+            return SKIP, (
+                f"Score {score:.1f} is below minScore {job_filter.scorer.min_score}"
+            )
+    return KEEP, "Passed all filters"
+
+
+def decide_batch(job_filter, baseline_filter, jobs):
+    """Decisions for a batch: (job, new decision, reason, baseline decision)."""
+    results = []
+    for job in jobs:
+        decision, reason = job_decision(job_filter, job)
+        baseline = (
+            job_decision(baseline_filter, job)[0]
+            if baseline_filter is not None
+            else None
+        )
+        results.append((job, decision, reason, baseline))
+    return results
+
+
+def _init_worker(filters, baseline_filters):
+    global _worker_filters
+    _worker_filters = (
+        JobFilter(filters),
+        JobFilter(baseline_filters) if baseline_filters is not None else None,
+    )
+
+
+def _decide_batch_in_worker(jobs):
+    return decide_batch(*_worker_filters, jobs)
+
+
+def _batches(jobs, batch_size):
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def refilter_jobs(
+    jobs,
+    filters,
+    baseline_filters=None,
+    workers=1,
+    batch_size=REFILTER_BATCH_SIZE,
+):
+    """Yield decide_batch results for the stored jobs, batch by batch.
+
+    With more than one worker the batches are filtered in a process pool;
+    at most two batches per worker are in flight, so a large archive is
+    never held in memory at once. Results come back in archive order.
+    filters and baseline_filters are plain filter dicts.
+    """
+    batches = _batches(jobs, batch_size)
+    if workers <= 1:
+        job_filter = JobFilter(filters)
+        baseline_filter = (
+            JobFilter(baseline_filters) if baseline_filters is not None else None
+        )
+        for batch in batches:
+            yield decide_batch(job_filter, baseline_filter, batch)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(filters, baseline_filters),
+    ) as executor:
+        in_flight = collections.deque()
+        for batch in batches:
+            in_flight.append(executor.submit(_decide_batch_in_worker, batch))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
@@ -0,0 +1,139 @@
+import heapq
+import re
+from datetime import date, datetime
+
+APPLICANTS_PATTERN = re.compile(r"(?:over\s+)?(\d[\d,]*)\+?\s+applicants")
+
+DEFAULT_WEIGHTS = {
+    "titleWordMatch": 3.0,
+    "titlePartialMatch": 1.0,
+    "descriptionKeyword": 0.5,
+    "descriptionKeywordCap": 10,
+    "agePerDay": -0.2,
+    "ageCapDays": 30,
+    "applicantsPer100": -1.0,
+    "companyWhitelist": 5.0,
+}
+
+
+def company_name(subtitle):
+    """Company part of a card subtitle such as "acme · tel aviv (hybrid)"."""
+    return (subtitle or "").split("·")[0].strip().lower()
+
+
+def parse_applicants(text):
+    match = APPLICANTS_PATTERN.search((text or "").lower())
+    return int(match.group(1).replace(",", "")) if match else None
+
+
+def parse_posted_date(value):
+    """Date of a card's <time datetime="..."> value, or None."""
+    try:
+        return datetime.strptime((value or "")[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+class JobScorer:
+    """Ranks candidate jobs by how well they match the filters.
+
+    Uses the filter word lists plus weights from the optional "scoring"
+    object of user_filters.json (see DEFAULT_WEIGHTS). A card scores for
+    title filter words (whole word or part of a word), posting age, applicant
+    count and whitelisted companies; jobs of companies in companyBlacklist are
+    excluded. Description keyword hits (descriptionKeywords, falling back to
+    titleFilterWords) are added once the job is opened, and minScore, when
+    set, drops jobs that end up below it.
+    """
+
+    def __init__(self, filters_config):
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(filters_config.get("scoring", {}))
+        self.min_score = filters_config.get("minScore")
+        self.title_words = [
+            w.lower() for w in filters_config.get("titleFilterWords", []) if w
+        ]
+        self.title_word_patterns = [
+            re.compile(r"\b" + re.escape(word) + r"\b") for word in self.title_words
+        ]
+        keywords = filters_config.get("descriptionKeywords") or self.title_words
+        self.description_patterns = [
+            re.compile(r"\b" + re.escape(word.lower()) + r"\b")
+            for word in keywords
+            if word
+        ]
+        self.company_blacklist = {
+            w.strip().lower() for w in filters_config.get("companyBlacklist", [])
+        }
+        self.company_whitelist = {
+            w.strip().lower() for w in filters_config.get("companyWhitelist", [])
+        }
+
+    def score_card(self, card_info, today=None):
+        """Return (score, reason) for a job card; score is None if excluded."""
+        company = company_name(card_info.get("subtitle"))
+        if company and company in self.company_blacklist:
+            return None, f"Company '{company}' is blacklisted"
+
+        title = (card_info.get("title") or "").lower()
+        score = 0.0
+        reasons = []
+        for word, pattern in zip(self.title_words, self.title_word_patterns):
+            if pattern.search(title):
+                score += self.weights["titleWordMatch"]
+                reasons.append(f"title '{word}'")
+            elif word in title:
+                score += self.weights["titlePartialMatch"]
+                reasons.append(f"title ~'{word}'")
+
+        posted = parse_posted_date(card_info.get("posted_at"))
+        if posted is not None:
+            age = min(
+                max(((today or date.today()) - posted).days, 0),
+                self.weights["ageCapDays"],
+            )
+            score += age * self.weights["agePerDay"]
+            reasons.append(f"{age}d old")
+
+        applicants = parse_applicants(
+            f"{card_info.get('insight') or ''} {card_info.get('footer') or ''}"
+        )
+        if applicants is not None:
+            score += applicants / 100 * self.weights["applicantsPer100"]
+            reasons.append(f"{applicants} applicants")
+
+        if company and company in self.company_whitelist:
+            score += self.weights["companyWhitelist"]
+            reasons.append("whitelisted company")
+
+        return score, ", ".join(reasons) or "no signals"
+
+    def score_description(self, job_description):
+        """Score of the description keyword hits, capped."""
+        hits = sum(
+            1
+            for pattern in self.description_patterns
+            if pattern.search(job_description)
+        )
+        return (
+            min(hits, self.weights["descriptionKeywordCap"])
+            * self.weights["descriptionKeyword"]
+        )
+
+    def is_below_minimum(self, score):
+        return self.min_score is not None and score < self.min_score
+
+    @staticmethod
+    def rank(scored_jobs, limit=None):
+        """Order (score, job) pairs best first, ties in page order.
+
+        Jobs are popped off a heap, so taking the best few of a large window
+        does not sort the whole window.
+        """
+        heap = [(-score, order, job) for order, (score, job) in enumerate(scored_jobs)]
+        heapq.heapify(heap)
+        ranked = []
+        while heap and (limit is None or len(ranked) < limit):
+            negative_score, _, job = heapq.heappop(heap)
+            ranked.append((-negative_score, job))
+        return ranked
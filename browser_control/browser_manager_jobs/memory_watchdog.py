@@ -0,0 +1,195 @@
+import statistics
+import subprocess
+import sys
+import time
+from collections import deque
+
+TAB = "tab"
+BROWSER = "browser"
+
+DEFAULT_MEMORY_WATCHDOG = {
+    "checkEveryJobs": 5,
+    "maxJsHeapMb": 400,
+    "maxChromeRssMb": 2500,
+    "maxLatencyFactor": 3.0,
+    "recycleTabEveryJobs": 100,
+}
+LATENCY_PINGS = 3
+# The latency baseline is the median of this many recent healthy samples.
+LATENCY_BASELINE_SAMPLES = 10
+# Round trips below this are never over the limit, whatever the factor:
+# WebDriver and CDP jitter of tens of ms is normal for a healthy browser.
+MIN_LATENCY_LIMIT_MS = 300.0
+# Consecutive over-limit checks before the browser is restarted; the
+# first one recycles the tab, the ones in between give it time.
+BROWSER_RESTART_STREAK = 3
+
+
+def _process_table():
+    """{pid: (parent pid, resident bytes)} of the running processes."""
+    if sys.platform == "win32":
+        command = [
+            "powershell",
+            "-NoProfile",
+            "-Command",
+            "Get-CimInstance Win32_Process | ForEach-Object "
+            '{ "$($_.ProcessId) $($_.ParentProcessId) $($_.WorkingSetSize)" }',
+        ]
+        unit = 1
+    else:
+        command = ["ps", "-A", "-o", "pid=,ppid=,rss="]
+        unit = 1024
+    output = subprocess.run(
+        command, capture_output=True, text=True, timeout=10, check=True
+    ).stdout
+    table = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) == 3 and all(field.isdigit() for field in fields):
+            pid, ppid, rss = map(int, fields)
+            table[pid] = (ppid, rss * unit)
+    return table
+
+
+def process_tree_rss(root_pid):
+    """Resident memory of root_pid and all its descendants, or None."""
+    try:
+        table = _process_table()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if root_pid not in table:
+        return None
+    children = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        total += table[pid][1]
+        pending.extend(children.get(pid, ()))
+    return total
+
+
+def js_heap_bytes(driver):
+    """JSHeapUsedSize of the current tab from CDP Performance.getMetrics."""
+    driver.execute_cdp_cmd("Performance.enable", {})
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    for metric in metrics:
+        if metric["name"] == "JSHeapUsedSize":
+            return metric["value"]
+    return None
+
+
+def webdriver_latency_ms(driver, pings=LATENCY_PINGS):
+    """Median round trip of a trivial WebDriver command."""
+    times = []
+    for _ in range(pings):
+        started = time.perf_counter()
+        driver.execute_script("return 1")
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+class MemoryWatchdog:
+    """Decides at job boundaries when Chrome should be recycled.
+
+    Every checkEveryJobs jobs it samples the JS heap of the tab (CDP
+    Performance.getMetrics), the resident memory of the Chrome process tree
+    and the WebDriver round trip, which is compared with the median of the
+    recent healthy samples. A check over a limit asks for a fresh tab; if
+    the checks stay over for BROWSER_RESTART_STREAK in a row, the tab did
+    not help and the whole browser is restarted. The tab
+    is also recycled every recycleTabEveryJobs jobs. Settings are the
+    "memoryWatchdog" object of user_filters.json, see DEFAULT_MEMORY_WATCHDOG;
+    0 turns a limit off.
+    """
+
+    def __init__(self, settings=None):
+        settings = {**DEFAULT_MEMORY_WATCHDOG, **(settings or {})}
+        self.check_every = settings["checkEveryJobs"]
+        self.max_js_heap = settings["maxJsHeapMb"] * 1e6
+        self.max_rss = settings["maxChromeRssMb"] * 1e6
+        self.max_latency_factor = settings["maxLatencyFactor"]
+        self.recycle_every = settings["recycleTabEveryJobs"]
+        self.jobs_since_check = 0
+        self.jobs_since_recycle = 0
+        self.recent_latencies = deque(maxlen=LATENCY_BASELINE_SAMPLES)
+        self.over_limit_streak = 0
+        self.last_sample = {}
+        self.peak = {}
+
+    def sample(self, driver, root_pid=None):
+        """Current {"js_heap_mb", "rss_mb", "latency_ms"}; None where unknown."""
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            heap = js_heap_bytes(driver)
+        except (WebDriverException, KeyError):
+            heap = None
+        rss = process_tree_rss(root_pid) if root_pid else None
+        sample = {
+            "js_heap_mb": round(heap / 1e6, 1) if heap is not None else None,
+            "rss_mb": round(rss / 1e6, 1) if rss is not None else None,
+            "latency_ms": round(webdriver_latency_ms(driver), 1),
+        }
+        for name, value in sample.items():
+            if value is not None:
+                self.peak[name] = max(self.peak.get(name, value), value)
+        self.last_sample = sample
+        return sample
+
+    @property
+    def baseline_latency_ms(self):
+        if not self.recent_latencies:
+            return None
+        return statistics.median(self.recent_latencies)
+
+    def _over_limit(self, sample):
+        if self.max_rss and sample["rss_mb"] and sample["rss_mb"] * 1e6 > self.max_rss:
+            return f"Chrome uses {sample['rss_mb']:.0f} MB"
+        if (
+            self.max_js_heap
+            and sample["js_heap_mb"]
+            and sample["js_heap_mb"] * 1e6 > self.max_js_heap
+        ):
+            return f"JS heap is {sample['js_heap_mb']:.0f} MB"
+        baseline = self.baseline_latency_ms
+        if (
+            self.max_latency_factor
+            and baseline is not None
+            and sample["latency_ms"]
+            > max(baseline * self.max_latency_factor, MIN_LATENCY_LIMIT_MS)
+        ):
+            return (
+                f"WebDriver round trip is {sample['latency_ms']:.0f}ms, "
+                f"{sample['latency_ms'] / baseline:.1f}x the recent median"
+            )
+        return None
+
+    def check(self, driver, root_pid=None):
+        """Call once per job boundary; returns (TAB, BROWSER or None, reason)."""
+        self.jobs_since_check += 1
+        self.jobs_since_recycle += 1
+        if self.check_every and self.jobs_since_check >= self.check_every:
+            self.jobs_since_check = 0
+            sample = self.sample(driver, root_pid)
+            reason = self._over_limit(sample)
+            if reason is not None:
+                self.over_limit_streak += 1
+                if self.over_limit_streak >= BROWSER_RESTART_STREAK:
+                    return BROWSER, reason
+                if self.over_limit_streak == 1:
+                    return TAB, reason
+                return None, None
+            self.over_limit_streak = 0
+            self.recent_latencies.append(sample["latency_ms"])
+        if self.recycle_every and self.jobs_since_recycle >= self.recycle_every:
+            return TAB, f"{self.jobs_since_recycle} jobs on this tab"
+        return None, None
+
+    def recycled(self, action):
+        """Note that the tab or the browser was replaced."""
+        self.jobs_since_recycle = 0
+        if action == BROWSER:
+            self.over_limit_streak = 0
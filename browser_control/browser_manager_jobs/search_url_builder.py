@@ -0,0 +1,43 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+SEARCH_BASE_URL = "https://www.linkedin.com/jobs/search/?"
+JOBS_PER_PAGE = 25
+TIME_FILTER_CODES = ("r86400", "r604800", "r2592000")
+
+
+class SearchUrlBuilder:
+    @staticmethod
+    def build_search_url(job_title, time_code, easy_apply_only):
+        """Build a LinkedIn job search URL from the saved filters."""
+        params = []
+        if job_title:
+            params.append(f"keywords={job_title.replace(' ', '%20')}")
+        if time_code in TIME_FILTER_CODES:
+            params.append(f"f_TPR={time_code}")
+        if easy_apply_only:
+            params.append("f_AL=true")
+        return SEARCH_BASE_URL + "&".join(params)
+
+    @staticmethod
+    def page_url(search_url, page_index):
+        """Return the search URL for a zero-based results page via the start offset."""
+        parts = urlsplit(search_url)
+        query = [
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key not in ("start", "currentJobId")
+        ]
+        if page_index > 0:
+            query.append(("start", str(page_index * JOBS_PER_PAGE)))
+        return urlunsplit(
+            (parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment)
+        )
+
+    @staticmethod
+    def page_index(url):
+        """Return the zero-based results page a search URL points at."""
+        start = dict(parse_qsl(urlsplit(url).query)).get("start", "0")
+        try:
+            return max(int(start), 0) // JOBS_PER_PAGE
+        except ValueError:
+            return 0
@@ -1,17 +1,170 @@
+import hashlib
 import json
 import time
 
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
+    TimeoutException,
     WebDriverException,
 )
 from selenium.webdriver.common.by import By
 
+from browser_control.browser_manager_jobs import apply_failures
 from browser_control.easy_apply__utils import *
+from browser_control.page_drivers import PageDriverError, SeleniumPageDriver
+from storage import as_autofill_store, normalize_label
 
+AUTOFILL_JSON_PATH = "DB/form_autofill.json"
 
-def apply_to_job(driver, autofill_data):
+MODAL_SELECTORS = [
+    ".artdeco-modal",
+    "[data-test-modal]",
+    ".jobs-easy-apply-modal",
+    ".ember-application .ember-view .artdeco-modal",
+    "[role='dialog']",
+    ".artdeco-modal--layer-default",
+]
+FIELD_ERROR_SELECTOR = ".artdeco-inline-feedback--error"
+PLACEHOLDER_OPTION = "Select an option"
+
+
+def answer_option(entry):
+    """The stored option a radio or dropdown entry's answer picks, or None.
+
+    The answer is the entry's defaultValue; the options' selected flags only
+    mirror it. An empty or placeholder answer, or one that is none of the
+    options, is no answer.
+    """
+    if entry is None or entry.get("defaultValue") in (None, "", PLACEHOLDER_OPTION):
+        return None
+    return next(
+        (
+            option
+            for option in entry["options"]
+            if option["value"] == entry["defaultValue"]
+        ),
+        None,
+    )
+
+
+def has_answer(autofill_store, section, label):
+    """Whether the store has a usable answer for a question."""
+    if section == "textInput":
+        return bool(autofill_store.text_answer(label))
+    return answer_option(autofill_store.find_entry(section, label)) is not None
+
+
+class AnswerTracker:
+    """Autofill store wrapper that notes the questions of a form.
+
+    Remembers every question looked up and the ones without a usable answer,
+    so a failed application can name the questions that blocked it and the
+    form can be identified by a signature of its questions.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.questions = []
+        self.unanswered = []
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def _note(self, section, label, answered):
+        question = [section, label]
+        if question not in self.questions:
+            self.questions.append(question)
+        if not answered and question not in self.unanswered:
+            self.unanswered.append(question)
+
+    def use_text_answer(self, label):
+        answer = self.store.use_text_answer(label)
+        self._note("textInput", label, bool(answer))
+        return answer
+
+    def find_entry(self, section, label):
+        entry = self.store.find_entry(section, label)
+        self._note(section, label, answer_option(entry) is not None)
+        return entry
+
+    def form_signature(self):
+        """Short hash of the form's question kinds and labels, or None."""
+        if not self.questions:
+            return None
+        keys = sorted(
+            f"{section}:{normalize_label(label)}" for section, label in self.questions
+        )
+        return hashlib.sha1("\n".join(keys).encode("utf-8")).hexdigest()[:16]
+
+
+class FormPlanCache:
+    """Fill plans of form steps seen before, keyed by step signature.
+
+    A plan is the state a step was left in after its fields were processed
+    one by one (text values, checkbox states, chosen radio and option
+    positions) plus the questions it asked. Plans are recorded only for
+    steps whose questions all had answers, and are tied to the autofill
+    store revision they were built from, so an edited answer retires them.
+    """
+
+    def __init__(self):
+        self.plans = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, signature, revision):
+        cached = self.plans.get(signature)
+        if cached is None or cached[0] != revision:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached[1]
+
+    def put(self, signature, revision, plan):
+        self.plans[signature] = (revision, plan)
+
+    def discard(self, signature):
+        self.plans.pop(signature, None)
+
+
+def _report_failure(report, failure, tracker=None):
+    if report is None:
+        return
+    report["failure"] = failure
+    if tracker is not None:
+        report["questions"] = list(tracker.unanswered)
+        report["form_signature"] = tracker.form_signature()
+
+
+def _classify_unfinished(page, tracker, failure):
+    """Failure class of an application that ran out of steps or buttons."""
+    try:
+        has_errors = bool(page.probe([FIELD_ERROR_SELECTOR]).get(FIELD_ERROR_SELECTOR))
+    except (WebDriverException, PageDriverError):
+        has_errors = False
+    if has_errors:
+        if tracker.unanswered:
+            return apply_failures.UNKNOWN_REQUIRED_FIELD
+        return apply_failures.VALIDATION_ERROR
+    return failure or apply_failures.TIMEOUT
+
+
+def apply_to_job(driver, autofill_data, page=None, report=None, form_plans=None):
+    """Run the Easy Apply flow for the open job.
+
+    autofill_data is an autofill store (such as AutofillKnowledgeBase) or a
+    plain form_autofill.json dict, which is then saved back to that file.
+    When a report dict is given and the application fails, report["failure"]
+    is one of the apply_failures classes; "questions" lists the [section,
+    label] pairs without an answer and "form_signature" identifies the form.
+    A FormPlanCache shared across jobs lets known form steps be filled from
+    their cached plan.
+    """
+    if page is None:
+        page = SeleniumPageDriver(driver)
+    autofill_store = AnswerTracker(as_autofill_store(autofill_data, AUTOFILL_JSON_PATH))
+    external_apply_seen = False
     try:
 
         if handle_save_application_modal(driver):
@@ -109,6 +262,7 @@ def apply_to_job(driver, autofill_data):
                             f"❌ This is regular Apply button (not Easy Apply) - skipping"
                         )
                         # TODO: Add logic for regular Apply buttons (external company website)
+                        external_apply_seen = True
                         easy_apply_btn = None
                         continue
                     else:
@@ -144,6 +298,14 @@ def apply_to_job(driver, autofill_data):
             except Exception as e:
                 print(f"Could not debug buttons: {e}")
 
+            _report_failure(
+                report,
+                (
+                    apply_failures.EXTERNAL_APPLY
+                    if external_apply_seen
+                    else apply_failures.NO_EASY_APPLY_BUTTON
+                ),
+            )
             return False
 
         print(f"Clicking Easy Apply button...")
@@ -190,18 +352,12 @@ def apply_to_job(driver, autofill_data):
                 print("Save modal handled during application process")
                 return True
 
-            modal_selectors = [
-                ".artdeco-modal",
-                "[data-test-modal]",
-                ".jobs-easy-apply-modal",
-                ".ember-application .ember-view .artdeco-modal",
-                "[role='dialog']",
-                ".artdeco-modal--layer-default",
-            ]
+            modal_counts = page.probe(MODAL_SELECTORS)
+            modal_selectors = [s for s in MODAL_SELECTORS if modal_counts.get(s)]
 
             apply_modal = None
 
-            for selector in modal_selectors:
+            for selector in modal_selectors or MODAL_SELECTORS[:1]:
                 apply_modal = wait_for_element(driver, selector, timeout=3)
                 if apply_modal:
                     print(f"Modal found with selector: {selector}")
@@ -253,6 +409,7 @@ def apply_to_job(driver, autofill_data):
                     print(
                         "No application modal found after multiple attempts - this might be an error"
                     )
+                    _report_failure(report, apply_failures.MODAL_NOT_OPENED)
                     return False
 
                 smart_delay(2.0)
@@ -261,13 +418,19 @@ def apply_to_job(driver, autofill_data):
 
             print(f"Modal found! Processing application form...")
 
-            form = None
-            try:
-                form = apply_modal.find_element(By.CSS_SELECTOR, "form")
+            # Only the form inside this modal: other forms on the page, such as
+            # the search bar, must not be filled or fingerprinted. A Selenium
+            # page driver takes the WebElement itself as a handle.
+            modal = (
+                apply_modal
+                if isinstance(page, SeleniumPageDriver)
+                else page.query(selector)
+            )
+            form = page.query("form", within=modal) if modal is not None else None
+            if form is not None:
                 print(f"Form found in modal")
-            except NoSuchElementException:
+            else:
                 print(f"No form found in modal")
-                pass
 
             if not form:
                 print("No form found in modal, checking for completion messages...")
@@ -306,15 +469,13 @@ def apply_to_job(driver, autofill_data):
 
             form_updated = False
             if form:
-                form_updated = process_form_fields(form, autofill_data)
+                form_updated = fill_form_step(page, form, autofill_store, form_plans)
                 print("Form fields processed")
             else:
                 print("No form to process, skipping form field processing")
 
             if form_updated:
-
-                with open("DB/form_autofill.json", "w", encoding="utf-8") as f:
-                    json.dump(autofill_data, f, ensure_ascii=False, indent=2)
+                autofill_store.save()
 
             next_action = find_next_action_button(driver, apply_modal)
 
@@ -380,8 +541,15 @@ def apply_to_job(driver, autofill_data):
                         print(f"Error checking completion: {e}")
 
                     print("Terminating application process - no valid buttons found")
+                    _report_failure(
+                        report,
+                        _classify_unfinished(
+                            page, autofill_store, apply_failures.NO_ACTION_BUTTON
+                        ),
+                        autofill_store,
+                    )
                     terminate_job_modal(driver)
-                    break
+                    return False
 
             if next_action["type"] == "submit":
                 print("Found submit button, attempting to submit application")
@@ -664,11 +832,24 @@ def apply_to_job(driver, autofill_data):
 
             iteration += 1
 
+        print(f"Application not submitted after {max_iterations} steps")
+        _report_failure(
+            report, _classify_unfinished(page, autofill_store, None), autofill_store
+        )
         close_all_modals(driver)
-        return True
+        return False
 
     except Exception as e:
         print(f"Error in apply_to_job: {e}")
+        _report_failure(
+            report,
+            (
+                apply_failures.TIMEOUT
+                if isinstance(e, TimeoutException)
+                else apply_failures.ERROR
+            ),
+            autofill_store,
+        )
         try:
             close_all_modals(driver)
         except WebDriverException:
@@ -676,44 +857,247 @@ def apply_to_job(driver, autofill_data):
         return False
 
 
-def process_form_fields(form, autofill_data):
+FIELD_ATTRIBUTES = ["tag", "type", "name", "aria-label", "placeholder", "id", "value"]
+RADIO_FIELDSET_SELECTOR = (
+    'fieldset[data-test-form-builder-radio-button-form-component="true"]'
+)
+
+
+def process_form_fields(page, form, autofill_data):
     """
     Process all form fields (inputs, radio buttons, dropdowns) in the given form.
     """
+    autofill_store = as_autofill_store(autofill_data)
     updated = False
 
-    if process_input_fields(form, autofill_data):
+    if process_input_fields(page, form, autofill_store):
         updated = True
 
-    if process_radio_buttons(form, autofill_data):
+    if process_radio_buttons(page, form, autofill_store):
         updated = True
 
-    if process_dropdowns(form, autofill_data):
+    if process_dropdowns(page, form, autofill_store):
         updated = True
 
     return updated
 
 
-def process_input_fields(form, autofill_data):
+def fill_form_step(page, form, autofill_data, form_plans=None):
+    """
+    Fill one form step, replaying a cached fill plan when the step is known.
+
+    The step's layout is read in a few batched round trips and hashed; on a
+    plan hit the planned values are set directly and checked with one more
+    read, skipping label resolution and database matching. Anything that
+    does not verify falls back to process_form_fields.
+    """
+    if form_plans is None:
+        return process_form_fields(page, form, autofill_data)
+    tracker = autofill_data
+    if not isinstance(tracker, AnswerTracker):
+        tracker = AnswerTracker(as_autofill_store(autofill_data))
+
+    layout = read_form_layout(page, form)
+    plan = form_plans.get(layout.signature, tracker.revision())
+    if plan is not None:
+        if apply_form_plan(page, layout, plan):
+            for section, label in plan["questions"]:
+                tracker._note(section, label, True)
+            print(f"Filled form step from cached plan {layout.signature[:12]}")
+            return False
+        print("Cached form plan did not verify, processing fields one by one")
+        form_plans.discard(layout.signature)
+
+    questions = len(tracker.questions)
+    unanswered = len(tracker.unanswered)
+    updated = process_form_fields(page, form, tracker)
+    if len(tracker.unanswered) == unanswered:
+        plan = read_layout_state(page, layout)
+        plan["questions"] = tracker.questions[questions:]
+        form_plans.put(layout.signature, tracker.revision(), plan)
+    return updated
+
+
+class FormLayout:
+    """Field handles of a form step and the structural signature of the step."""
+
+    def __init__(self, inputs, input_kinds, radio_groups, option_lists, signature):
+        self.inputs = inputs
+        self.input_kinds = input_kinds
+        self.radio_groups = radio_groups
+        self.option_lists = option_lists
+        self.signature = signature
+
+
+def _input_kind(attributes):
+    if attributes["tag"] == "textarea":
+        return "text"
+    if attributes["tag"] == "input" and attributes["type"] in ("text", "email", "tel"):
+        return "text"
+    if attributes["tag"] == "input" and attributes["type"] == "checkbox":
+        return "checkbox"
+    return None
+
+
+def read_form_layout(page, form):
+    """
+    Read the fields of a form step and hash its labels, field names and types.
+
+    Element ids are left out of the signature because LinkedIn generates them
+    per job; radio values and option values are part of it.
+    """
+    with page.batch() as batch:
+        pending_inputs = batch.query_many("input, textarea", within=form)
+        pending_fieldsets = batch.query_many(RADIO_FIELDSET_SELECTOR, within=form)
+        pending_selects = batch.query_many("select", within=form)
+        pending_labels = batch.query_many("label, legend", within=form)
+
+    with page.batch() as batch:
+        pending_input_attributes = [
+            batch.attributes(field, FIELD_ATTRIBUTES + ["checked"])
+            for field in pending_inputs.value
+        ]
+        pending_label_texts = [
+            batch.attributes(label, ["text"]) for label in pending_labels.value
+        ]
+        pending_radios = [
+            batch.query_many('input[type="radio"]', within=fieldset)
+            for fieldset in pending_fieldsets.value
+        ]
+        pending_options = [
+            batch.query_many("option", within=select)
+            for select in pending_selects.value
+        ]
+
+    radio_groups = [pending.value for pending in pending_radios]
+    option_lists = [pending.value for pending in pending_options]
+    with page.batch() as batch:
+        pending_radio_values = [
+            [batch.attributes(radio, ["value"]) for radio in radios]
+            for radios in radio_groups
+        ]
+        pending_option_values = [
+            [batch.attributes(option, ["value"]) for option in options]
+            for options in option_lists
+        ]
+
+    inputs = []
+    input_kinds = []
+    input_structure = []
+    for field, pending in zip(pending_inputs.value, pending_input_attributes):
+        attributes = pending.value
+        kind = _input_kind(attributes)
+        if kind is None:
+            continue
+        inputs.append(field)
+        input_kinds.append(kind)
+        input_structure.append(
+            [
+                attributes[name]
+                for name in ("tag", "type", "name", "aria-label", "placeholder")
+            ]
+        )
+    structure = {
+        "labels": [(p.value["text"] or "").strip() for p in pending_label_texts],
+        "inputs": input_structure,
+        "radios": [[p.value["value"] for p in group] for group in pending_radio_values],
+        "options": [
+            [p.value["value"] for p in group] for group in pending_option_values
+        ],
+    }
+    signature = hashlib.sha1(
+        json.dumps(structure, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return FormLayout(inputs, input_kinds, radio_groups, option_lists, signature)
+
+
+def read_layout_state(page, layout):
+    """
+    Current text values, checkbox states and chosen radio/option positions.
+    """
+    with page.batch() as batch:
+        pending_inputs = [
+            batch.attributes(field, ["value", "checked"]) for field in layout.inputs
+        ]
+        pending_radios = [
+            [batch.attributes(radio, ["checked"]) for radio in radios]
+            for radios in layout.radio_groups
+        ]
+        pending_options = [
+            [batch.attributes(option, ["selected"]) for option in options]
+            for options in layout.option_lists
+        ]
+
+    def chosen(group, name):
+        return next(
+            (position for position, p in enumerate(group) if p.value[name]), None
+        )
+
+    return {
+        "inputs": [
+            (p.value["value"] or "") if kind == "text" else bool(p.value["checked"])
+            for kind, p in zip(layout.input_kinds, pending_inputs)
+        ],
+        "radios": [chosen(group, "checked") for group in pending_radios],
+        "options": [chosen(group, "selected") for group in pending_options],
+    }
+
+
+def apply_form_plan(page, layout, plan):
+    """
+    Set a step to its planned state; returns True when it reads back as planned.
+    """
+    state = read_layout_state(page, layout)
+    try:
+        for field, current, planned in zip(
+            layout.inputs, state["inputs"], plan["inputs"]
+        ):
+            if current == planned:
+                continue
+            if isinstance(planned, bool):
+                page.click(field)
+            else:
+                page.fill(field, planned)
+        for elements, current, planned in (
+            *zip(layout.radio_groups, state["radios"], plan["radios"]),
+            *zip(layout.option_lists, state["options"], plan["options"]),
+        ):
+            if planned is not None and current != planned:
+                page.click(elements[planned])
+    except (WebDriverException, PageDriverError) as e:
+        print(f"Failed to apply cached form plan: {e}")
+        return False
+    smart_delay(0.1)
+    state = read_layout_state(page, layout)
+    return all(state[key] == plan[key] for key in ("inputs", "radios", "options"))
+
+
+def process_input_fields(page, form, autofill_store):
     """
     Process input and textarea fields in the form.
     """
     updated = False
-    inputs = form.find_elements(By.CSS_SELECTOR, "input, textarea")
+    inputs = page.query_many("input, textarea", within=form)
+
+    with page.batch() as batch:
+        pending_attributes = [
+            batch.attributes(field, FIELD_ATTRIBUTES + ["checked"]) for field in inputs
+        ]
 
-    for field in inputs:
+    for field, pending in zip(inputs, pending_attributes):
         try:
-            tag = field.tag_name
-            type_ = field.get_attribute("type")
-            name = get_field_name(field, form)
-            value = field.get_attribute("value")
+            attributes = pending.value
+            tag = attributes["tag"]
+            type_ = attributes["type"]
+            name = get_field_name(page, field, form, attributes)
+            value = attributes["value"]
 
             if tag == "input" and type_ == "checkbox":
-                if not field.is_selected():
+                if not attributes["checked"]:
                     try:
-                        field.click()
+                        page.click(field)
                         smart_delay(0.1)
-                    except WebDriverException:
+                    except (WebDriverException, PageDriverError):
                         pass
                 continue
 
@@ -722,23 +1106,17 @@ def process_input_fields(form, autofill_data):
                 and type_ in ("text", "email", "tel")
                 or tag == "textarea"
             ):
-                db_section = "textInput"
-                autofill_section = autofill_data.get(db_section, {})
-                autofill_val = autofill_section.get(name, None)
+                autofill_val = autofill_store.use_text_answer(name)
 
                 if autofill_val and value != autofill_val:
                     try:
-                        field.clear()
-                        field.send_keys(autofill_val)
+                        page.fill(field, autofill_val)
                         smart_delay(0.1)
                         print(f"Filled text input '{name}' with value: {autofill_val}")
                     except Exception as e:
                         print(f"Failed to fill text input '{name}': {e}")
                 elif not autofill_val and name:
-                    if db_section not in autofill_data:
-                        autofill_data[db_section] = {}
-                    if name not in autofill_data[db_section]:
-                        autofill_data[db_section][name] = value or ""
+                    if autofill_store.add_text_question(name, value or ""):
                         updated = True
                         print(
                             f"Added new text input field to database: '{name}' = '{value or ''}'"
@@ -752,77 +1130,67 @@ def process_input_fields(form, autofill_data):
     return updated
 
 
-def process_radio_buttons(form, autofill_data):
+def process_radio_buttons(page, form, autofill_store):
     """
     Process radio button fieldsets in the form.
     """
     updated = False
-    radio_fieldsets = form.find_elements(
-        By.CSS_SELECTOR,
-        'fieldset[data-test-form-builder-radio-button-form-component="true"]',
-    )
+    radio_fieldsets = page.query_many(RADIO_FIELDSET_SELECTOR, within=form)
 
     for fieldset in radio_fieldsets:
         try:
-            legend = fieldset.find_element(By.TAG_NAME, "legend")
-            label_el = None
-            try:
-                label_el = legend.find_element(
-                    By.CSS_SELECTOR, 'span[aria-hidden="true"]'
+            with page.batch() as batch:
+                pending_legend = batch.query("legend", within=fieldset)
+                pending_label = batch.query(
+                    'legend span[aria-hidden="true"]', within=fieldset
                 )
-            except NoSuchElementException:
-                pass
+                pending_radios = batch.query_many(
+                    'input[type="radio"]', within=fieldset
+                )
+
+            label_el = pending_label.value or pending_legend.value
+            if label_el is None:
+                raise PageDriverError("Radio fieldset has no legend")
+            label = page.text(label_el)
 
-            label = label_el.text.strip() if label_el else legend.text.strip()
+            radios = pending_radios.value
+            with page.batch() as batch:
+                pending_radio_attributes = [
+                    batch.attributes(radio, ["value", "checked", "id"])
+                    for radio in radios
+                ]
+            radio_attributes = [pending.value for pending in pending_radio_attributes]
 
             options = []
-            radios = fieldset.find_elements(By.CSS_SELECTOR, 'input[type="radio"]')
             selected_value = None
 
-            for radio in radios:
-                radio_label = get_radio_label(radio, fieldset)
+            for radio, attributes in zip(radios, radio_attributes):
+                radio_label = get_radio_label(page, radio, fieldset, attributes["id"])
                 options.append(
                     {
-                        "value": radio.get_attribute("value"),
+                        "value": attributes["value"],
                         "text": radio_label,
-                        "selected": radio.is_selected(),
+                        "selected": bool(attributes["checked"]),
                     }
                 )
-                if radio.is_selected():
-                    selected_value = radio.get_attribute("value")
+                if attributes["checked"]:
+                    selected_value = attributes["value"]
 
-            if "radioButtons" not in autofill_data:
-                autofill_data["radioButtons"] = []
-
-            found = next(
-                (
-                    rb
-                    for rb in autofill_data["radioButtons"]
-                    if rb["placeholderIncludes"].strip().lower()
-                    == label.strip().lower()
-                ),
-                None,
-            )
+            found = autofill_store.find_entry("radioButtons", label)
 
             if found:
 
-                stored_selected_option = next(
-                    (o for o in found["options"] if o["selected"]),
-                    None,
-                )
+                stored_selected_option = answer_option(found)
 
                 if (
                     stored_selected_option
                     and stored_selected_option["value"] != selected_value
                 ):
 
-                    for radio in radios:
-                        if (
-                            radio.get_attribute("value")
-                            == stored_selected_option["value"]
-                        ):
+                    for radio, attributes in zip(radios, radio_attributes):
+                        if attributes["value"] == stored_selected_option["value"]:
                             try:
-                                radio.click()
+                                page.click(radio)
                                 smart_delay(0.2)
                                 print(
                                     f"Selected radio button: {stored_selected_option['value']} for {label}"
@@ -837,26 +1205,20 @@ def process_radio_buttons(form, autofill_data):
                         f"Radio button group '{label}' already has correct value: {selected_value}"
                     )
 
-                same_options = found["options"] == options
-                same_default = found.get("defaultValue", None) == selected_value
-                if not (same_options and same_default):
-                    found["options"] = options
-                    if selected_value:
-                        found["defaultValue"] = selected_value
-                    found["count"] += 1
+                if autofill_store.record_entry_use(
+                    "radioButtons", found, options, selected_value
+                ):
                     updated = True
-                else:
-                    found["count"] += 1
             else:
-                autofill_data["radioButtons"].append(
+                autofill_store.add_entry(
+                    "radioButtons",
                     {
                         "placeholderIncludes": label,
-                        "defaultValue": selected_value
-                        or (options[0]["value"] if options else ""),
+                        "defaultValue": selected_value or "",
                         "count": 1,
                         "createdAt": int(time.time() * 1000),
                         "options": options,
-                    }
+                    },
                 )
                 updated = True
 
@@ -866,22 +1228,30 @@ def process_radio_buttons(form, autofill_data):
     return updated
 
 
-def process_dropdowns(form, autofill_data):
+def process_dropdowns(page, form, autofill_store):
     updated = False
-    selects = form.find_elements(By.TAG_NAME, "select")
+    selects = page.query_many("select", within=form)
 
     for select in selects:
         try:
 
-            label = get_dropdown_label(select)
+            label = get_dropdown_label(page, select)
+
+            option_elements = page.query_many("option", within=select)
+            with page.batch() as batch:
+                pending_options = [
+                    batch.attributes(option, ["value", "text", "selected"])
+                    for option in option_elements
+                ]
 
             options = []
-            for option in select.find_elements(By.TAG_NAME, "option"):
+            for pending in pending_options:
+                attributes = pending.value
                 options.append(
                     {
-                        "value": option.get_attribute("value"),
-                        "text": option.text.strip(),
-                        "selected": option.is_selected(),
+                        "value": attributes["value"],
+                        "text": (attributes["text"] or "").strip(),
+                        "selected": bool(attributes["selected"]),
                     }
                 )
 
@@ -890,42 +1260,21 @@ def process_dropdowns(form, autofill_data):
                 options[0]["value"] if options else "",
             )
 
-            if "dropdowns" not in autofill_data:
-                autofill_data["dropdowns"] = []
-
-            found = next(
-                (
-                    d
-                    for d in autofill_data["dropdowns"]
-                    if d["placeholderIncludes"].strip().lower() == label.strip().lower()
-                ),
-                None,
-            )
+            found = autofill_store.find_entry("dropdowns", label)
 
             if found:
 
-                stored_selected_option = next(
-                    (
-                        o
-                        for o in found["options"]
-                        if o["selected"] and o["value"] != "Select an option"
-                    ),
-                    None,
-                )
+                stored_selected_option = answer_option(found)
 
                 if (
                     stored_selected_option
                     and stored_selected_option["value"] != selected_value
                 ):
 
-                    option_elements = select.find_elements(By.TAG_NAME, "option")
-                    for option_elem in option_elements:
-                        if (
-                            option_elem.get_attribute("value")
-                            == stored_selected_option["value"]
-                        ):
+                    for option_elem, option in zip(option_elements, options):
+                        if option["value"] == stored_selected_option["value"]:
                             try:
-                                option_elem.click()
+                                page.click(option_elem)
                                 smart_delay(0.2)
                                 print(
                                     f"Selected dropdown option: {stored_selected_option['value']} for {label}"
@@ -942,24 +1291,19 @@ def process_dropdowns(form, autofill_data):
                         f"Dropdown '{label}' already has correct value: {selected_value}"
                     )
 
-                same_options = found["options"] == options
-                same_default = found.get("defaultValue", None) == selected_value
-                if not (same_options and same_default):
-                    found["options"] = options
-                    found["defaultValue"] = selected_value
-                    found["count"] += 1
+                if autofill_store.record_entry_use(
+                    "dropdowns", found, options, selected_value
+                ):
                     updated = True
-                else:
-                    found["count"] += 1
             else:
-
-                autofill_data["dropdowns"].append(
+                autofill_store.add_entry(
+                    "dropdowns",
                     {
                         "placeholderIncludes": label,
                         "count": 1,
                         "options": options,
                         "defaultValue": selected_value,
-                    }
+                    },
                 )
                 updated = True
 
@@ -969,65 +1313,61 @@ def process_dropdowns(form, autofill_data):
     return updated
 
 
-def get_field_name(field, form):
+def get_label_text(page, label_el):
+    """
+    Get the visible text of a label, preferring its aria-hidden span.
+    """
+    span = page.query('span[aria-hidden="true"]', within=label_el)
+    return page.text(span) if span is not None else page.text(label_el)
+
+
+def get_field_name(page, field, form, attributes=None):
     """
     Get field name from various attributes.
     """
+    if attributes is None:
+        attributes = page.attributes(field, FIELD_ATTRIBUTES)
     name = (
-        field.get_attribute("name")
-        or field.get_attribute("aria-label")
-        or field.get_attribute("placeholder")
+        attributes.get("name")
+        or attributes.get("aria-label")
+        or attributes.get("placeholder")
     )
 
     if not name:
-        field_id = field.get_attribute("id")
+        field_id = attributes.get("id")
         if field_id:
             try:
-                label_el = form.find_element(
-                    By.CSS_SELECTOR, f'label[for="{field_id}"]'
-                )
-                span = None
-                try:
-                    span = label_el.find_element(
-                        By.CSS_SELECTOR, 'span[aria-hidden="true"]'
-                    )
-                except NoSuchElementException:
-                    pass
-                name = span.text.strip() if span else label_el.text.strip()
-            except (
-                NoSuchElementException,
-                StaleElementReferenceException,
-                WebDriverException,
-                AttributeError,
-            ):
+                label_el = page.query(f'label[for="{field_id}"]', within=form)
+                if label_el is not None:
+                    name = get_label_text(page, label_el)
+            except (WebDriverException, PageDriverError, AttributeError):
                 pass
 
     return name
 
 
-def get_radio_label(radio, fieldset):
+def get_radio_label(page, radio, fieldset, radio_id=None):
     """
     Get label text for a radio button.
     """
     radio_label = ""
+    if radio_id is None:
+        radio_id = page.attributes(radio, ["id"])["id"]
     try:
-        radio_label_el = fieldset.find_element(
-            By.CSS_SELECTOR, f'label[for="{radio.get_attribute("id")}"]'
-        )
-        radio_label = radio_label_el.text.strip()
-    except (
-        NoSuchElementException,
-        StaleElementReferenceException,
-        WebDriverException,
-        AttributeError,
-    ):
+        if radio_id:
+            radio_label_el = page.query(f'label[for="{radio_id}"]', within=fieldset)
+            if radio_label_el is not None:
+                radio_label = page.text(radio_label_el)
+    except (WebDriverException, PageDriverError, AttributeError):
         pass
 
     if not radio_label:
-        parent = radio.find_element(By.XPATH, "..")
-        spans = parent.find_elements(By.TAG_NAME, "span")
-        for s in spans:
-            t = s.text.strip()
+        parent = page.parent(radio)
+        spans = page.query_many("span", within=parent) if parent is not None else []
+        with page.batch() as batch:
+            pending_texts = [batch.attributes(s, ["text"]) for s in spans]
+        for pending in pending_texts:
+            t = (pending.value["text"] or "").strip()
             if t:
                 radio_label = t
                 break
@@ -1035,32 +1375,17 @@ def get_radio_label(radio, fieldset):
     return radio_label
 
 
-def get_dropdown_label(select):
+def get_dropdown_label(page, select):
     """
     Get label text for a dropdown select element.
     """
     try:
-        parent = select.find_element(
-            By.XPATH, "ancestor::div[contains(@class, 'fb-dash-form-element')]"
-        )
-        label_el = parent.find_element(By.TAG_NAME, "label")
-
-        aria_hidden = None
-        try:
-            aria_hidden = label_el.find_element(
-                By.CSS_SELECTOR, 'span[aria-hidden="true"]'
-            )
-        except NoSuchElementException:
-            pass
-
-        label = aria_hidden.text.strip() if aria_hidden else label_el.text.strip()
-        return label
-    except (
-        NoSuchElementException,
-        StaleElementReferenceException,
-        WebDriverException,
-        AttributeError,
-    ):
+        parent = page.closest(select, "div.fb-dash-form-element")
+        label_el = page.query("label", within=parent) if parent is not None else None
+        if label_el is None:
+            raise PageDriverError("Dropdown has no label")
+        return get_label_text(page, label_el)
+    except (WebDriverException, PageDriverError, AttributeError):
         return f"Dropdown {int(time.time())}"
 
 
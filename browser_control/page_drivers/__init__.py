@@ -0,0 +1,75 @@
+"""Page driver backends.
+
+The backends are imported on first use (PEP 562 module __getattr__), so
+importing this package for PAGE_DRIVER_BACKENDS, as the UI does, does not
+load selenium, bs4 or websockets.
+"""
+
+import importlib
+
+PAGE_DRIVER_BACKENDS = ("selenium", "cdp")
+
+_EXPORTS = {
+    "PageDriver": ".page_driver",
+    "PageBatch": ".page_driver",
+    "BatchResult": ".page_driver",
+    "PageDriverError": ".page_driver",
+    "SeleniumPageDriver": ".selenium_page_driver",
+    "CdpConnection": ".cdp_connection",
+    "CdpError": ".cdp_connection",
+    "AsyncCdpPage": ".cdp_page_driver",
+    "CdpElement": ".cdp_page_driver",
+    "CdpPageDriver": ".cdp_page_driver",
+    "StaleElementError": ".cdp_page_driver",
+    "SoupPageDriver": ".soup_page_driver",
+    "SoupWebDriver": ".soup_web_driver",
+    "SoupWebElement": ".soup_web_driver",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def create_page_driver(backend, driver):
+    """Build the configured PageDriver for a live Selenium session."""
+    from .cdp_connection import CdpError
+    from .cdp_page_driver import CdpPageDriver
+    from .selenium_page_driver import SeleniumPageDriver
+
+    if backend == "cdp":
+        debugger_address = driver.capabilities.get("goog:chromeOptions", {}).get(
+            "debuggerAddress"
+        )
+        if debugger_address:
+            try:
+                return CdpPageDriver(debugger_address, driver.current_window_handle)
+            except (CdpError, OSError) as e:
+                print(f"Could not attach CDP page driver: {e}")
+        print("Falling back to Selenium page driver")
+    return SeleniumPageDriver(driver)
+
+
+__all__ = [
+    "PageDriver",
+    "PageBatch",
+    "BatchResult",
+    "PageDriverError",
+    "SeleniumPageDriver",
+    "CdpConnection",
+    "CdpError",
+    "AsyncCdpPage",
+    "CdpElement",
+    "CdpPageDriver",
+    "StaleElementError",
+    "SoupPageDriver",
+    "SoupWebDriver",
+    "SoupWebElement",
+    "PAGE_DRIVER_BACKENDS",
+    "create_page_driver",
+]
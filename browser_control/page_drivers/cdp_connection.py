@@ -0,0 +1,94 @@
+import asyncio
+import itertools
+import json
+import urllib.request
+
+import websockets
+
+from .page_driver import PageDriverError
+
+
+class CdpError(PageDriverError):
+    """Raised when a DevTools command fails or the connection drops."""
+
+
+def list_page_targets(debugger_address, timeout=5):
+    """Return the DevTools page targets (tabs) exposed at debugger_address."""
+    url = f"http://{debugger_address}/json/list"
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        targets = json.load(response)
+    return [target for target in targets if target.get("type") == "page"]
+
+
+class CdpConnection:
+    """One DevTools websocket with request/response correlation by message id."""
+
+    def __init__(self, websocket_url):
+        self.websocket_url = websocket_url
+        self._websocket = None
+        self._reader = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+
+    async def connect(self):
+        self._websocket = await websockets.connect(
+            self.websocket_url, max_size=None, ping_interval=None
+        )
+        self._reader = asyncio.create_task(self._read_loop())
+        return self
+
+    @property
+    def is_open(self):
+        return self._reader is not None and not self._reader.done()
+
+    async def _read_loop(self):
+        try:
+            async for raw_message in self._websocket:
+                message = json.loads(raw_message)
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(
+                        CdpError(message["error"].get("message", "Unknown error"))
+                    )
+                else:
+                    future.set_result(message.get("result", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CdpError("DevTools connection closed"))
+            self._pending.clear()
+
+    async def send(self, method, params=None, timeout=30):
+        """Send a DevTools command and wait for its result.
+
+        A dropped socket or a command without an answer raises CdpError, so
+        callers catching PageDriverError fail the current job and go on.
+        """
+        if self._websocket is None:
+            raise CdpError("DevTools connection is not open")
+        message_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._websocket.send(
+                json.dumps({"id": message_id, "method": method, "params": params or {}})
+            )
+            return await asyncio.wait_for(future, timeout)
+        except websockets.ConnectionClosed as e:
+            raise CdpError(f"DevTools connection closed: {e}") from e
+        except asyncio.TimeoutError as e:
+            raise CdpError(f"{method} got no answer within {timeout}s") from e
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def close(self):
+        if self._websocket is not None:
+            await self._websocket.close()
+            self._websocket = None
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
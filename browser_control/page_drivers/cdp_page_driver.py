@@ -0,0 +1,252 @@
+import asyncio
+import concurrent.futures
+import json
+import threading
+
+from .cdp_connection import CdpConnection, CdpError, list_page_targets
+from .page_driver import (
+    PageDriver,
+    BATCH_SCRIPT,
+    CLICK_SCRIPT,
+    FILL_SCRIPT,
+    PROBE_SCRIPT,
+    SNAPSHOT_SCRIPT,
+)
+
+# Must match the error thrown by lookup() in HANDLE_WRAPPER_SCRIPT.
+STALE_HANDLE_MESSAGE = "Stale element handle"
+
+# Handles are WeakRefs, so the registry does not keep removed nodes alive.
+# Dead or detached entries are dropped on lookup, and by a sweep whenever
+# the registry doubles (from 1000 entries on).
+HANDLE_WRAPPER_SCRIPT = """
+function (fn, args) {
+    const registry = window.__pageDriverHandles
+        || (window.__pageDriverHandles = {next: 1, elements: new Map(), sweepAt: 1000});
+    function live(ref) {
+        const element = ref.deref();
+        return element && element.isConnected ? element : null;
+    }
+    function lookup(id) {
+        const ref = registry.elements.get(id);
+        const element = ref && live(ref);
+        if (!element) {
+            registry.elements.delete(id);
+            throw new Error("Stale element handle " + id);
+        }
+        return element;
+    }
+    function sweep() {
+        for (const [id, ref] of registry.elements) {
+            if (!live(ref)) registry.elements.delete(id);
+        }
+        registry.sweepAt = Math.max(1000, registry.elements.size * 2);
+    }
+    function decode(value) {
+        if (Array.isArray(value)) return value.map(decode);
+        if (value && typeof value === "object") {
+            if ("__handle__" in value) return lookup(value.__handle__);
+            const decoded = {};
+            for (const key of Object.keys(value)) decoded[key] = decode(value[key]);
+            return decoded;
+        }
+        return value;
+    }
+    function encode(value) {
+        if (value instanceof Element) {
+            if (registry.elements.size >= registry.sweepAt) sweep();
+            const id = registry.next++;
+            registry.elements.set(id, new WeakRef(value));
+            return {"__handle__": id};
+        }
+        if (Array.isArray(value)) return value.map(encode);
+        return value;
+    }
+    return encode(fn.apply(null, decode(args)));
+}
+"""
+
+
+class StaleElementError(CdpError):
+    """Raised when a CdpElement's node was removed from the page."""
+
+
+class CdpElement:
+    """Element handle kept in the page-side registry of one tab."""
+
+    def __init__(self, target_id, handle_id):
+        self.target_id = target_id
+        self.handle_id = handle_id
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, CdpElement)
+            and other.target_id == self.target_id
+            and other.handle_id == self.handle_id
+        )
+
+    def __hash__(self):
+        return hash((self.target_id, self.handle_id))
+
+    def __repr__(self):
+        return f"CdpElement({self.target_id!r}, {self.handle_id})"
+
+
+class AsyncCdpPage:
+    """Async page operations for a single tab over its own DevTools websocket."""
+
+    def __init__(self, connection, target_id):
+        self.connection = connection
+        self.target_id = target_id
+
+    def _encode(self, value):
+        if isinstance(value, CdpElement):
+            return {"__handle__": value.handle_id}
+        raise TypeError(f"Cannot pass {type(value).__name__} to the page")
+
+    def _decode(self, value):
+        if isinstance(value, list):
+            return [self._decode(item) for item in value]
+        if isinstance(value, dict):
+            if set(value) == {"__handle__"}:
+                return CdpElement(self.target_id, value["__handle__"])
+            return {key: self._decode(item) for key, item in value.items()}
+        return value
+
+    async def evaluate(self, function_source, *args):
+        """Call a JavaScript function in the page and return its decoded value."""
+        arguments = json.dumps(list(args), default=self._encode)
+        result = await self.connection.send(
+            "Runtime.evaluate",
+            {
+                "expression": f"({HANDLE_WRAPPER_SCRIPT})(({function_source}), {arguments})",
+                "returnByValue": True,
+                "awaitPromise": True,
+            },
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get(
+                "text"
+            )
+            if message and STALE_HANDLE_MESSAGE in message:
+                raise StaleElementError(message)
+            raise CdpError(message)
+        return self._decode(result.get("result", {}).get("value"))
+
+    async def run_script(self, script, *args):
+        return await self.evaluate(script, *args)
+
+    async def snapshot(self, selector=None):
+        return await self.evaluate(SNAPSHOT_SCRIPT, selector)
+
+    async def probe(self, selectors):
+        return await self.evaluate(PROBE_SCRIPT, list(selectors)) or {}
+
+    async def execute_batch(self, operations):
+        values = await self.evaluate(BATCH_SCRIPT, operations)
+        return values or [None] * len(operations)
+
+    async def click(self, element):
+        return bool(await self.evaluate(CLICK_SCRIPT, element))
+
+    async def fill(self, target, value):
+        return bool(await self.evaluate(FILL_SCRIPT, target, value))
+
+
+class CdpPageDriver(PageDriver):
+    """PageDriver talking to Chrome over the DevTools Protocol with asyncio.
+
+    The event loop lives on a private daemon thread, so the synchronous bot code
+    can use it like any other PageDriver, while gather() issues operations for
+    several tabs concurrently.
+    """
+
+    def __init__(self, debugger_address, target_id=None):
+        self.debugger_address = debugger_address
+        self._pages = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self.target_id = target_id or self.list_tabs()[0]["id"]
+
+    def list_tabs(self):
+        return list_page_targets(self.debugger_address)
+
+    def _run(self, coroutine, timeout=60):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    async def _page(self, target_id):
+        page = self._pages.get(target_id)
+        if page is None or not page.connection.is_open:
+            targets = await self._loop.run_in_executor(None, self.list_tabs)
+            target = next((t for t in targets if t["id"] == target_id), None)
+            if target is None:
+                raise CdpError(f"No DevTools target with id {target_id}")
+            connection = await CdpConnection(target["webSocketDebuggerUrl"]).connect()
+            page = AsyncCdpPage(connection, target_id)
+            self._pages[target_id] = page
+        return page
+
+    async def _call(self, target_id, operation, *args):
+        page = await self._page(target_id)
+        return await getattr(page, operation)(*args)
+
+    def _call_current(self, operation, *args):
+        return self._run(self._call(self.target_id, operation, *args))
+
+    def switch_to(self, target_id):
+        self.target_id = target_id
+
+    def run_script(self, script, *args):
+        return self._call_current("run_script", script, *args)
+
+    def execute_batch(self, operations):
+        return self._call_current("execute_batch", operations)
+
+    def click(self, element):
+        if element is None:
+            return False
+        return self._call_current("click", element)
+
+    def fill(self, target, value):
+        return self._call_current("fill", target, value)
+
+    def gather(self, operations):
+        """Run (target_id, operation, args) tuples concurrently, results in order.
+
+        Operations are AsyncCdpPage method names. Failed operations yield their
+        exception instead of a result.
+        """
+
+        async def _gather():
+            return await asyncio.gather(
+                *(
+                    self._call(target_id, operation, *args)
+                    for target_id, operation, args in operations
+                ),
+                return_exceptions=True,
+            )
+
+        return self._run(_gather())
+
+    def close(self):
+        async def _close_all():
+            await asyncio.gather(
+                *(page.connection.close() for page in self._pages.values()),
+                return_exceptions=True,
+            )
+            self._pages.clear()
+
+        if self._loop.is_running():
+            try:
+                self._run(_close_all(), timeout=10)
+            except (
+                CdpError,
+                OSError,
+                asyncio.TimeoutError,
+                concurrent.futures.TimeoutError,
+            ):
+                pass
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
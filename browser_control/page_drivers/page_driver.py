@@ -0,0 +1,233 @@
+from abc import ABC, abstractmethod
+
+SNAPSHOT_SCRIPT = """
+function (selector) {
+    const root = selector ? document.querySelector(selector) : document.documentElement;
+    return root ? root.outerHTML : null;
+}
+"""
+
+PROBE_SCRIPT = """
+function (selectors) {
+    const counts = {};
+    for (const selector of selectors) {
+        try {
+            counts[selector] = document.querySelectorAll(selector).length;
+        } catch (e) {
+            counts[selector] = 0;
+        }
+    }
+    return counts;
+}
+"""
+
+FILL_SCRIPT = """
+function (target, value) {
+    const el = typeof target === "string" ? document.querySelector(target) : target;
+    if (!el) return false;
+    const descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value");
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(el, value);
+    } else {
+        el.value = value;
+    }
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    return true;
+}
+"""
+
+CLICK_SCRIPT = """
+function (el) {
+    if (!el) return false;
+    el.scrollIntoView({block: "center"});
+    el.click();
+    return true;
+}
+"""
+
+BATCH_SCRIPT = """
+function (operations) {
+    function read(el, name) {
+        if (!el) return null;
+        if (name === "tag") return el.tagName.toLowerCase();
+        if (name === "text") return (el.innerText || el.textContent || "").trim();
+        if (name === "displayed") {
+            return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        }
+        const property = el[name];
+        if (property !== undefined && property !== null
+                && typeof property !== "object" && typeof property !== "function") {
+            return property;
+        }
+        return el.getAttribute(name);
+    }
+    function run(op) {
+        const root = op.element || document;
+        if (op.kind === "query") return root.querySelector(op.selector);
+        if (op.kind === "query_many") return Array.from(root.querySelectorAll(op.selector));
+        if (op.kind === "closest") return op.element ? op.element.closest(op.selector) : null;
+        if (op.kind === "parent") return op.element ? op.element.parentElement : null;
+        if (op.kind === "attributes") {
+            const values = {};
+            for (const name of op.names) values[name] = read(op.element, name);
+            return values;
+        }
+        return null;
+    }
+    return operations.map(function (op) {
+        try {
+            return run(op);
+        } catch (e) {
+            return null;
+        }
+    });
+}
+"""
+
+
+class PageDriverError(Exception):
+    """Raised by page driver backends when the page cannot be reached."""
+
+
+class BatchResult:
+    """Placeholder for the value of a batched operation, filled in on flush."""
+
+    _PENDING = object()
+
+    def __init__(self):
+        self._value = self._PENDING
+
+    @property
+    def value(self):
+        if self._value is self._PENDING:
+            raise PageDriverError("Batch has not been flushed yet")
+        return self._value
+
+
+class PageBatch:
+    """Collects read operations and resolves all of them in one round trip."""
+
+    def __init__(self, page):
+        self.page = page
+        self._operations = []
+
+    def _add(self, operation):
+        result = BatchResult()
+        self._operations.append((operation, result))
+        return result
+
+    def query(self, selector, within=None):
+        return self._add({"kind": "query", "selector": selector, "element": within})
+
+    def query_many(self, selector, within=None):
+        return self._add(
+            {"kind": "query_many", "selector": selector, "element": within}
+        )
+
+    def closest(self, element, selector):
+        return self._add({"kind": "closest", "selector": selector, "element": element})
+
+    def parent(self, element):
+        return self._add({"kind": "parent", "element": element})
+
+    def attributes(self, element, names):
+        return self._add(
+            {"kind": "attributes", "element": element, "names": list(names)}
+        )
+
+    def flush(self):
+        if not self._operations:
+            return
+        operations = [operation for operation, _ in self._operations]
+        values = self.page.execute_batch(operations)
+        for (operation, result), value in zip(self._operations, values):
+            if operation["kind"] == "query_many" and value is None:
+                value = []
+            result._value = value
+        self._operations = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+
+class PageDriver(ABC):
+    """Backend-neutral access to the page the bot is working on.
+
+    Element handles are opaque: they come from query/query_many/closest/parent
+    and are only meant to be passed back into the same driver. Reads can be
+    grouped with batch() so several of them cost a single round trip.
+    """
+
+    @abstractmethod
+    def execute_batch(self, operations):
+        """Run a list of read operations in one round trip, results in order."""
+
+    @abstractmethod
+    def run_script(self, script, *args):
+        """Call a JavaScript function source with args and return its value."""
+
+    @abstractmethod
+    def click(self, element):
+        """Click an element handle; return True on success."""
+
+    @abstractmethod
+    def fill(self, target, value):
+        """Set the value of an element handle or the first match of a CSS selector."""
+
+    def batch(self):
+        return PageBatch(self)
+
+    def _single(self, operation):
+        return self.execute_batch([operation])[0]
+
+    def query(self, selector, within=None):
+        """Return the first element matching a CSS selector, or None."""
+        return self._single({"kind": "query", "selector": selector, "element": within})
+
+    def query_many(self, selector, within=None):
+        """Return all elements matching a CSS selector."""
+        return (
+            self._single(
+                {"kind": "query_many", "selector": selector, "element": within}
+            )
+            or []
+        )
+
+    def closest(self, element, selector):
+        """Return the nearest ancestor-or-self of element matching selector."""
+        return self._single(
+            {"kind": "closest", "selector": selector, "element": element}
+        )
+
+    def parent(self, element):
+        return self._single({"kind": "parent", "element": element})
+
+    def attributes(self, element, names):
+        """Read DOM properties/attributes of an element.
+
+        Besides plain attribute names, "tag", "text" and "displayed" return the
+        lower-case tag name, the trimmed rendered text and visibility.
+        """
+        return self._single(
+            {"kind": "attributes", "element": element, "names": list(names)}
+        ) or {name: None for name in names}
+
+    def text(self, element):
+        return (self.attributes(element, ["text"])["text"] or "").strip()
+
+    def snapshot(self, selector=None):
+        """Return the outer HTML of the first match of selector, or of the whole document."""
+        return self.run_script(SNAPSHOT_SCRIPT, selector)
+
+    def probe(self, selectors):
+        """Return a {selector: match count} mapping for all selectors in one round trip."""
+        return self.run_script(PROBE_SCRIPT, list(selectors)) or {}
+
+    def close(self):
+        """Release any resources held by the backend."""
@@ -0,0 +1,35 @@
+from selenium.webdriver.remote.webelement import WebElement
+
+from .page_driver import PageDriver, BATCH_SCRIPT, FILL_SCRIPT
+
+
+class SeleniumPageDriver(PageDriver):
+    """PageDriver running on top of a Selenium WebDriver session.
+
+    Handles are WebElements. Batches are one execute_script call; clicks and
+    element fills use native WebDriver input so the page sees real events.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run_script(self, script, *args):
+        return self.driver.execute_script(
+            f"return ({script}).apply(null, arguments);", *args
+        )
+
+    def execute_batch(self, operations):
+        return self.run_script(BATCH_SCRIPT, operations) or [None] * len(operations)
+
+    def click(self, element):
+        if element is None:
+            return False
+        element.click()
+        return True
+
+    def fill(self, target, value):
+        if isinstance(target, WebElement):
+            target.clear()
+            target.send_keys(value)
+            return True
+        return bool(self.run_script(FILL_SCRIPT, target, value))
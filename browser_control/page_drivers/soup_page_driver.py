@@ -0,0 +1,152 @@
+from bs4 import BeautifulSoup
+from soupsieve import SelectorSyntaxError
+
+from .page_driver import PageDriver, PageDriverError
+
+
+class SoupPageDriver(PageDriver):
+    """In-process PageDriver over parsed HTML, for offline runs of page logic.
+
+    Handles are BeautifulSoup tags. Clicks and fills update the parsed
+    document (checked radios and checkboxes, selected options, field values)
+    so the logic under test sees the same state changes it would in Chrome.
+    JavaScript is not available.
+    """
+
+    def __init__(self, html):
+        self.soup = BeautifulSoup(html, "html.parser")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read())
+
+    def run_script(self, script, *args):
+        raise PageDriverError("SoupPageDriver cannot run JavaScript")
+
+    def execute_batch(self, operations):
+        return [self._run_operation(operation) for operation in operations]
+
+    def _run_operation(self, operation):
+        kind = operation["kind"]
+        root = operation.get("element") or self.soup
+        if kind == "query":
+            return root.select_one(operation["selector"])
+        if kind == "query_many":
+            return root.select(operation["selector"])
+        if kind == "closest":
+            element = operation.get("element")
+            return element.css.closest(operation["selector"]) if element else None
+        if kind == "parent":
+            element = operation.get("element")
+            return element.parent if element else None
+        if kind == "attributes":
+            return {
+                name: self.read(operation.get("element"), name)
+                for name in operation["names"]
+            }
+        return None
+
+    @staticmethod
+    def _selected_option(select):
+        options = select.find_all("option")
+        return next(
+            (o for o in options if o.has_attr("selected")),
+            options[0] if options else None,
+        )
+
+    def read(self, element, name):
+        if element is None:
+            return None
+        if name == "tag":
+            return element.name
+        if name == "text":
+            return " ".join(element.stripped_strings)
+        if name == "displayed":
+            style = (element.get("style") or "").replace(" ", "")
+            return not element.has_attr("hidden") and "display:none" not in style
+        if name in ("checked", "selected", "disabled"):
+            if name == "selected" and element.name == "option":
+                return self._selected_option(element.find_parent("select")) is element
+            return element.has_attr(name)
+        if name == "value":
+            if element.name == "textarea":
+                return element.string or ""
+            if element.name == "select":
+                option = self._selected_option(element)
+                return self.read(option, "value") if option else ""
+            if element.name == "option" and not element.has_attr("value"):
+                return " ".join(element.stripped_strings)
+            return element.get("value", "")
+        if name == "type":
+            if element.name == "input":
+                return (element.get("type") or "text").lower()
+            if element.name == "select":
+                return "select-one"
+            if element.name in ("textarea", "button"):
+                return element.get("type") or element.name
+        value = element.get(name)
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    def click(self, element):
+        if element is None:
+            return False
+        if element.name == "input" and (element.get("type") or "").lower() == "radio":
+            group = element.get("name")
+            scope = element.find_parent("form") or self.soup
+            for radio in scope.select('input[type="radio"]'):
+                if radio.get("name") == group:
+                    radio.attrs.pop("checked", None)
+            element["checked"] = ""
+        elif (
+            element.name == "input"
+            and (element.get("type") or "").lower() == "checkbox"
+        ):
+            if element.has_attr("checked"):
+                del element["checked"]
+            else:
+                element["checked"] = ""
+        elif element.name == "option":
+            select = element.find_parent("select")
+            if select is not None:
+                for option in select.find_all("option"):
+                    option.attrs.pop("selected", None)
+            element["selected"] = ""
+        return True
+
+    def fill(self, target, value):
+        element = self.soup.select_one(target) if isinstance(target, str) else target
+        if element is None:
+            return False
+        if element.name == "textarea":
+            element.string = value
+        elif element.name == "select":
+            option = next(
+                (
+                    o
+                    for o in element.find_all("option")
+                    if self.read(o, "value") == value
+                ),
+                None,
+            )
+            if option is None:
+                return False
+            self.click(option)
+        else:
+            element["value"] = value
+        return True
+
+    def snapshot(self, selector=None):
+        element = self.soup.select_one(selector) if selector else self.soup
+        return str(element) if element is not None else None
+
+    def probe(self, selectors):
+        counts = {}
+        for selector in selectors:
+            try:
+                counts[selector] = len(self.soup.select(selector))
+            except SelectorSyntaxError:
+                counts[selector] = 0
+        return counts
@@ -0,0 +1,254 @@
+import re
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from .page_driver import (
+    BATCH_SCRIPT,
+    CLICK_SCRIPT,
+    FILL_SCRIPT,
+    PROBE_SCRIPT,
+    SNAPSHOT_SCRIPT,
+)
+from .soup_page_driver import SoupPageDriver
+
+XPATH_STEP = re.compile(
+    r"^(?P<axis>\.//|//|ancestor::)(?P<tag>[\w*-]+)(?:\[(?P<predicate>.*)\])?$"
+)
+XPATH_CONTAINS = re.compile(
+    r"^contains\(\s*(?P<subject>@[\w-]+|text\(\)|\.)\s*,\s*(?P<quote>['\"])(?P<literal>.*)(?P=quote)\s*\)$"
+)
+XPATH_ATTRIBUTE = re.compile(
+    r"^@(?P<name>[\w-]+)(?:\s*=\s*(?P<quote>['\"])(?P<literal>.*)(?P=quote))?$"
+)
+
+
+def _xpath_term_matches(tag, term):
+    term = term.strip()
+    contains = XPATH_CONTAINS.match(term)
+    if contains:
+        subject = contains.group("subject")
+        if subject == ".":
+            haystack = tag.get_text()
+        elif subject == "text()":
+            haystack = "".join(tag.find_all(string=True, recursive=False))
+        else:
+            value = tag.get(subject[1:])
+            haystack = " ".join(value) if isinstance(value, list) else value or ""
+        return contains.group("literal") in haystack
+    attribute = XPATH_ATTRIBUTE.match(term)
+    if attribute:
+        if not tag.has_attr(attribute.group("name")):
+            return False
+        if attribute.group("quote") is None:
+            return True
+        value = tag.get(attribute.group("name"))
+        value = " ".join(value) if isinstance(value, list) else value
+        return value == attribute.group("literal")
+    raise NotImplementedError(f"Unsupported XPath predicate: {term}")
+
+
+def _xpath_predicate_matches(tag, predicate):
+    if not predicate:
+        return True
+    return any(
+        all(_xpath_term_matches(tag, term) for term in group.split(" and "))
+        for group in predicate.split(" or ")
+    )
+
+
+def select_xpath(root, context, xpath):
+    """Evaluate the small XPath subset used by the bot against a parsed DOM.
+
+    Supports "..", and single steps on the //, .// and ancestor:: axes with
+    predicates built from contains(@attr|text()|., 'x'), @attr and @attr='x'
+    joined by "and"/"or".
+    """
+    xpath = xpath.strip()
+    if xpath == "..":
+        return [context.parent] if context.parent is not None else []
+    step = XPATH_STEP.match(xpath)
+    if not step:
+        raise NotImplementedError(f"Unsupported XPath expression: {xpath}")
+    tag_name = step.group("tag")
+    axis = step.group("axis")
+    if axis == "ancestor::":
+        candidates = list(context.parents)
+    else:
+        scope = root if axis == "//" else context
+        candidates = scope.find_all(True)
+    return [
+        tag
+        for tag in candidates
+        if getattr(tag, "name", None) not in (None, "[document]")
+        and (tag_name == "*" or tag.name == tag_name)
+        and _xpath_predicate_matches(tag, step.group("predicate"))
+    ]
+
+
+class SoupWebElement:
+    """WebElement look-alike wrapping a BeautifulSoup tag of a SoupWebDriver."""
+
+    def __init__(self, driver, tag):
+        self._driver = driver
+        self.tag = tag
+
+    def __eq__(self, other):
+        return isinstance(other, SoupWebElement) and other.tag is self.tag
+
+    def __hash__(self):
+        return id(self.tag)
+
+    @property
+    def parent(self):
+        return self._driver
+
+    @property
+    def id(self):
+        return str(id(self.tag))
+
+    @property
+    def tag_name(self):
+        return self.tag.name
+
+    @property
+    def text(self):
+        return self._driver.page.read(self.tag, "text")
+
+    def get_attribute(self, name):
+        value = self._driver.page.read(self.tag, name)
+        if isinstance(value, bool):
+            return "true" if value else None
+        return value
+
+    def get_dom_attribute(self, name):
+        value = self.tag.get(name)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def is_selected(self):
+        name = "selected" if self.tag.name == "option" else "checked"
+        return bool(self._driver.page.read(self.tag, name))
+
+    def is_displayed(self):
+        return bool(self._driver.page.read(self.tag, "displayed"))
+
+    def is_enabled(self):
+        return not self.tag.has_attr("disabled")
+
+    def click(self):
+        self._driver.page.click(self.tag)
+
+    def clear(self):
+        self._driver.page.fill(self.tag, "")
+
+    def send_keys(self, *values):
+        current = self._driver.page.read(self.tag, "value") or ""
+        self._driver.page.fill(self.tag, current + "".join(str(v) for v in values))
+
+    def find_element(self, by=By.ID, value=None):
+        return self._driver._find_element(self.tag, by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._driver._find_elements(self.tag, by, value)
+
+
+class SoupWebDriver:
+    """Offline stand-in for the Selenium WebDriver subset the bot relies on.
+
+    Lookups, reads, clicks and typing operate on a parsed copy of saved page
+    HTML through a SoupPageDriver, which is exposed as .page so the PageDriver
+    code and the WebDriver code see one shared document. execute_script only
+    understands the page driver scripts and the bot's scroll/click snippets.
+    """
+
+    def __init__(self, html, url="about:blank"):
+        self.page = SoupPageDriver(html)
+        self.current_url = url
+        self.capabilities = {}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read(), url=f"file://{path}")
+
+    @property
+    def page_source(self):
+        return str(self.page.soup)
+
+    @property
+    def title(self):
+        title = self.page.soup.find("title")
+        return title.get_text(strip=True) if title else ""
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        if hasattr(value, "name") and hasattr(value, "attrs"):
+            return SoupWebElement(self, value)
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, SoupWebElement):
+            return value.tag
+        return value
+
+    def _select(self, context, by, value):
+        if by == By.CSS_SELECTOR:
+            return context.select(value)
+        if by == By.TAG_NAME:
+            return context.find_all(value)
+        if by == By.ID:
+            return context.find_all(id=value)
+        if by == By.CLASS_NAME:
+            return context.find_all(class_=value)
+        if by == By.NAME:
+            return context.find_all(attrs={"name": value})
+        if by == By.XPATH:
+            return select_xpath(self.page.soup, context, value)
+        raise NotImplementedError(f"Unsupported locator strategy: {by}")
+
+    def _find_elements(self, context, by, value):
+        return [SoupWebElement(self, tag) for tag in self._select(context, by, value)]
+
+    def _find_element(self, context, by, value):
+        elements = self._find_elements(context, by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return elements[0]
+
+    def find_element(self, by=By.ID, value=None):
+        return self._find_element(self.page.soup, by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._find_elements(self.page.soup, by, value)
+
+    def execute_script(self, script, *args):
+        args = self._unwrap(list(args))
+        if BATCH_SCRIPT in script:
+            return self._wrap(self.page.execute_batch(args[0]))
+        if FILL_SCRIPT in script:
+            return self.page.fill(*args)
+        if CLICK_SCRIPT in script or script.strip() == "arguments[0].click();":
+            return self.page.click(args[0])
+        if PROBE_SCRIPT in script:
+            return self.page.probe(args[0])
+        if SNAPSHOT_SCRIPT in script:
+            return self.page.snapshot(args[0] if args else None)
+        if "checked = false" in script:
+            args[0].attrs.pop("checked", None)
+            return None
+        if "scrollIntoView" in script or "scrollTop" in script:
+            return None
+        raise NotImplementedError("SoupWebDriver cannot run arbitrary JavaScript")
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        pass
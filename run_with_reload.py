@@ -1,39 +1,248 @@
-import subprocess
+"""Development runner: starts the app and reloads the bot code on save.
+
+Only the source packages are watched, so chrome_profile churn, DB writes and
+editor swap files do not trigger anything, and a burst of events (a save of
+several files, a formatter run) is debounced into a single reload.
+
+Changes under browser_control are reloaded in-process with importlib.reload
+while Chrome stays open: the running BrowserManager and the objects it holds
+are switched to the reloaded classes, so the next Start runs the new code on
+the same WebDriver session. A reload waits while the bot is running. Changes
+to ui, storage or the top-level scripts need a new process; the browser is
+closed and the app restarted. So is a change to BrowserManager.__init__,
+which a reload does not run again.
+"""
+
+import importlib
+import os
+import queue
 import sys
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+import threading
 import time
-import os
+import traceback
+import types
+from pathlib import Path
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+ROOT = Path(__file__).resolve().parent
+WATCHED_PACKAGES = ("browser_control", "storage", "ui")
+# Packages reloaded in-process; everything else restarts the app.
+RELOADABLE_PACKAGES = ("browser_control",)
+# Entry points that are not reloaded with their package.
+NOT_RELOADED = ("browser_control.__main__",)
+DEBOUNCE_SECONDS = 0.5
+POLL_MS = 200
 
 
-class ReloadHandler(FileSystemEventHandler):
-    def __init__(self, script):
-        self.script = script
-        self.process = None
-        self.start_process()
+def is_source_file(path):
+    """True for a real .py file, not an editor swap, backup or cache file."""
+    path = Path(path)
+    return (
+        path.suffix == ".py"
+        and not path.name.startswith((".", "#", "~"))
+        and "__pycache__" not in path.parts
+    )
 
-    def start_process(self):
-        if self.process:
-            self.process.terminate()
-        self.process = subprocess.Popen([sys.executable, self.script])
+
+def module_name(path):
+    parts = list(Path(path).resolve().relative_to(ROOT).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _in_packages(name, packages):
+    return any(
+        name == package or name.startswith(package + ".") for package in packages
+    )
+
+
+class SourceChangeHandler(FileSystemEventHandler):
+    """Collects changed source files and hands them over once saving settles."""
+
+    def __init__(self, changes, delay=DEBOUNCE_SECONDS):
+        self.changes = changes
+        self.delay = delay
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.timer = None
 
     def on_any_event(self, event):
-        if event.src_path.endswith(".py"):
-            print("Detected change, reloading...")
-            self.start_process()
+        if event.is_directory or event.event_type not in (
+            "created",
+            "modified",
+            "moved",
+        ):
+            return
+        # Editors that save through a temporary file report a move onto the
+        # real name.
+        path = getattr(event, "dest_path", "") or event.src_path
+        if not is_source_file(path):
+            return
+        with self.lock:
+            self.pending.add(os.path.abspath(path))
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
 
+    def flush(self):
+        with self.lock:
+            paths, self.pending, self.timer = self.pending, set(), None
+        if paths:
+            self.changes.put(paths)
 
-if __name__ == "__main__":
-    script = "main.py"
-    event_handler = ReloadHandler(script)
+
+def _module_of(value):
+    if isinstance(value, types.ModuleType):
+        return value.__name__
+    try:
+        return getattr(value, "__module__", None)
+    except Exception:
+        return None
+
+
+def reload_order(names):
+    """Module names ordered so each comes after the modules it imports from."""
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in ordered or name in visiting:
+            return
+        visiting.add(name)
+        dependencies = {_module_of(value) for value in vars(sys.modules[name]).values()}
+        for dependency in sorted(dependencies & names - {name}):
+            visit(dependency)
+        visiting.discard(name)
+        ordered.append(name)
+
+    for name in sorted(names):
+        visit(name)
+    return ordered
+
+
+def _fresh(value, reloaded):
+    """The reloaded counterpart of a class or function, or value itself."""
+    if _module_of(value) not in reloaded or isinstance(value, types.ModuleType):
+        return value
+    if not isinstance(value, (type, types.FunctionType)) or "." in value.__qualname__:
+        return value
+    fresh = getattr(sys.modules[value.__module__], value.__name__, None)
+    return fresh if fresh is not None else value
+
+
+def _rebind(obj, reloaded):
+    """Switch a live instance of a reloaded class to the new class."""
+    fresh = _fresh(type(obj), reloaded)
+    if fresh is not type(obj):
+        try:
+            obj.__class__ = fresh
+        except TypeError as e:
+            print(f"Could not rebind {type(obj).__qualname__}: {e}")
+
+
+def reload_modules():
+    """Reload the loaded bot modules; returns their names in reload order."""
+    names = {
+        name
+        for name in sys.modules
+        if _in_packages(name, RELOADABLE_PACKAGES) and name not in NOT_RELOADED
+    }
+    ordered = reload_order(names)
+    for name in ordered:
+        importlib.reload(sys.modules[name])
+    reloaded = set(ordered)
+    # Names bound with "from x import y" (and the lazy page_drivers exports)
+    # still point at the old objects in modules that were not re-executed
+    # after x, or not at all.
+    for name, module in list(sys.modules.items()):
+        if module is None or not _in_packages(name, WATCHED_PACKAGES):
+            continue
+        for attribute, value in list(vars(module).items()):
+            fresh = _fresh(value, reloaded)
+            if fresh is not value:
+                setattr(module, attribute, fresh)
+    return ordered
+
+
+class Reloader:
+    """Applies the collected changes on the Tk thread between bot runs."""
+
+    def __init__(self, root, main_ui, changes):
+        self.root = root
+        self.main_ui = main_ui
+        self.changes = changes
+        self.pending = set()
+        self.waiting = False
+
+    def poll(self):
+        try:
+            while True:
+                self.pending |= self.changes.get_nowait()
+        except queue.Empty:
+            pass
+        if self.pending:
+            if self.main_ui.is_running:
+                if not self.waiting:
+                    print("Source changed; reloading when the bot stops.")
+                    self.waiting = True
+            else:
+                paths, self.pending, self.waiting = self.pending, set(), False
+                self.apply(paths)
+        self.root.after(POLL_MS, self.poll)
+
+    def apply(self, paths):
+        names = sorted(module_name(path) for path in paths)
+        if not all(_in_packages(name, RELOADABLE_PACKAGES) for name in names):
+            self.restart(names)
+            return
+        started = time.perf_counter()
+        try:
+            reloaded = reload_modules()
+        except Exception:
+            traceback.print_exc()
+            print("Reload failed; the previous code stays active until next save.")
+            return
+        browser = self.main_ui.browser
+        if browser is not None:
+            _rebind(browser, set(reloaded))
+            for value in vars(browser).values():
+                _rebind(value, set(reloaded))
+        print(
+            f"Reloaded {len(reloaded)} modules in "
+            f"{(time.perf_counter() - started) * 1000:.0f}ms ({', '.join(names)})"
+        )
+
+    def restart(self, names):
+        print(f"Restarting for {', '.join(names)}...")
+        if self.main_ui.browser is not None:
+            # A Chrome started with reuse_browser survives the restart.
+            self.main_ui.browser.stop(close_browser=False)
+        os.execv(sys.executable, [sys.executable, str(Path(__file__).resolve())])
+
+
+def main():
+    os.chdir(ROOT)
+    from ui import run
+
+    changes = queue.Queue()
+    handler = SourceChangeHandler(changes)
     observer = Observer()
-    observer.schedule(event_handler, path=".", recursive=True)
+    for package in WATCHED_PACKAGES:
+        observer.schedule(handler, str(ROOT / package), recursive=True)
+    # main.py and this script; chrome_profile and DB are not watched at all.
+    observer.schedule(handler, str(ROOT), recursive=False)
     observer.start()
     try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
+        run(on_ready=lambda root, main_ui: Reloader(root, main_ui, changes).poll())
+    finally:
         observer.stop()
-    observer.join()
-    if event_handler.process:
-        event_handler.process.terminate()
+        observer.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+from .atomic_file import write_text_atomic
+from .autofill_knowledge_base import AutofillKnowledgeBase
+from .autofill_store import DictAutofillStore, as_autofill_store, normalize_label
+from .config_file import ConfigFile, ConfigSnapshot, thaw
+from .job_index import JobIndex
+from .run_ledger import RunLedger
+from .sqlite_connection import open_sqlite
+
+__all__ = [
+    "AutofillKnowledgeBase",
+    "ConfigFile",
+    "ConfigSnapshot",
+    "DictAutofillStore",
+    "JobIndex",
+    "RunLedger",
+    "as_autofill_store",
+    "normalize_label",
+    "open_sqlite",
+    "thaw",
+    "write_text_atomic",
+]
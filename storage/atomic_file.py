@@ -0,0 +1,26 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_text_atomic(path, text):
+    """Replace a file's content so readers see either the old or the new file.
+
+    The text goes to a temporary file in the same folder, is flushed to disk
+    and then renamed over the target, which is atomic on Windows and POSIX.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
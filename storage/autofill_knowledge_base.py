@@ -0,0 +1,429 @@
+import itertools
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from .atomic_file import write_text_atomic
+from .autofill_store import normalize_label
+from .option_sets import expand_options, options_key, with_answer_selected
+from .sqlite_connection import open_sqlite
+from .usage_stats import UsageStats
+
+ENTRY_SECTIONS = ("radioButtons", "dropdowns")
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS option_sets (
+    hash TEXT PRIMARY KEY,
+    options TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    normalized_label TEXT NOT NULL,
+    count INTEGER,
+    created_at INTEGER,
+    updated_at INTEGER NOT NULL,
+    option_set_hash TEXT REFERENCES option_sets (hash),
+    selected_positions TEXT
+);
+CREATE INDEX IF NOT EXISTS questions_by_label ON questions (kind, normalized_label);
+CREATE TABLE IF NOT EXISTS answers (
+    question_id INTEGER PRIMARY KEY REFERENCES questions (id) ON DELETE CASCADE,
+    value TEXT
+);
+"""
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class AutofillKnowledgeBase:
+    """Autofill questions, options and answers stored in SQLite.
+
+    Questions of the three form_autofill.json sections (kind is the section
+    name) are looked up through an index on the normalized label, so a lookup
+    touches a few rows instead of reading the whole database. Option lists are
+    interned in option_sets by content hash: a country list shared by many
+    questions is stored once, and comparing the options seen on a page with
+    the stored ones compares two keys. Usage counts are appended to a
+    UsageStats log next to the database, so the database is written only when
+    an answer or an option set changes. export_data()/import_data() convert to
+    and from the JSON layout, which is also used for backups and for the
+    one-time migration.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conn = open_sqlite(path)
+        self.conn.executescript(SCHEMA)
+        self.option_sets = {}
+        self.usage = UsageStats(self.path.with_suffix(".usage.json"))
+        self._migrate()
+        with self.conn:
+            self._prune_option_sets()
+
+    @classmethod
+    def open_for_json(cls, json_path):
+        """Open the database next to a form_autofill.json, migrating it if empty."""
+        json_path = Path(json_path)
+        knowledge_base = cls(json_path.with_suffix(".sqlite3"))
+        if knowledge_base.is_empty() and json_path.exists():
+            knowledge_base.import_json(json_path)
+            print(f"Migrated autofill data from {json_path} to {knowledge_base.path}")
+        return knowledge_base
+
+    @staticmethod
+    def read_text_answer(json_path, label):
+        """Read one text answer for a form_autofill.json without opening the store.
+
+        A single SELECT on a read-only connection: no migration, no option set
+        pruning and no UsageStats, so the UI can call it while the bot runs.
+        Before the database exists the JSON file itself is read.
+        """
+        json_path = Path(json_path)
+        db_path = json_path.with_suffix(".sqlite3")
+        if db_path.exists():
+            conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True, timeout=30)
+            try:
+                row = conn.execute(
+                    "SELECT value FROM questions JOIN answers ON question_id = id "
+                    "WHERE kind = 'textInput' AND normalized_label = ? "
+                    "ORDER BY label != ?, id LIMIT 1",
+                    (normalize_label(label), label),
+                ).fetchone()
+                return row[0] if row else None
+            except sqlite3.OperationalError:
+                pass
+            finally:
+                conn.close()
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                text_input = json.load(f).get("textInput", {})
+        except (OSError, json.JSONDecodeError):
+            return None
+        if label in text_input:
+            return text_input[label]
+        return next(
+            (
+                value
+                for key, value in text_input.items()
+                if normalize_label(key) == normalize_label(label)
+            ),
+            None,
+        )
+
+    def is_empty(self):
+        return self.conn.execute("SELECT 1 FROM questions LIMIT 1").fetchone() is None
+
+    def close(self):
+        self.usage.close()
+        self.conn.close()
+
+    def _find_question(self, kind, label, exact=False):
+        if exact:
+            return self.conn.execute(
+                "SELECT * FROM questions WHERE kind = ? AND normalized_label = ? "
+                "AND label = ? ORDER BY id LIMIT 1",
+                (kind, normalize_label(label), label),
+            ).fetchone()
+        return self.conn.execute(
+            "SELECT * FROM questions WHERE kind = ? AND normalized_label = ? "
+            "ORDER BY label != ?, id LIMIT 1",
+            (kind, normalize_label(label), label),
+        ).fetchone()
+
+    def _answer(self, question_id):
+        row = self.conn.execute(
+            "SELECT value FROM answers WHERE question_id = ?", (question_id,)
+        ).fetchone()
+        return row["value"] if row else None
+
+    def _insert_question(self, kind, label, answer, count=None, created_at=None):
+        cursor = self.conn.execute(
+            "INSERT INTO questions (kind, label, normalized_label, count, created_at, "
+            "updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, label, normalize_label(label), count, created_at, _now_ms()),
+        )
+        self.conn.execute(
+            "INSERT INTO answers (question_id, value) VALUES (?, ?)",
+            (cursor.lastrowid, answer),
+        )
+        return cursor.lastrowid
+
+    def _migrate(self):
+        """Move option rows of databases created before interning to option_sets."""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        columns = {
+            row["name"] for row in self.conn.execute("PRAGMA table_info(questions)")
+        }
+        with self.conn:
+            if "option_set_hash" not in columns:
+                self.conn.execute(
+                    "ALTER TABLE questions ADD COLUMN option_set_hash TEXT "
+                    "REFERENCES option_sets (hash)"
+                )
+                self.conn.execute(
+                    "ALTER TABLE questions ADD COLUMN selected_positions TEXT"
+                )
+            legacy = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'options'"
+            ).fetchone()
+            if legacy:
+                rows = self.conn.execute(
+                    "SELECT question_id, value, text, selected FROM options "
+                    "ORDER BY question_id, position"
+                ).fetchall()
+                for question_id, group in itertools.groupby(
+                    rows, key=lambda row: row["question_id"]
+                ):
+                    self._set_options(
+                        question_id,
+                        [
+                            {
+                                "value": row["value"],
+                                "text": row["text"],
+                                "selected": bool(row["selected"]),
+                            }
+                            for row in group
+                        ],
+                    )
+                self.conn.execute("DROP TABLE options")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _option_set(self, set_hash):
+        option_set = self.option_sets.get(set_hash)
+        if option_set is None:
+            row = self.conn.execute(
+                "SELECT options FROM option_sets WHERE hash = ?", (set_hash,)
+            ).fetchone()
+            option_set = tuple(tuple(pair) for pair in json.loads(row["options"]))
+            self.option_sets[set_hash] = option_set
+        return option_set
+
+    def _set_options(self, question_id, options):
+        set_hash, positions = options_key(options)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO option_sets (hash, options) VALUES (?, ?)",
+            (
+                set_hash,
+                json.dumps(
+                    [[o.get("value"), o.get("text")] for o in options],
+                    ensure_ascii=False,
+                ),
+            ),
+        )
+        self.conn.execute(
+            "UPDATE questions SET option_set_hash = ?, selected_positions = ? "
+            "WHERE id = ?",
+            (set_hash, json.dumps(list(positions)), question_id),
+        )
+
+    def _prune_option_sets(self):
+        self.conn.execute(
+            "DELETE FROM option_sets WHERE hash NOT IN (SELECT option_set_hash "
+            "FROM questions WHERE option_set_hash IS NOT NULL)"
+        )
+
+    def _entry(self, row):
+        entry = {
+            "id": row["id"],
+            "placeholderIncludes": row["label"],
+            "defaultValue": self._answer(row["id"]),
+            "count": (row["count"] or 0) + self.usage.count(row["kind"], row["label"]),
+            "options": [],
+            "optionsKey": options_key([]),
+        }
+        if row["option_set_hash"] is not None:
+            positions = tuple(json.loads(row["selected_positions"] or "[]"))
+            entry["options"] = expand_options(
+                self._option_set(row["option_set_hash"]), positions
+            )
+            entry["optionsKey"] = (row["option_set_hash"], positions)
+        if row["created_at"] is not None:
+            entry["createdAt"] = row["created_at"]
+        return entry
+
+    def text_answer(self, label):
+        row = self._find_question("textInput", label)
+        return self._answer(row["id"]) if row else None
+
+    def text_answers(self):
+        """All text questions with their answers, as {label: answer}."""
+        rows = self.conn.execute(
+            "SELECT label, value FROM questions JOIN answers ON question_id = id "
+            "WHERE kind = 'textInput' ORDER BY id"
+        )
+        return {row["label"]: row["value"] for row in rows}
+
+    def use_text_answer(self, label):
+        """Return the stored answer for a text question and count the use."""
+        row = self._find_question("textInput", label)
+        if row is None:
+            return None
+        self.usage.record("textInput", label)
+        return self._answer(row["id"])
+
+    def add_text_question(self, label, value):
+        if self._find_question("textInput", label) is not None:
+            return False
+        with self.conn:
+            self._insert_question("textInput", label, value, created_at=_now_ms())
+        return True
+
+    def find_entry(self, section, label):
+        row = self._find_question(section, label)
+        return self._entry(row) if row else None
+
+    def record_entry_use(self, section, entry, options, selected_value):
+        """Count a use of an entry and store the options seen on the page.
+
+        The page is read before anything is clicked, so its selection only
+        becomes the answer of an entry that has none; the stored options keep
+        the stored answer selected. Returns True when the option list or the
+        answer changed; only then is the database written, a repeat
+        encounter just goes to the usage stats.
+        """
+        answer = entry.get("defaultValue")
+        if answer in (None, "") and selected_value not in (None, ""):
+            answer = selected_value
+        options = with_answer_selected(options, answer)
+        answer_changed = answer != entry.get("defaultValue")
+        changed = answer_changed or entry["optionsKey"] != options_key(options)
+        if changed:
+            with self.conn:
+                self._set_options(entry["id"], options)
+                if answer_changed:
+                    self.conn.execute(
+                        "UPDATE answers SET value = ? WHERE question_id = ?",
+                        (answer, entry["id"]),
+                    )
+                self.conn.execute(
+                    "UPDATE questions SET updated_at = ? WHERE id = ?",
+                    (_now_ms(), entry["id"]),
+                )
+        self.usage.record(section, entry["placeholderIncludes"])
+        return changed
+
+    def add_entry(self, section, entry):
+        with self.conn:
+            question_id = self._insert_question(
+                section,
+                entry["placeholderIncludes"],
+                entry.get("defaultValue"),
+                entry.get("count", 0),
+                entry.get("createdAt", _now_ms()),
+            )
+            self._set_options(question_id, entry.get("options", []))
+
+    def save(self):
+        """Changes are committed as they are made; kept for store compatibility."""
+        self.conn.commit()
+
+    def revision(self):
+        """Value that changes whenever the stored answers may have changed.
+
+        Counts this connection's writes and, through data_version, commits
+        made by other connections such as the Autofill tab's.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.conn.total_changes
+
+    def load(self):
+        return self.export_data()
+
+    def set_text_input(self, key, value):
+        """Store a text answer; nothing is written when it is already stored."""
+        row = self._find_question("textInput", key, exact=True)
+        if row is not None and self._answer(row["id"]) == value:
+            return
+        with self.conn:
+            if row is None:
+                self._insert_question("textInput", key, value, created_at=_now_ms())
+            else:
+                self.conn.execute(
+                    "UPDATE answers SET value = ? WHERE question_id = ?",
+                    (value, row["id"]),
+                )
+
+    def delete_text_input(self, key):
+        self.delete_entries("textInput", key)
+
+    def set_default_value(self, section, label, value):
+        """Set the answer of every entry of a section with exactly this label.
+
+        Nothing is written when all of them already have this answer.
+        """
+        matching = (
+            "question_id IN (SELECT id FROM questions WHERE kind = ? "
+            "AND normalized_label = ? AND label = ?) AND value IS NOT ?"
+        )
+        parameters = (section, normalize_label(label), label, value)
+        if (
+            self.conn.execute(
+                f"SELECT 1 FROM answers WHERE {matching} LIMIT 1", parameters
+            ).fetchone()
+            is None
+        ):
+            return
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE answers SET value = ? WHERE {matching}", (value, *parameters)
+            )
+
+    def delete_entries(self, section, label):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM questions WHERE kind = ? AND normalized_label = ? "
+                "AND label = ?",
+                (section, normalize_label(label), label),
+            )
+            self._prune_option_sets()
+
+    def export_data(self):
+        """Return the whole database in the form_autofill.json layout."""
+        data = {"textInput": {}, "radioButtons": [], "dropdowns": []}
+        self.usage.reload()
+        rows = self.conn.execute("SELECT * FROM questions ORDER BY id").fetchall()
+        for row in rows:
+            if row["kind"] == "textInput":
+                data["textInput"][row["label"]] = self._answer(row["id"])
+            elif row["kind"] in ENTRY_SECTIONS:
+                entry = self._entry(row)
+                del entry["id"]
+                del entry["optionsKey"]
+                data[row["kind"]].append(entry)
+        return data
+
+    def import_data(self, data):
+        """Replace the database content with data in the form_autofill.json layout."""
+        self.usage.reset()
+        with self.conn:
+            self.conn.execute("DELETE FROM questions")
+            for label, value in data.get("textInput", {}).items():
+                self._insert_question("textInput", label, value)
+            for section in ENTRY_SECTIONS:
+                for entry in data.get(section, []):
+                    question_id = self._insert_question(
+                        section,
+                        entry.get("placeholderIncludes", ""),
+                        entry.get("defaultValue"),
+                        entry.get("count"),
+                        entry.get("createdAt"),
+                    )
+                    self._set_options(question_id, entry.get("options", []))
+            self._prune_option_sets()
+
+    def export_json(self, path):
+        write_text_atomic(
+            path, json.dumps(self.export_data(), ensure_ascii=False, indent=2)
+        )
+
+    def import_json(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            self.import_data(json.load(f))
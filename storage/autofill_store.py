@@ -0,0 +1,97 @@
+import json
+
+from .atomic_file import write_text_atomic
+from .option_sets import with_answer_selected
+
+
+def normalize_label(label):
+    """Case- and whitespace-insensitive form of a question label."""
+    return " ".join((label or "").split()).lower()
+
+
+class DictAutofillStore:
+    """Autofill store over the JSON-shaped dict of form_autofill.json.
+
+    Implements the same lookup/record interface as AutofillKnowledgeBase so
+    the form filling code works with either. Changes mutate the dict in place
+    and save() writes it to path, when one is given and something changed.
+    """
+
+    def __init__(self, data, path=None):
+        self.data = data
+        self.path = path
+        self.dirty = False
+        self.changes = 0
+
+    def _changed(self):
+        self.dirty = True
+        self.changes += 1
+
+    def revision(self):
+        """Value that changes whenever an answer or entry of this store changes."""
+        return id(self), self.changes
+
+    def text_answer(self, label):
+        return self.data.get("textInput", {}).get(label)
+
+    def text_answers(self):
+        return dict(self.data.get("textInput", {}))
+
+    def use_text_answer(self, label):
+        return self.text_answer(label)
+
+    def add_text_question(self, label, value):
+        section = self.data.setdefault("textInput", {})
+        if label in section:
+            return False
+        section[label] = value
+        self._changed()
+        return True
+
+    def find_entry(self, section, label):
+        key = label.strip().lower()
+        return next(
+            (
+                entry
+                for entry in self.data.get(section, [])
+                if entry["placeholderIncludes"].strip().lower() == key
+            ),
+            None,
+        )
+
+    def record_entry_use(self, section, entry, options, selected_value):
+        """Count a use of an entry and store the options seen on the page.
+
+        As in AutofillKnowledgeBase.record_entry_use, the page's selection is
+        adopted only as the answer of an entry without one. Returns True when
+        the option list or the answer changed.
+        """
+        answer = entry.get("defaultValue")
+        if answer in (None, "") and selected_value not in (None, ""):
+            answer = selected_value
+        options = with_answer_selected(options, answer)
+        changed = entry["options"] != options or entry.get("defaultValue") != answer
+        if changed:
+            entry["options"] = options
+            entry["defaultValue"] = answer
+            self._changed()
+        entry["count"] = entry.get("count", 0) + 1
+        return changed
+
+    def add_entry(self, section, entry):
+        self.data.setdefault(section, []).append(entry)
+        self._changed()
+
+    def save(self):
+        if self.path and self.dirty:
+            write_text_atomic(
+                self.path, json.dumps(self.data, ensure_ascii=False, indent=2)
+            )
+        self.dirty = False
+
+
+def as_autofill_store(autofill_data, path=None):
+    """Wrap a plain autofill dict in a DictAutofillStore; stores pass through."""
+    if isinstance(autofill_data, dict):
+        return DictAutofillStore(autofill_data, path)
+    return autofill_data
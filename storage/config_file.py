@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+from types import MappingProxyType
+
+from .atomic_file import write_text_atomic
+
+ConfigSnapshot = namedtuple("ConfigSnapshot", ["version", "data"])
+
+
+def freeze(value):
+    """Read-only copy of parsed JSON: dicts become mappings, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Plain, mutable copy of frozen data, e.g. to edit or serialize it."""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ConfigFile:
+    """A JSON settings file under DB/, parsed once and shared by the process.
+
+    ConfigFile.open(path) returns the same instance for a path everywhere.
+    snapshot() hands out the current (version, data) pair; data is read-only
+    and is replaced, never changed, when the file changes (read-copy-update),
+    so a thread keeps a consistent view without locking. update() is the only
+    writer: it merges top-level keys, writes the file atomically and publishes
+    a new snapshot. Subscribers are called with each new snapshot, on the
+    thread that produced it. Edits made outside the process are picked up when
+    the file's mtime, size or inode change, checked by the watcher thread.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+    _watcher = None
+
+    WATCH_INTERVAL = 1.0
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._stamp = None
+        self._snapshot = ConfigSnapshot(0, freeze({}))
+        self.reload()
+
+    @classmethod
+    def open(cls, path):
+        key = os.path.abspath(path)
+        with cls._instances_lock:
+            config = cls._instances.get(key)
+            if config is None:
+                config = cls._instances[key] = cls(path)
+        return config
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def snapshot(self):
+        return self._snapshot
+
+    def get(self, key, default=None):
+        return self._snapshot.data.get(key, default)
+
+    def subscribe(self, callback):
+        """Call callback(snapshot) on every change; returns an unsubscribe function."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _publish(self, data, stamp):
+        self._snapshot = ConfigSnapshot(self._snapshot.version + 1, freeze(data))
+        self._stamp = stamp
+        return self._snapshot
+
+    def _notify(self, snapshot):
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Config subscriber for {self.path.name} failed: {e}")
+
+    def reload(self):
+        """Re-read the file; returns True when a new snapshot was published."""
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return False
+            try:
+                if stamp is None:
+                    data = {}
+                else:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Keeping previous {self.path.name}, failed to read it: {e}")
+                self._stamp = stamp
+                return False
+            snapshot = self._publish(data, stamp)
+        self._notify(snapshot)
+        return True
+
+    def update(self, changes):
+        """Merge top-level keys into the file and return the new snapshot."""
+        with self._lock:
+            data = thaw(self._snapshot.data)
+            data.update(thaw(freeze(changes)))
+            write_text_atomic(self.path, json.dumps(data, indent=2))
+            snapshot = self._publish(data, self._file_stamp())
+        self._notify(snapshot)
+        return snapshot
+
+    @classmethod
+    def start_watcher(cls, interval=None):
+        """Poll all open config files for outside changes on a daemon thread."""
+        if cls._watcher is not None:
+            return
+        interval = interval or cls.WATCH_INTERVAL
+        stop = threading.Event()
+
+        def watch():
+            while not stop.wait(interval):
+                with cls._instances_lock:
+                    configs = list(cls._instances.values())
+                for config in configs:
+                    config.reload()
+
+        thread = threading.Thread(target=watch, name="config-watcher", daemon=True)
+        cls._watcher = (thread, stop)
+        thread.start()
+
+    @classmethod
+    def stop_watcher(cls):
+        if cls._watcher is not None:
+            cls._watcher[1].set()
+            cls._watcher = None
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import time
+import zlib
+
+from .sqlite_connection import open_sqlite
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    subtitle TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    skills TEXT,
+    seniority TEXT,
+    years_required INTEGER,
+    match_score REAL,
+    analyzed_at REAL,
+    description_hash TEXT REFERENCES descriptions (hash)
+);
+CREATE TABLE IF NOT EXISTS descriptions (
+    hash TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_by_card ON jobs (title, subtitle);
+CREATE INDEX IF NOT EXISTS jobs_by_description ON jobs (description_hash);
+"""
+ITERATION_BATCH_SIZE = 500
+
+
+def description_hash(text):
+    """Content hash of a description, insensitive to whitespace changes."""
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+class JobIndex:
+    """Jobs seen on result pages and what was learned about them.
+
+    Cards are recorded during filtering; the analysis of a job's description
+    (skills, seniority, years required, match score) is added when it is
+    opened, so later runs can filter on it without opening the job again.
+
+    Description texts are kept zlib-compressed in descriptions, keyed by
+    content hash, and jobs point at them by description_hash, so a repost
+    with the same text is stored once. iter_jobs() streams the archive in
+    batches for offline re-filtering.
+    """
+
+    def __init__(self, path):
+        self.conn = open_sqlite(path)
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.executescript(INDEXES)
+
+    def _migrate(self):
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if "description_hash" not in columns:
+            with self.conn:
+                self.conn.execute(
+                    "ALTER TABLE jobs ADD COLUMN description_hash TEXT "
+                    "REFERENCES descriptions (hash)"
+                )
+
+    def record_cards(self, cards):
+        """Record (job_id, title, subtitle) of the cards on a page."""
+        now = time.time()
+        rows = [
+            (job_id, title or "", subtitle, now, now)
+            for job_id, title, subtitle in cards
+            if job_id
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO jobs (job_id, title, subtitle, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (job_id) DO UPDATE SET "
+                "title = excluded.title, subtitle = excluded.subtitle, "
+                "last_seen = excluded.last_seen",
+                rows,
+            )
+
+    def record_analysis(self, job_id, analysis):
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (job_id, first_seen, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT (job_id) DO NOTHING",
+                (job_id, now, now),
+            )
+            self.conn.execute(
+                "UPDATE jobs SET skills = ?, seniority = ?, years_required = ?, "
+                "match_score = ?, analyzed_at = ? WHERE job_id = ?",
+                (
+                    json.dumps(analysis["skills"]),
+                    analysis["seniority"],
+                    analysis["years_required"],
+                    analysis["match_score"],
+                    now,
+                    job_id,
+                ),
+            )
+
+    def record_description(self, job_id, text):
+        """Store a job's description; returns False if the text was known."""
+        text_hash = description_hash(text)
+        body = text.encode("utf-8")
+        now = time.time()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO descriptions (hash, body, size, created_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (hash) DO NOTHING",
+                (text_hash, zlib.compress(body), len(body), now),
+            )
+            self.conn.execute(
+                "INSERT INTO jobs (job_id, first_seen, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT (job_id) DO NOTHING",
+                (job_id, now, now),
+            )
+            self.conn.execute(
+                "UPDATE jobs SET description_hash = ? WHERE job_id = ?",
+                (text_hash, job_id),
+            )
+        return cursor.rowcount > 0
+
+    def _description(self, text_hash):
+        row = self.conn.execute(
+            "SELECT body FROM descriptions WHERE hash = ?", (text_hash,)
+        ).fetchone()
+        return zlib.decompress(row["body"]).decode("utf-8") if row else None
+
+    def known_description(self, job_id, title, subtitle):
+        """Stored description of a job, or of a repost of it.
+
+        A repost is a job with another id but the same title and company line.
+        """
+        row = self.conn.execute(
+            "SELECT description_hash FROM jobs WHERE description_hash IS NOT NULL "
+            "AND (job_id = ? OR (title = ? AND subtitle IS ?)) "
+            "ORDER BY job_id != ?, last_seen DESC LIMIT 1",
+            (job_id, title or "", subtitle, job_id),
+        ).fetchone()
+        return self._description(row["description_hash"]) if row else None
+
+    def title(self, job_id):
+        row = self.conn.execute(
+            "SELECT title FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return row["title"] if row else ""
+
+    def copy_analysis(self, job_id):
+        """Reuse the analysis of another job with the same description and title.
+
+        Returns True when one was found, so the text need not be analyzed.
+        """
+        row = self.conn.execute(
+            "SELECT other.* FROM jobs AS job JOIN jobs AS other "
+            "ON other.description_hash = job.description_hash "
+            "AND other.job_id != job.job_id AND other.title = job.title "
+            "WHERE job.job_id = ? AND other.analyzed_at IS NOT NULL LIMIT 1",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return False
+        self.record_analysis(job_id, self._analysis(row))
+        return True
+
+    def iter_jobs(self, batch_size=ITERATION_BATCH_SIZE):
+        """Yield every stored job as a dict, reading batch_size rows at a time.
+
+        "description" is the decompressed text or None and "analysis" the
+        stored description analysis or None; memory use is bounded by one
+        batch however large the archive is.
+        """
+        last_rowid = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT jobs.rowid AS rowid, job_id, title, subtitle, skills, "
+                "seniority, years_required, match_score, analyzed_at, body "
+                "FROM jobs LEFT JOIN descriptions ON hash = description_hash "
+                "WHERE jobs.rowid > ? ORDER BY jobs.rowid LIMIT ?",
+                (last_rowid, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield {
+                    "job_id": row["job_id"],
+                    "title": row["title"],
+                    "subtitle": row["subtitle"],
+                    "description": (
+                        zlib.decompress(row["body"]).decode("utf-8")
+                        if row["body"] is not None
+                        else None
+                    ),
+                    "analysis": (
+                        self._analysis(row) if row["analyzed_at"] is not None else None
+                    ),
+                }
+            last_rowid = rows[-1]["rowid"]
+
+    def job_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def description_stats(self):
+        """(jobs with a description, distinct texts, raw bytes, stored bytes)."""
+        jobs = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE description_hash IS NOT NULL"
+        ).fetchone()[0]
+        texts, raw, stored = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), "
+            "COALESCE(SUM(LENGTH(body)), 0) FROM descriptions"
+        ).fetchone()
+        return jobs, texts, raw, stored
+
+    @staticmethod
+    def _analysis(row):
+        return {
+            "skills": json.loads(row["skills"]),
+            "seniority": row["seniority"],
+            "years_required": row["years_required"],
+            "match_score": row["match_score"],
+        }
+
+    def analyses(self, job_ids):
+        """Map the analyzed job ids among job_ids to their analysis."""
+        job_ids = [job_id for job_id in job_ids if job_id]
+        if not job_ids:
+            return {}
+        rows = self.conn.execute(
+            f"SELECT * FROM jobs WHERE analyzed_at IS NOT NULL "
+            f"AND job_id IN ({', '.join('?' * len(job_ids))})",
+            job_ids,
+        )
+        return {row["job_id"]: self._analysis(row) for row in rows}
+
+    def close(self):
+        self.conn.close()
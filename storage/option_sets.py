@@ -0,0 +1,41 @@
+import hashlib
+import json
+
+
+def option_set_hash(options):
+    """Content hash of the values and texts of an option list, in order.
+
+    Selection state is left out so the same country or "years" list hashes
+    alike in every question, whatever was picked.
+    """
+    payload = json.dumps(
+        [[option.get("value"), option.get("text")] for option in options],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def selected_positions(options):
+    return tuple(
+        position for position, option in enumerate(options) if option.get("selected")
+    )
+
+
+def with_answer_selected(options, answer):
+    """Copies of options where only the option whose value is answer is selected."""
+    return [{**option, "selected": option.get("value") == answer} for option in options]
+
+
+def options_key(options):
+    """(option set hash, selected positions): equal keys mean equal option lists."""
+    return option_set_hash(options), selected_positions(options)
+
+
+def expand_options(option_set, positions):
+    """Rebuild the {value, text, selected} dicts of an interned option set."""
+    positions = set(positions)
+    return [
+        {"value": value, "text": text, "selected": position in positions}
+        for position, (value, text) in enumerate(option_set)
+    ]
@@ -0,0 +1,270 @@
+import json
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .sqlite_connection import open_sqlite
+
+RESUME_MAX_AGE_SECONDS = 12 * 60 * 60
+SEEN_OUTCOMES = ("applied", "already_applied")
+VOLATILE_SEARCH_PARAMS = ("start", "currentJobId")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    search_key TEXT NOT NULL,
+    search_url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    page_index INTEGER NOT NULL DEFAULT 0,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_search ON runs (search_key, updated_at);
+CREATE TABLE IF NOT EXISTS job_progress (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    job_id TEXT NOT NULL,
+    page_index INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    outcome TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, job_id)
+);
+CREATE INDEX IF NOT EXISTS job_progress_by_job ON job_progress (job_id, outcome);
+CREATE TABLE IF NOT EXISTS job_failures (
+    job_id TEXT PRIMARY KEY,
+    failure TEXT NOT NULL,
+    quarantined INTEGER NOT NULL,
+    company TEXT,
+    form_signature TEXT,
+    questions TEXT NOT NULL DEFAULT '[]',
+    attempts INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS form_failures (
+    company TEXT NOT NULL,
+    form_signature TEXT NOT NULL,
+    failure TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (company, form_signature, failure)
+);
+"""
+
+
+class RunLedger:
+    """Write-ahead record of how far a job search run got.
+
+    Every page change and every step taken on a job is committed before the
+    bot acts on it, so after a crash the same search can be resumed from the
+    page it was on and the jobs it already finished can be skipped.
+    A run is resumable until it is finished; jobs whose outcome is "error"
+    or that never got an outcome are retried.
+
+    Failed applications are also recorded per job id and per company form
+    signature. A job whose failure will repeat on retry is quarantined and
+    skipped by later runs until released.
+    """
+
+    def __init__(self, path):
+        self.conn = open_sqlite(path)
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def normalize_search_url(url):
+        """Drop pagination and selected-job parameters so pages share one key."""
+        parts = urlsplit(url or "")
+        query = sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key not in VOLATILE_SEARCH_PARAMS
+        )
+        return urlunsplit(
+            (parts.scheme, parts.netloc, parts.path.rstrip("/"), urlencode(query), "")
+        )
+
+    def begin_run(self, search_url):
+        """Resume the latest unfinished run of this search or start a new one.
+
+        Returns (run_id, page_index); page_index is 0 for a new run.
+        """
+        now = time.time()
+        search_key = self.normalize_search_url(search_url)
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id, page_index FROM runs WHERE search_key = ? "
+                "AND status != 'finished' AND updated_at >= ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (search_key, now - RESUME_MAX_AGE_SECONDS),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE runs SET status = 'running', updated_at = ? WHERE id = ?",
+                    (now, row["id"]),
+                )
+                return row["id"], row["page_index"]
+            cursor = self.conn.execute(
+                "INSERT INTO runs (search_key, search_url, status, page_index, "
+                "started_at, updated_at) VALUES (?, ?, 'running', 0, ?, ?)",
+                (search_key, search_url, now, now),
+            )
+            return cursor.lastrowid, 0
+
+    def record_page(self, run_id, page_index):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET page_index = ?, updated_at = ? WHERE id = ?",
+                (page_index, time.time(), run_id),
+            )
+
+    def record_job(self, run_id, job_id, page_index, step, outcome=None):
+        """Record the step reached on a job and, once known, its outcome."""
+        if not job_id:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO job_progress (run_id, job_id, page_index, step, outcome, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (run_id, job_id) DO UPDATE SET page_index = excluded.page_index, "
+                "step = excluded.step, outcome = excluded.outcome, "
+                "updated_at = excluded.updated_at",
+                (run_id, job_id, page_index, step, outcome, now),
+            )
+            self.conn.execute(
+                "UPDATE runs SET updated_at = ? WHERE id = ?", (now, run_id)
+            )
+
+    def processed_job_ids(self, run_id):
+        """Job ids of this run that reached a final outcome."""
+        rows = self.conn.execute(
+            "SELECT job_id FROM job_progress WHERE run_id = ? "
+            "AND outcome IS NOT NULL AND outcome != 'error'",
+            (run_id,),
+        )
+        return {row["job_id"] for row in rows}
+
+    def seen_job_ids(self, job_ids):
+        """The given job ids that any run has applied to or found already applied."""
+        job_ids = [job_id for job_id in job_ids if job_id]
+        if not job_ids:
+            return set()
+        rows = self.conn.execute(
+            f"SELECT DISTINCT job_id FROM job_progress "
+            f"WHERE job_id IN ({', '.join('?' * len(job_ids))}) "
+            f"AND outcome IN ({', '.join('?' * len(SEEN_OUTCOMES))})",
+            (*job_ids, *SEEN_OUTCOMES),
+        )
+        return {row["job_id"] for row in rows}
+
+    def last_outcomes(self, job_ids):
+        """Map the given job ids to the outcome of their latest run."""
+        job_ids = [job_id for job_id in job_ids if job_id]
+        if not job_ids:
+            return {}
+        rows = self.conn.execute(
+            f"SELECT job_id, outcome FROM job_progress "
+            f"WHERE job_id IN ({', '.join('?' * len(job_ids))}) "
+            f"AND outcome IS NOT NULL ORDER BY updated_at",
+            job_ids,
+        )
+        return {row["job_id"]: row["outcome"] for row in rows}
+
+    def count_outcomes_since(self, outcome, since):
+        """Number of jobs of any run that got this outcome at or after since."""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM job_progress WHERE outcome = ? AND updated_at >= ?",
+            (outcome, since),
+        ).fetchone()
+        return row[0]
+
+    def record_failure(
+        self,
+        job_id,
+        failure,
+        quarantine,
+        company=None,
+        form_signature=None,
+        questions=(),
+    ):
+        """Record why applying to a job failed; quarantine it if asked to."""
+        if not job_id:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO job_failures (job_id, failure, quarantined, company, "
+                "form_signature, questions, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET failure = excluded.failure, "
+                "quarantined = excluded.quarantined, company = excluded.company, "
+                "form_signature = excluded.form_signature, "
+                "questions = excluded.questions, attempts = attempts + 1, "
+                "updated_at = excluded.updated_at",
+                (
+                    job_id,
+                    failure,
+                    int(bool(quarantine)),
+                    company,
+                    form_signature,
+                    json.dumps(list(questions), ensure_ascii=False),
+                    now,
+                ),
+            )
+            if company and form_signature:
+                self.conn.execute(
+                    "INSERT INTO form_failures (company, form_signature, failure, "
+                    "updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (company, form_signature, failure) DO UPDATE SET "
+                    "count = count + 1, updated_at = excluded.updated_at",
+                    (company, form_signature, failure, now),
+                )
+
+    def quarantined_jobs(self, job_ids):
+        """Map the quarantined job ids among job_ids to (failure, questions)."""
+        job_ids = [job_id for job_id in job_ids if job_id]
+        if not job_ids:
+            return {}
+        rows = self.conn.execute(
+            f"SELECT job_id, failure, questions FROM job_failures "
+            f"WHERE quarantined = 1 AND job_id IN ({', '.join('?' * len(job_ids))})",
+            job_ids,
+        )
+        return {
+            row["job_id"]: (row["failure"], json.loads(row["questions"]))
+            for row in rows
+        }
+
+    def release_job(self, job_id):
+        """Take a job out of quarantine so it is tried again."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE job_failures SET quarantined = 0 WHERE job_id = ?", (job_id,)
+            )
+
+    def blocking_questions(self):
+        """Map each [section, label] blocking quarantined jobs to their count."""
+        counts = {}
+        rows = self.conn.execute(
+            "SELECT questions FROM job_failures WHERE quarantined = 1"
+        )
+        for row in rows:
+            for section, label in json.loads(row["questions"]):
+                counts[(section, label)] = counts.get((section, label), 0) + 1
+        return counts
+
+    def failing_forms(self, limit=10):
+        """Company form signatures with the most recorded failures."""
+        return self.conn.execute(
+            "SELECT company, form_signature, failure, count FROM form_failures "
+            "ORDER BY count DESC, updated_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def finish_run(self, run_id, status):
+        """Close a run; any status other than "finished" stays resumable."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE id = ?",
+                (status, time.time(), run_id),
+            )
+
+    def close(self):
+        self.conn.close()
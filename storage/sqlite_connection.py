@@ -0,0 +1,17 @@
+import sqlite3
+from pathlib import Path
+
+
+def open_sqlite(path):
+    """Open a SQLite database in WAL mode, creating its folder if needed.
+
+    WAL lets readers run while a writer commits, and synchronous=NORMAL keeps
+    every commit durable against process crashes without an fsync per write.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
@@ -0,0 +1,182 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from .atomic_file import write_text_atomic
+from .autofill_store import normalize_label
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _add(stats, kind, label, seen, count=1):
+    key = (kind, label)
+    previous_count, previous_seen = stats.get(key, (0, None))
+    stats[key] = (
+        previous_count + count,
+        max(previous_seen or 0, seen or 0) or None,
+    )
+
+
+class UsageStats:
+    """Usage counters and last-seen times kept apart from the answer database.
+
+    A use appends one short line to a log instead of updating the database.
+    compact() folds the log into a JSON snapshot and starts an empty log; it
+    runs once the log reaches COMPACT_AFTER lines and when the stats are
+    closed. Counts are keyed by question kind and normalized label.
+
+    The log is first renamed to a segment named after the process, and the
+    snapshot lists the segments folded into it, so writing the snapshot is
+    the single commit point: segments it lists are never counted again,
+    even when a crash left them behind. A lock file keeps two instances
+    from compacting at once.
+    """
+
+    COMPACT_AFTER = 1000
+    # A lock older than this was left by a crashed compaction.
+    LOCK_STALE_SECONDS = 60
+    SEGMENTS_KEY = "_compacted"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.log_path = self.path.with_suffix(".log")
+        self.lock_path = self.path.with_suffix(".lock")
+        self.stats = {}
+        self.log_lines = 0
+        self.reload()
+
+    def _read_snapshot(self):
+        """(stats, names of the log segments already folded into them)."""
+        stats = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return stats, set()
+        except ValueError as e:
+            print(f"Ignoring unreadable usage stats snapshot {self.path}: {e}")
+            return stats, set()
+        folded = set(snapshot.pop(self.SEGMENTS_KEY, []))
+        for kind, labels in snapshot.items():
+            for label, item in labels.items():
+                _add(stats, kind, label, item.get("lastSeen"), item.get("count", 0))
+        return stats, folded
+
+    def _segments(self):
+        """Log segments renamed for compaction and not removed yet."""
+        return sorted(self.log_path.parent.glob(f"{self.log_path.name}.*compacting"))
+
+    def _lock(self):
+        """Take the compaction lock; False when another instance holds it."""
+        try:
+            os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            pass
+        try:
+            stale = time.time() - self.lock_path.stat().st_mtime
+        except FileNotFoundError:
+            stale = self.LOCK_STALE_SECONDS
+        if stale < self.LOCK_STALE_SECONDS:
+            return False
+        try:
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+        return self._lock()
+
+    @staticmethod
+    def _replay(path, stats):
+        """Add the uses logged in path to stats; returns the number of lines."""
+        lines = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        kind, label, seen = json.loads(line)
+                    except ValueError:
+                        continue
+                    _add(stats, kind, label, seen)
+                    lines += 1
+        except FileNotFoundError:
+            pass
+        return lines
+
+    def reload(self):
+        """Re-read the snapshot and the logs, picking up uses by other instances."""
+        stats, folded = self._read_snapshot()
+        for segment in self._segments():
+            if segment.name not in folded:
+                self._replay(segment, stats)
+        self.log_lines = self._replay(self.log_path, stats)
+        self.stats = stats
+
+    def record(self, kind, label):
+        label = normalize_label(label)
+        seen = _now_ms()
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps([kind, label, seen], ensure_ascii=False) + "\n")
+        _add(self.stats, kind, label, seen)
+        self.log_lines += 1
+        if self.log_lines >= self.COMPACT_AFTER:
+            self.compact()
+
+    def count(self, kind, label):
+        return self.stats.get((kind, normalize_label(label)), (0, None))[0]
+
+    def last_seen(self, kind, label):
+        return self.stats.get((kind, normalize_label(label)), (0, None))[1]
+
+    def compact(self):
+        """Fold the log into the snapshot and start a new log.
+
+        Skipped while another instance compacts; the log then keeps growing
+        until the next call.
+        """
+        if not self._lock():
+            return
+        try:
+            try:
+                os.replace(
+                    self.log_path,
+                    self.log_path.with_name(
+                        f"{self.log_path.name}.{os.getpid()}-{_now_ms()}.compacting"
+                    ),
+                )
+            except FileNotFoundError:
+                pass
+            stats, folded = self._read_snapshot()
+            all_segments = self._segments()
+            segments = [s for s in all_segments if s.name not in folded]
+            for segment in segments:
+                self._replay(segment, stats)
+            snapshot = {self.SEGMENTS_KEY: [segment.name for segment in segments]}
+            for (kind, label), (count, seen) in sorted(stats.items()):
+                snapshot.setdefault(kind, {})[label] = {
+                    "count": count,
+                    "lastSeen": seen,
+                }
+            write_text_atomic(self.path, json.dumps(snapshot, ensure_ascii=False))
+            for segment in all_segments:
+                os.remove(segment)
+        finally:
+            os.remove(self.lock_path)
+        self.stats = stats
+        self.log_lines = self._replay(self.log_path, self.stats)
+
+    def reset(self):
+        """Forget all counts, e.g. after the answers were replaced by an import."""
+        for path in (self.path, self.log_path, *self._segments()):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.stats = {}
+        self.log_lines = 0
+
+    def close(self):
+        if self.log_lines:
+            self.compact()
@@ -1,20 +1,65 @@
-import json
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+
+from storage import AutofillKnowledgeBase
+from .virtual_list import VirtualList
+
+ROW_HEIGHT = 60
+SECTION_IDS = ["textInput", "radioButtons", "dropdowns"]
+
+
+class AutofillRow:
+    """Pooled editor row: a label, an entry or read-only combobox and a delete button."""
+
+    def __init__(self, parent, editable, on_change):
+        self.frame = ttk.Frame(parent, padding=(10, 4))
+        self.fields = None
+        self.section_id = None
+        self.key = None
+        self.value_map = {}
+        self.binding = False
+
+        self.label = ttk.Label(self.frame, font=("Segoe UI", 9, "bold"))
+        self.label.pack(anchor="w")
+
+        input_frame = ttk.Frame(self.frame)
+        input_frame.pack(fill="x", pady=(5, 0))
+
+        self.var = tk.StringVar()
+        if editable:
+            self.input = ttk.Entry(input_frame, textvariable=self.var, width=40)
+        else:
+            self.input = ttk.Combobox(
+                input_frame, textvariable=self.var, state="readonly", width=40
+            )
+        self.input.pack(side="left", fill="x", expand=True)
+
+        self.delete_btn = ttk.Button(
+            input_frame, text="🗑 Delete", style="Delete.TButton"
+        )
+        self.delete_btn.pack(side="right", padx=(10, 0))
+
+        self.var.trace_add(
+            "write", lambda *args: None if self.binding else on_change(self)
+        )
 
 
 class AutofillTab:
     def __init__(self, parent, autofill_file):
         self.frame = ttk.Frame(parent)
         self.autofill_file = autofill_file
+        self.repository = AutofillKnowledgeBase.open_for_json(autofill_file)
         self.input_fields = {}
         self.radio_fields = {}
         self.dropdown_fields = {}
+        # (section_id, label) of the rows edited since the last load or save.
+        self.edited = set()
         self.autofill_sections = {}
         self.autofill_section_frames = {}
         self.autofill_section_states = {}
-        self.dropdown_value_maps = {}
         self.section_buttons = {}
+        self.search_index = {section_id: [] for section_id in SECTION_IDS}
+        self.search_var = tk.StringVar()
         self.setup_styles()
         self.create_widgets()
         self.load_autofill()
@@ -56,6 +101,13 @@ class AutofillTab:
         )
         subtitle_label.pack(anchor="w", pady=(2, 0))
 
+        search_frame = ttk.Frame(header_frame)
+        search_frame.pack(fill="x", pady=(10, 0))
+        ttk.Label(search_frame, text="🔍 Search").pack(side="left")
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        self.search_var.trace_add("write", lambda *args: self.apply_search())
+
         sections_container = ttk.Frame(main_container)
         sections_container.pack(fill="both", expand=True)
 
@@ -86,6 +138,16 @@ class AutofillTab:
         )
         save_button.pack(side="right")
 
+        import_button = ttk.Button(
+            save_container, text="⬆ Import JSON", command=self.import_autofill
+        )
+        import_button.pack(side="left")
+
+        export_button = ttk.Button(
+            save_container, text="⬇ Export JSON", command=self.export_autofill
+        )
+        export_button.pack(side="left", padx=(10, 0))
+
     def create_section(self, parent, section_id, title, description):
         section_frame = ttk.Frame(parent, style="Section.TFrame")
         section_frame.pack(fill="x", pady=5)
@@ -114,52 +176,20 @@ class AutofillTab:
 
         content_container = ttk.Frame(section_frame)
 
-        canvas = tk.Canvas(
+        virtual_list = VirtualList(
             content_container,
+            ROW_HEIGHT,
+            create_row=lambda row_parent: AutofillRow(
+                row_parent, section_id == "textInput", self.on_row_change
+            ),
+            bind_row=lambda row, item: self.bind_row(section_id, row, item),
             height=300 if section_id == "textInput" else 200,
-            highlightthickness=0,
-            bg="white",
         )
-        vsb = ttk.Scrollbar(content_container, orient="vertical", command=canvas.yview)
-        content_frame = ttk.Frame(canvas, style="Content.TFrame")
-
-        canvas.pack(side="left", fill="both", expand=True)
-        vsb.pack(side="right", fill="y")
-
-        canvas_window = canvas.create_window((0, 0), window=content_frame, anchor="nw")
-        canvas.configure(yscrollcommand=vsb.set)
-
-        # noinspection PyUnusedLocal
-        def _on_frame_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            canvas_width = canvas.winfo_width()
-            if canvas_width > 1:
-                canvas.itemconfig(canvas_window, width=canvas_width)
-
-        def _on_canvas_configure(event):
-            canvas_width = event.width
-            canvas.itemconfig(canvas_window, width=canvas_width)
-
-        content_frame.bind("<Configure>", _on_frame_configure)
-        canvas.bind("<Configure>", _on_canvas_configure)
-
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-
-        # noinspection PyUnusedLocal
-        def _bind_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-
-        # noinspection PyUnusedLocal
-        def _unbind_mousewheel(event):
-            canvas.unbind_all("<MouseWheel>")
-
-        canvas.bind("<Enter>", _bind_mousewheel)
-        canvas.bind("<Leave>", _unbind_mousewheel)
+        virtual_list.frame.pack(fill="both", expand=True)
 
         content_container.pack_forget()
 
-        self.autofill_sections[section_id] = content_frame
+        self.autofill_sections[section_id] = virtual_list
         self.autofill_section_frames[section_id] = section_frame
         self.autofill_section_states[section_id] = False
         self.autofill_sections[section_id + "_container"] = content_container
@@ -196,206 +226,107 @@ class AutofillTab:
 
         self.autofill_section_states[section_id] = not state
 
-    def create_text_input_item(self, parent, key, value):
-        item_frame = ttk.Frame(parent)
-        item_frame.pack(fill="x", pady=5)
-
-        label = ttk.Label(item_frame, text=key, font=("Segoe UI", 9, "bold"))
-        label.pack(anchor="w")
-
-        input_frame = ttk.Frame(item_frame)
-        input_frame.pack(fill="x", pady=(5, 0))
-
-        var = tk.StringVar(value=value)
-        entry = ttk.Entry(input_frame, textvariable=var, width=40)
-        entry.pack(side="left", fill="x", expand=True)
-
-        del_btn = ttk.Button(
-            input_frame,
-            text="🗑 Delete",
-            command=lambda: self.delete_textinput(key),
-            style="Delete.TButton",
-        )
-        del_btn.pack(side="right", padx=(10, 0))
-
-        self.input_fields[key] = var
-
-    def create_radio_button_item(self, parent, rb_data):
-        """Create a radio button group with improved layout"""
-        item_frame = ttk.Frame(parent)
-        item_frame.pack(fill="x", pady=10)
-
-        label_text = rb_data.get("placeholderIncludes", "")
-        count = rb_data.get("count", None)
-        if count is not None:
-            label_text = f"{label_text} (count: {count})"
-
-        header_frame = ttk.Frame(item_frame)
-        header_frame.pack(fill="x")
-
-        label = ttk.Label(header_frame, text=label_text, font=("Segoe UI", 9, "bold"))
-        label.pack(side="left")
-
-        del_btn = ttk.Button(
-            header_frame,
-            text="🗑 Delete",
-            command=lambda: self.delete_radio(rb_data.get("placeholderIncludes", "")),
-            style="Delete.TButton",
-        )
-        del_btn.pack(side="right")
-
-        options_frame = ttk.Frame(item_frame)
-        options_frame.pack(fill="x", pady=(10, 0), padx=20)
-
-        var = tk.StringVar(value=rb_data.get("defaultValue", ""))
-        self.radio_fields[rb_data.get("placeholderIncludes", "")] = var
-
-        for opt in rb_data.get("options", []):
-            radio_btn = ttk.Radiobutton(
-                options_frame, text=opt["text"], value=opt["value"], variable=var
+    def bind_row(self, section_id, row, item):
+        """Point a pooled row at an item of the given section."""
+        row.binding = True
+        row.section_id = section_id
+        if section_id == "textInput":
+            row.fields, row.key, row.value_map = self.input_fields, item, {}
+            row.label.configure(text=item)
+            row.var.set(self.input_fields.get(item, ""))
+            row.delete_btn.configure(command=lambda: self.delete_textinput(item))
+        else:
+            label = item.get("placeholderIncludes", "")
+            count = item.get("count", None)
+            row.label.configure(
+                text=f"{label} (count: {count})" if count is not None else label
             )
-            radio_btn.pack(anchor="w", pady=2)
-
-    def create_dropdown_item(self, parent, dd_data):
-        item_frame = ttk.Frame(parent)
-        item_frame.pack(fill="x", pady=10)
-
-        label_text = dd_data.get("placeholderIncludes", "")
-        count = dd_data.get("count", None)
-        if count is not None:
-            label_text = f"{label_text} (count: {count})"
-
-        label = ttk.Label(item_frame, text=label_text, font=("Segoe UI", 9, "bold"))
-        label.pack(anchor="w")
-
-        dropdown_frame = ttk.Frame(item_frame)
-        dropdown_frame.pack(fill="x", pady=(5, 0))
-
-        var = tk.StringVar(value=dd_data.get("defaultValue", ""))
-        self.dropdown_fields[dd_data.get("placeholderIncludes", "")] = var
-
-        values = [opt["text"] for opt in dd_data.get("options", [])]
-        value_map = {opt["text"]: opt["value"] for opt in dd_data.get("options", [])}
-
-        combo = ttk.Combobox(
-            dropdown_frame, textvariable=var, values=values, state="readonly", width=40
-        )
-        combo.pack(side="left", fill="x", expand=True)
-
-        self.dropdown_value_maps[label_text] = value_map
+            options = item.get("options", [])
+            row.fields = (
+                self.radio_fields
+                if section_id == "radioButtons"
+                else self.dropdown_fields
+            )
+            row.key = label
+            row.value_map = {opt["text"]: opt["value"] for opt in options}
+            row.input.configure(values=[opt["text"] for opt in options])
+            value = row.fields.get(label, "")
+            row.var.set(
+                next((opt["text"] for opt in options if opt["value"] == value), value)
+            )
+            delete = (
+                self.delete_radio
+                if section_id == "radioButtons"
+                else self.delete_dropdown
+            )
+            row.delete_btn.configure(command=lambda: delete(label))
+        row.binding = False
 
-        del_btn = ttk.Button(
-            dropdown_frame,
-            text="🗑 Delete",
-            command=lambda: self.delete_dropdown(
-                dd_data.get("placeholderIncludes", "")
-            ),
-            style="Delete.TButton",
-        )
-        del_btn.pack(side="right", padx=(10, 0))
+    # noinspection PyMethodMayBeStatic
+    def on_row_change(self, row):
+        """Write an edit made in a pooled row back to the in-memory values."""
+        if row.fields is not None:
+            row.fields[row.key] = row.value_map.get(row.var.get(), row.var.get())
+            self.edited.add((row.section_id, row.key))
+
+    def apply_search(self):
+        """Show only the items whose label contains the search text."""
+        query = self.search_var.get().strip().lower()
+        for section_id in SECTION_IDS:
+            self.autofill_sections[section_id].set_items(
+                item
+                for text, item in self.search_index[section_id]
+                if not query or query in text
+            )
 
     def load_autofill(self):
-        """Load autofill data with improved UI creation"""
-        for section in ["textInput", "radioButtons", "dropdowns"]:
-            for widget in self.autofill_sections[section].winfo_children():
-                widget.destroy()
-
+        """Load autofill data into the in-memory index and redraw the visible rows"""
         self.input_fields.clear()
         self.radio_fields.clear()
         self.dropdown_fields.clear()
-        self.dropdown_value_maps.clear()
+        self.edited.clear()
+        for section_id in SECTION_IDS:
+            self.search_index[section_id] = []
 
         try:
-            with open(self.autofill_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.repository.load()
 
             for key, value in data.get("textInput", {}).items():
-                self.create_text_input_item(
-                    self.autofill_sections["textInput"], key, value
-                )
-
-            for rb_data in data.get("radioButtons", []):
-                self.create_radio_button_item(
-                    self.autofill_sections["radioButtons"], rb_data
-                )
-
-            for dd_data in data.get("dropdowns", []):
-                self.create_dropdown_item(self.autofill_sections["dropdowns"], dd_data)
+                self.input_fields[key] = value
+                self.search_index["textInput"].append((key.lower(), key))
+
+            for section_id, fields in (
+                ("radioButtons", self.radio_fields),
+                ("dropdowns", self.dropdown_fields),
+            ):
+                for item in data.get(section_id, []):
+                    label = item.get("placeholderIncludes", "")
+                    fields[label] = item.get("defaultValue", "")
+                    self.search_index[section_id].append((label.lower(), item))
 
         except Exception as e:
             print(f"Error loading autofill data: {e}")
-            self.show_empty_state()
-
-    def show_empty_state(self):
-        for section_id in ["textInput", "radioButtons", "dropdowns"]:
-            empty_frame = ttk.Frame(self.autofill_sections[section_id])
-            empty_frame.pack(fill="both", expand=True, pady=20)
-
-            empty_label = ttk.Label(
-                empty_frame,
-                text="No items configured yet",
-                font=("Segoe UI", 10),
-                foreground="gray",
-            )
-            empty_label.pack(anchor="center")
+
+        self.apply_search()
 
     def save_autofill(self):
+        """Store the edited rows only, so answers the bot changed since are kept."""
+        fields = {
+            "textInput": self.input_fields,
+            "radioButtons": self.radio_fields,
+            "dropdowns": self.dropdown_fields,
+        }
         try:
-            data = {
-                "textInput": {k: v.get() for k, v in self.input_fields.items()},
-                "radioButtons": [],
-                "dropdowns": [],
-            }
-
-            for label, var in self.radio_fields.items():
-                rb = None
-                try:
-                    with open(self.autofill_file, "r", encoding="utf-8") as f:
-                        file_data = json.load(f)
-                    for item in file_data.get("radioButtons", []):
-                        if item.get("placeholderIncludes", "") == label:
-                            rb = item
-                            break
-                except (
-                    FileNotFoundError,
-                    json.JSONDecodeError,
-                    OSError,
-                    PermissionError,
-                ):
-                    pass
-                if rb:
-                    rb["defaultValue"] = var.get()
-                    data["radioButtons"].append(rb)
-
-            for label, var in self.dropdown_fields.items():
-                dd = None
-                try:
-                    with open(self.autofill_file, "r", encoding="utf-8") as f:
-                        file_data = json.load(f)
-                    for item in file_data.get("dropdowns", []):
-                        if item.get("placeholderIncludes", "") == label:
-                            dd = item
-                            break
-                except (
-                    FileNotFoundError,
-                    json.JSONDecodeError,
-                    OSError,
-                    PermissionError,
-                ):
-                    pass
-                if dd:
-                    dd["defaultValue"] = (
-                        dd["options"][
-                            [opt["text"] for opt in dd["options"]].index(var.get())
-                        ]["value"]
-                        if dd["options"]
-                        and var.get() in [opt["text"] for opt in dd["options"]]
-                        else var.get()
-                    )
-                    data["dropdowns"].append(dd)
-
-            with open(self.autofill_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            for section_id, label in sorted(self.edited):
+                if label not in fields[section_id]:
+                    continue
+                value = fields[section_id][label]
+                if section_id == "textInput":
+                    self.repository.set_text_input(label, value)
+                else:
+                    self.repository.set_default_value(section_id, label, value)
+            self.repository.save()
+            self.edited.clear()
 
             messagebox.showinfo(
                 "✅ Success", "Autofill configuration saved successfully!"
@@ -406,6 +337,52 @@ class AutofillTab:
                 "❌ Error", f"Failed to save autofill configuration:\n{str(e)}"
             )
 
+    def export_autofill(self):
+        path = filedialog.asksaveasfilename(
+            title="Export autofill data",
+            defaultextension=".json",
+            initialfile="form_autofill_backup.json",
+            filetypes=[("JSON files", "*.json")],
+        )
+        if not path:
+            return
+        try:
+            self.repository.export_json(path)
+            messagebox.showinfo("✅ Success", f"Autofill data exported to {path}")
+        except Exception as e:
+            messagebox.showerror("❌ Error", f"Failed to export autofill data:\n{e}")
+
+    def import_autofill(self):
+        path = filedialog.askopenfilename(
+            title="Import autofill data", filetypes=[("JSON files", "*.json")]
+        )
+        if not path or not messagebox.askyesno(
+            "Confirm Import",
+            "Importing replaces all autofill data with the content of the file. Continue?",
+        ):
+            return
+        try:
+            self.repository.import_json(path)
+            self.load_autofill()
+            messagebox.showinfo("✅ Success", f"Autofill data imported from {path}")
+        except Exception as e:
+            messagebox.showerror("❌ Error", f"Failed to import autofill data:\n{e}")
+
+    def remove_from_index(self, section_id, label):
+        """Drop an item from the search index and redraw, keeping unsaved edits."""
+        self.edited.discard((section_id, label))
+        self.search_index[section_id] = [
+            (text, item)
+            for text, item in self.search_index[section_id]
+            if (
+                item
+                if section_id == "textInput"
+                else item.get("placeholderIncludes", "")
+            )
+            != label
+        ]
+        self.apply_search()
+
     def delete_radio(self, label):
         if messagebox.askyesno(
             "Confirm Delete",
@@ -414,16 +391,9 @@ class AutofillTab:
             if label in self.radio_fields:
                 del self.radio_fields[label]
             try:
-                with open(self.autofill_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                data["radioButtons"] = [
-                    rb
-                    for rb in data.get("radioButtons", [])
-                    if rb.get("placeholderIncludes", "") != label
-                ]
-                with open(self.autofill_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                self.load_autofill()
+                self.repository.delete_entries("radioButtons", label)
+                self.repository.save()
+                self.remove_from_index("radioButtons", label)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete item: {str(e)}")
 
@@ -434,16 +404,9 @@ class AutofillTab:
             if label in self.dropdown_fields:
                 del self.dropdown_fields[label]
             try:
-                with open(self.autofill_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                data["dropdowns"] = [
-                    dd
-                    for dd in data.get("dropdowns", [])
-                    if dd.get("placeholderIncludes", "") != label
-                ]
-                with open(self.autofill_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                self.load_autofill()
+                self.repository.delete_entries("dropdowns", label)
+                self.repository.save()
+                self.remove_from_index("dropdowns", label)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete item: {str(e)}")
 
@@ -455,11 +418,8 @@ class AutofillTab:
             if label in self.input_fields:
                 del self.input_fields[label]
             try:
-                with open(self.autofill_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                data["textInput"].pop(label, None)
-                with open(self.autofill_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                self.load_autofill()
+                self.repository.delete_text_input(label)
+                self.repository.save()
+                self.remove_from_index("textInput", label)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete item: {str(e)}")
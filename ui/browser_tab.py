@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json
+
+from browser_control.page_drivers import PAGE_DRIVER_BACKENDS
+from storage import ConfigFile
 
 
 class BrowserTab:
@@ -8,10 +10,17 @@ class BrowserTab:
         self.executable_entry = None
         self.frame = ttk.Frame(parent)
         self.browser_file = browser_file
+        self.config = ConfigFile.open(browser_file)
+        self.config_version = 0
         self.executable_path_var = tk.StringVar()
         self.profile_path_var = tk.StringVar()
+        self.page_driver_var = tk.StringVar(value=PAGE_DRIVER_BACKENDS[0])
+        self.reuse_browser_var = tk.BooleanVar(value=False)
         self.create_widgets()
         self.load_browser()
+        self.config.subscribe(
+            lambda snapshot: self.frame.after(0, self.on_config_change)
+        )
 
     def create_widgets(self):
         ttk.Label(self.frame, text="Executable Path").pack(anchor="w")
@@ -25,29 +34,49 @@ class BrowserTab:
             side="left"
         )
 
+        ttk.Label(self.frame, text="Page Driver Backend").pack(anchor="w", pady=(10, 0))
+        ttk.Combobox(
+            self.frame,
+            textvariable=self.page_driver_var,
+            values=PAGE_DRIVER_BACKENDS,
+            state="readonly",
+            width=20,
+        ).pack(anchor="w")
+
+        ttk.Checkbutton(
+            self.frame,
+            text="Keep Chrome running and reattach to it (remote debugging port)",
+            variable=self.reuse_browser_var,
+        ).pack(anchor="w", pady=(10, 0))
+
         ttk.Button(
             self.frame, text="Save Browser Settings", command=self.save_browser
         ).pack(pady=5)
 
     def load_browser(self):
-        try:
-            with open(self.browser_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.executable_path_var.set(data.get("executable_path", ""))
-            self.profile_path_var.set(data.get("profile_path", ""))
-        except (FileNotFoundError, json.JSONDecodeError, OSError, PermissionError):
-            self.executable_path_var.set("")
-            self.profile_path_var.set("")
+        snapshot = self.config.snapshot()
+        data = snapshot.data
+        self.config_version = snapshot.version
+        self.executable_path_var.set(data.get("executable_path", ""))
+        self.profile_path_var.set(data.get("profile_path", ""))
+        self.page_driver_var.set(data.get("page_driver", PAGE_DRIVER_BACKENDS[0]))
+        self.reuse_browser_var.set(data.get("reuse_browser", False))
 
+    def on_config_change(self):
+        """Show settings changed outside this tab, e.g. by editing the file."""
+        if self.config.snapshot().version > self.config_version:
+            self.load_browser()
 
     def save_browser(self):
-        data = {
+        changes = {
             "executable_path": self.executable_path_var.get(),
             "profile_path": self.profile_path_var.get(),
+            "page_driver": self.page_driver_var.get(),
+            "reuse_browser": self.reuse_browser_var.get(),
         }
         try:
-            with open(self.browser_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            snapshot = self.config.update(changes)
+            self.config_version = snapshot.version
             messagebox.showinfo("Success", "Browser settings saved successfully.")
         except Exception as e:
             messagebox.showerror("Error", str(e))
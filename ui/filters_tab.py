@@ -1,7 +1,11 @@
 import json
+import sqlite3
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from browser_control.browser_manager_jobs import SearchUrlBuilder
+from storage import AutofillKnowledgeBase, ConfigFile
+
 
 class FiltersTab:
     def __init__(self, parent, filters_file):
@@ -10,6 +14,8 @@ class FiltersTab:
         self.easy_apply_var = None
         self.frame = ttk.Frame(parent)
         self.filters_file = filters_file
+        self.config = ConfigFile.open(filters_file)
+        self.config_version = 0
         self.timeFilter_var = tk.StringVar()
         self.badWords_entries = []
         self.titleFilterWords_entries = []
@@ -18,6 +24,9 @@ class FiltersTab:
         self.create_widgets()
         self.load_filters()
         self.update_job_apply_url()
+        self.config.subscribe(
+            lambda snapshot: self.frame.after(0, self.on_config_change)
+        )
 
     def create_widgets(self):
 
@@ -156,41 +165,47 @@ class FiltersTab:
             entries_list.remove(entry_var)
         entry_frame.destroy()
 
+    def clear_word_entries(self):
+        for field_type in ("badWords", "titleFilterWords", "titleSkipWords"):
+            for entry_frame in getattr(
+                self, f"{field_type}_list_frame"
+            ).winfo_children():
+                entry_frame.destroy()
+            getattr(self, f"{field_type}_entries").clear()
+
+    def on_config_change(self):
+        """Show filters changed outside this tab, e.g. by editing the file."""
+        if self.config.snapshot().version > self.config_version:
+            self.clear_word_entries()
+            self.load_filters()
+            self.update_job_apply_url()
+
     def load_filters(self):
-        try:
-            with open(self.filters_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            for word in data.get("badWords", []):
-                if word.strip():
-                    self.add_word_entry("badWords", word.strip())
-
-            for word in data.get("titleFilterWords", []):
-                if word.strip():
-                    self.add_word_entry("titleFilterWords", word.strip())
-
-            for word in data.get("titleSkipWords", []):
-                if word.strip():
-                    self.add_word_entry("titleSkipWords", word.strip())
-
-            if not data.get("badWords"):
-                self.add_word_entry("badWords")
-            if not data.get("titleFilterWords"):
-                self.add_word_entry("titleFilterWords")
-            if not data.get("titleSkipWords"):
-                self.add_word_entry("titleSkipWords")
-
-            self.timeFilter_var.set(
-                self.time_filter_label(data.get("timeFilter", "any"))
-            )
-            self.easy_apply_var.set(data.get("easyApplyOnly", False))
+        snapshot = self.config.snapshot()
+        self.config_version = snapshot.version
+        data = snapshot.data
 
-        except (FileNotFoundError, json.JSONDecodeError, OSError, PermissionError):
+        for word in data.get("badWords", []):
+            if word.strip():
+                self.add_word_entry("badWords", word.strip())
+
+        for word in data.get("titleFilterWords", []):
+            if word.strip():
+                self.add_word_entry("titleFilterWords", word.strip())
+
+        for word in data.get("titleSkipWords", []):
+            if word.strip():
+                self.add_word_entry("titleSkipWords", word.strip())
+
+        if not data.get("badWords"):
             self.add_word_entry("badWords")
+        if not data.get("titleFilterWords"):
             self.add_word_entry("titleFilterWords")
+        if not data.get("titleSkipWords"):
             self.add_word_entry("titleSkipWords")
-            self.timeFilter_var.set("Any Time")
-            self.easy_apply_var.set(False)
+
+        self.timeFilter_var.set(self.time_filter_label(data.get("timeFilter", "any")))
+        self.easy_apply_var.set(data.get("easyApplyOnly", False))
 
     def save_filters(self):
         data = {
@@ -213,8 +228,7 @@ class FiltersTab:
             "easyApplyOnly": self.easy_apply_var.get(),
         }
         try:
-            with open(self.filters_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            self.config_version = self.config.update(data).version
             self.update_job_apply_url()
             messagebox.showinfo("Success", "Filters saved successfully.")
         except Exception as e:
@@ -225,26 +239,17 @@ class FiltersTab:
 
     @staticmethod
     def build_linkedin_job_url(job_title, time_code, easy_apply_only):
-        base_url = "https://www.linkedin.com/jobs/search/?"
-        params = []
-        if job_title:
-            params.append(f"keywords={job_title.replace(' ', '%20')}")
-        if time_code == "r86400":
-            params.append("f_TPR=r86400")
-        elif time_code == "r604800":
-            params.append("f_TPR=r604800")
-        elif time_code == "r2592000":
-            params.append("f_TPR=r2592000")
-        if easy_apply_only:
-            params.append("f_AL=true")
-        return base_url + "&".join(params)
+        return SearchUrlBuilder.build_search_url(job_title, time_code, easy_apply_only)
 
     def update_job_apply_url(self):
         try:
-            with open("DB/form_autofill.json", "r", encoding="utf-8") as f:
-                autofill = json.load(f)
-            job_title = autofill.get("textInput", {}).get("jobTitle", "")
-        except (FileNotFoundError, json.JSONDecodeError, OSError, PermissionError):
+            job_title = (
+                AutofillKnowledgeBase.read_text_answer(
+                    "DB/form_autofill.json", "jobTitle"
+                )
+                or ""
+            )
+        except (json.JSONDecodeError, OSError, sqlite3.Error):
             job_title = ""
         time_code = self.time_filter_code(self.timeFilter_var.get())
         easy_apply_only = self.easy_apply_var.get()
@@ -1,11 +1,10 @@
-import json
 import os
 import threading
 from tkinter import ttk, messagebox
 
 from ttkthemes import ThemedTk
 
-from browser_control.browser_manager import BrowserManager
+from storage import AutofillKnowledgeBase, ConfigFile
 from ui.autofill_tab import AutofillTab
 from ui.browser_tab import BrowserTab
 from .filters_tab import FiltersTab
@@ -23,7 +22,8 @@ class MainUI:
         self.is_running = False
         self.bot_should_run = False
         self.browser_open = False
-        self.browser = BrowserManager(BROWSER_FILE)
+        self.browser = None
+        ConfigFile.start_watcher()
 
         # Initialize UI attributes
         self.notebook = None
@@ -79,6 +79,18 @@ class MainUI:
         ):
             self.filters_tab.initialize_layout()
 
+    def get_browser(self):
+        """The BrowserManager, created on first use.
+
+        Called from the browser threads, so selenium and the bot modules load
+        there after the window is up instead of delaying the first paint.
+        """
+        if self.browser is None:
+            from browser_control.browser_manager import BrowserManager
+
+            self.browser = BrowserManager(BROWSER_FILE)
+        return self.browser
+
     def start_browser_on_launch(self):
         thread = threading.Thread(target=self._start_browser_on_launch)
         thread.daemon = True
@@ -86,7 +98,7 @@ class MainUI:
 
     def _start_browser_on_launch(self):
         try:
-            self.browser.start_browser()
+            self.get_browser().start_browser()
         except Exception as e:
             self.root.after(
                 0,
@@ -106,7 +118,7 @@ class MainUI:
 
     def _open_browser(self):
         try:
-            self.browser.start_browser()
+            self.get_browser().start_browser()
             self.root.after(0, self.on_browser_opened)
         except Exception as e:
             self.root.after(
@@ -127,7 +139,8 @@ class MainUI:
 
     def _close_browser(self):
         try:
-            self.browser.stop()
+            if self.browser is not None:
+                self.browser.stop()
             self.root.after(0, self.on_browser_closed)
         except Exception as e:
             self.root.after(
@@ -165,7 +178,7 @@ class MainUI:
 
     def _run_bot(self):
         try:
-            if not self.browser.driver:
+            if self.browser is None or not self.browser.driver:
                 self.root.after(
                     0, lambda: messagebox.showerror("Error", "Browser is not open.")
                 )
@@ -184,11 +197,11 @@ class MainUI:
                     AUTOFILL_FILE, FILTERS_FILE, lambda: self.bot_should_run
                 )
             else:
-                with open(FILTERS_FILE, "r", encoding="utf-8") as f:
-                    filters = json.load(f)
-                with open(AUTOFILL_FILE, "r", encoding="utf-8") as f:
-                    autofill = json.load(f)
-                job_title = autofill.get("textInput", {}).get("jobTitle", "")
+                filters = ConfigFile.open(FILTERS_FILE).snapshot().data
+                job_title = (
+                    AutofillKnowledgeBase.read_text_answer(AUTOFILL_FILE, "jobTitle")
+                    or ""
+                )
                 time_code = filters.get("timeFilter", "any")
                 easy_apply_only = filters.get("easyApplyOnly", False)
                 if self.filters_tab is not None:
@@ -215,7 +228,8 @@ class MainUI:
             self.start_btn.config(text="Start")
 
 
-def run():
+def run(on_ready=None):
+    """Open the main window; on_ready(root, main_ui) is called before mainloop."""
     root = ThemedTk(theme="arc")
     window_width = 750
     window_height = 750
@@ -229,5 +243,7 @@ def run():
     root.geometry(f"{window_width}x{window_height}+{x}+{y}")
     root.title("LinkedIn Easy Apply Bot")
 
-    MainUI(root)
+    main_ui = MainUI(root)
+    if on_ready is not None:
+        on_ready(root, main_ui)
     root.mainloop()
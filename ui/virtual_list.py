@@ -0,0 +1,124 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualList:
+    """Scrollable list that only creates widgets for the rows in view.
+
+    Rows have a fixed height. A small pool of row widgets is created once and
+    re-bound to other items while scrolling, so drawing cost does not grow
+    with the number of items. create_row(parent) must return an object with
+    a .frame attribute; bind_row(row, item) fills it in for an item.
+    """
+
+    def __init__(self, parent, row_height, create_row, bind_row, height=200):
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.items = []
+        self.rows = []
+        self.bound = {}
+        self.offset = 0
+
+        self.frame = ttk.Frame(parent)
+        self.canvas = tk.Canvas(
+            self.frame, height=height, highlightthickness=0, bg="white"
+        )
+        self.scrollbar = ttk.Scrollbar(
+            self.frame, orient="vertical", command=self.yview
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.empty_label = ttk.Label(
+            self.canvas,
+            text="No items configured yet",
+            font=("Segoe UI", 10),
+            foreground="gray",
+            background="white",
+        )
+
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel, add="+")
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel, add="+")
+
+    def set_items(self, items):
+        """Show a new list of items, scrolled to the top."""
+        self.items = list(items)
+        self.bound.clear()
+        self.offset = 0
+        self.render()
+
+    def refresh(self):
+        """Re-bind the visible rows after the underlying items changed."""
+        self.bound.clear()
+        self.render()
+
+    def _viewport_height(self):
+        height = self.canvas.winfo_height()
+        return height if height > 1 else int(self.canvas.cget("height"))
+
+    def _max_offset(self):
+        content = len(self.items) * self.row_height
+        return max(content - self._viewport_height(), 0)
+
+    def _ensure_pool(self, size):
+        while len(self.rows) < size:
+            self.rows.append(self.create_row(self.canvas))
+
+    def render(self):
+        viewport = self._viewport_height()
+        self.offset = min(max(self.offset, 0), self._max_offset())
+        self._ensure_pool(math.ceil(viewport / self.row_height) + 1)
+
+        first = self.offset // self.row_height
+        for position, row in enumerate(self.rows):
+            index = first + position
+            if index >= len(self.items):
+                row.frame.place_forget()
+                self.bound.pop(position, None)
+                continue
+            if self.bound.get(position) != index:
+                self.bind_row(row, self.items[index])
+                self.bound[position] = index
+            row.frame.place(
+                x=0,
+                y=index * self.row_height - self.offset,
+                relwidth=1,
+                height=self.row_height,
+            )
+
+        if self.items:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+
+        content = len(self.items) * self.row_height
+        if content <= viewport:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(
+                self.offset / content, (self.offset + viewport) / content
+            )
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.items) * self.row_height)
+        elif args[0] == "scroll":
+            step = self.row_height if args[2] == "units" else self._viewport_height()
+            self.offset += int(args[1]) * step
+        self.render()
+
+    def _on_mousewheel(self, event):
+        widget = self.canvas.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self.canvas)):
+            return
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")